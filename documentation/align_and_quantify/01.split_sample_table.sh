@@ -11,7 +11,9 @@
 ###  DESCRIPTION  ###
 #####################
 
-# Generates evenly sized chunks of the sample table.
+# Generates chunks of the sample table with near-equal predicted processing cost (estimated from
+# read file sizes and sequencing strategies, or from the run times recorded in the run manifests of
+# previous executions, if available). Samples of the same organism are preferably kept together.
 
 
 ####################
@@ -28,7 +30,10 @@ outDir="${root}/.tmp/anduril/align_and_quantify/sample_tables"
 logDir="${root}/logFiles/align_and_quantify"
 sampleTablePrefix="table."
 sampleTableSuffix=".tsv"
-sampleTableChunkSize="10"
+sampleTableChunkSize="10"    # average number of samples per chunk
+libDir="${root}/frameworksAuxiliary/anduril/lib"
+execRootDir="${root}/.tmp/align_and_quantify"    # run manifests of previous executions, if any
+runtimeTable="${logDir}/run_manifests.tsv"       # per-run times are derived from this index
 
 
 ########################
@@ -56,7 +61,24 @@ rm -f "$logFile"; touch "$logFile"
 
 # Split sample table into chunks
 echo "Processing sample table '$sampleTable'..." >> "$logFile"
-"${scriptDir}/split_table.sh" "$sampleTable" "$outDir" "$sampleTablePrefix" "$sampleTableSuffix" "$sampleTableChunkSize" &>> "$logFile"
+runtimeOptions=()
+if [ -n "$(find "$execRootDir" -name "*.manifest.jsonl" -print -quit 2> /dev/null)" ]; then
+    echo "Indexing run manifests of previous executions in '$execRootDir'..." >> "$logFile"
+    "${libDir}/index_run_manifests.py" --output "$runtimeTable" "$execRootDir" &>> "$logFile"
+    runtimeOptions=(
+        --runtimes "$runtimeTable"
+        --runtime-run-column "instance"
+        --runtime-run-pattern "_([^_]+)\$"
+        --runtime-column "times_run_s"
+    )
+fi
+"${scriptDir}/partition_sample_table.py" "$sampleTable" "$outDir" \
+    --prefix "$sampleTablePrefix" \
+    --suffix "$sampleTableSuffix" \
+    --chunk-size "$sampleTableChunkSize" \
+    --root "$root" \
+    ${runtimeOptions[@]+"${runtimeOptions[@]}"} \
+    &>> "$logFile"
 
 
 #############
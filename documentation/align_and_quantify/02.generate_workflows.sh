@@ -38,8 +38,11 @@ prefix_ptr="ptr.CHIMP2.1.4_84"
 cutadapt_format="FASTQ"
 cutadapt_minLen=20
 star_sjdbOverhang=200
+star_sharedGenome="none"    # "node"/"keep": STAR indices in shared memory of the nodes (single-pass mapping, see below)
 kallisto_fragLenMean=300
 kallisto_fragLenSD=75
+streaming="false"   # "true": fastq-dump, cutadapt, STAR & kallisto in a single job, without intermediate FASTQ files
+streamExecutable="${root}/scriptsSoftware/stream_map_quant.py"
 
 
 ########################
@@ -55,6 +58,17 @@ set -o pipefail
 mkdir -p "$outDir"
 mkdir -p "$logDir"
 
+# Set STAR mapping mode: genomes held in shared memory cannot be modified, so mapping is done in a
+# single pass against the index, which contains the annotated splice junctions (inserted when it was
+# generated), instead of inserting the junctions discovered in a first pass on the fly
+if [[ "$star_sharedGenome" == "none" ]]; then
+    star_twopassMode="Basic"
+    star_twopass1readsN="-1"
+else
+    star_twopassMode="None"
+    star_twopass1readsN="{{FALSE}}"
+fi
+
 # Create log file
 logFile="${logDir}/$(basename $0 ".sh").log"
 rm -f "$logFile"; touch "$logFile"
@@ -92,6 +106,9 @@ for table in "${inDir}/${inPrefix}"${inGlobPattern}"${inSuffix}"; do
 *              - Alignments: 'star' (https://github.com/alexdobin/star)
 *              - Quantification: 'kallisto' (http://pachterlab.github.io/kallisto/)
 *              - AS events: 'suppa' (https://bitbucket.org/regulatorygenomicsupf/suppa)
+*              If 'streaming' is set to "true", reads are converted, trimmed, aligned
+*              and quantified in a single job per sample ('StreamMapQuant'), without
+*              writing intermediate FASTQ files.
 * Requires:    A tab-separated sample table with the following fields:
 *              - SRA study ID
 *              - SRA run ID
@@ -124,9 +141,16 @@ prefix_ptr             = "$prefix_ptr"
 cutadapt_format        = "$cutadapt_format"
 cutadapt_min_len       = "$cutadapt_minLen"
 star_sjdb_overhang     = "$star_sjdbOverhang"
+star_shared_genome     = "$star_sharedGenome"
+star_twopass_mode      = "$star_twopassMode"
+star_twopass1_reads_n  = "$star_twopass1readsN"
 kallisto_frag_len_mean = "$kallisto_fragLenMean"
 kallisto_frag_len_sd   = "$kallisto_fragLenSD"
 
+// ---> STREAMING MODE <--- //
+streaming              = "$streaming"
+stream_executable      = "$streamExecutable"
+
 
 ///////////////////////////////////////
 //// ---> IMPORT SAMPLE TABLE <--- ////
@@ -228,6 +252,9 @@ for sample: std.itercsv(sample_table.in) {
         string       cutadapt_format,
         string       cutadapt_min_len,
         string       star_sjdb_overhang,
+        string       star_shared_genome,
+        string       star_twopass_mode,
+        string       star_twopass1_reads_n,
         string       kallisto_frag_len_mean,
         string       kallisto_frag_len_sd
     ) -> (
@@ -287,8 +314,9 @@ for sample: std.itercsv(sample_table.in) {
             INDIR_genomeDir    = index_dir_star,
             sjdbOverhang       = star_sjdb_overhang,
             runMode            = "alignReads",
-            twopassMode        = "Basic",
-            twopass1readsN     = "-1",
+            twopassMode        = star_twopass_mode,
+            twopass1readsN     = star_twopass1_reads_n,
+            _sharedGenome      = star_shared_genome,
             _execMode          = "remote",
             _cores             = "8",
             _membycore         = "5G",
@@ -333,7 +361,10 @@ for sample: std.itercsv(sample_table.in) {
         string       sample_name,
         string       cutadapt_format,
         string       cutadapt_min_len,
-        string       star_sjdb_overhang
+        string       star_sjdb_overhang,
+        string       star_shared_genome,
+        string       star_twopass_mode,
+        string       star_twopass1_reads_n
     ) -> (
         BinaryFile   polyA_cut_stats,
         BinaryFolder alignments_out_dir,
@@ -405,8 +436,9 @@ for sample: std.itercsv(sample_table.in) {
             INDIR_genomeDir          = index_dir_star,
             sjdbOverhang             = star_sjdb_overhang,
             runMode                  = "alignReads",
-            twopassMode              = "Basic",
-            twopass1readsN           = "-1",
+            twopassMode              = star_twopass_mode,
+            twopass1readsN           = star_twopass1_reads_n,
+            _sharedGenome            = star_shared_genome,
             _execMode                = "remote",
             _cores                   = "8",
             _membycore               = "5G",
@@ -439,11 +471,77 @@ for sample: std.itercsv(sample_table.in) {
     }
 
 
+    /////////////////////////////////////////////////////////////////////////////////
+    //// ---> MAPPING & ABUNDANCE ESTIMATION FUNCTION: STREAMING MODE <--- ////
+    /////////////////////////////////////////////////////////////////////////////////
+
+    function streamed(
+        BinaryFile   read_file,
+        BinaryFolder index_dir_star,
+        BinaryFile   index_kallisto,
+        string       sample_name,
+        string       paired,
+        string       adapter,
+        string       front,
+        string       adapter_mate,
+        string       front_mate,
+        string       cutadapt_format,
+        string       cutadapt_min_len,
+        string       star_sjdb_overhang,
+        string       kallisto_frag_len_mean,
+        string       kallisto_frag_len_sd,
+        string       stream_executable
+    ) -> (
+        BinaryFile   polyA_cut_stats,
+        BinaryFolder alignments_out_dir,
+        BinaryFolder abundances_out_dir
+    ) {
+
+        // ---> CONVERT, TRIM, ALIGN & QUANTIFY READS <--- //
+        // stream_map_quant.py 1.0.0 (fastq-dump.2.8.0, cutadapt 1.8.3, STAR 2.4.1c, kallisto 0.42.3)
+        stream_map_quant = StreamMapQuant(
+            INFILE_sra            = read_file,
+            INDIR_star_genome_dir = index_dir_star,
+            INFILE_kallisto_index = index_kallisto,
+            paired                = paired,
+            offset                = "33",
+            format                = cutadapt_format,
+            minimum_length        = cutadapt_min_len,
+            adapter               = adapter,
+            front                 = front,
+            adapter_mate          = adapter_mate,
+            front_mate            = front_mate,
+            trim_n                = "{{TRUE}}",
+            sjdb_overhang         = star_sjdb_overhang,
+            twopass_mode          = "Basic",
+            twopass1_readsN       = "-1",
+            star_reads            = "file",
+            fragment_length       = kallisto_frag_len_mean,
+            sd                    = kallisto_frag_len_sd,
+            plaintext             = "{{TRUE}}",
+            _executable           = stream_executable,
+            _execMode             = "remote",
+            _cores                = "8",
+            _membycore            = "7G",
+            _runtime              = "12:00:00",
+            @name                 = "streamed_" + sample_name
+        )
+
+        // ---> RETURN OUTPORTS <--- //
+        return record(
+            polyA_cut_stats     = stream_map_quant.OUTFILE_cutadapt_report,
+            alignments_out_dir  = stream_map_quant.OUTDIRMAKE_star_out_dir,
+            abundances_out_dir  = stream_map_quant.OUTDIR_kallisto_out_dir
+        )
+
+    }
+
+
     /////////////////////////////////////////////////////////////////////////////////
     //// ---> CALL LIBRARY-SPECIFIC MAPPING & ABUNDANCE ESTIMATION FUNCTION <--- ////
     /////////////////////////////////////////////////////////////////////////////////
 
-    if ( sample.strategy == "SINGLE" ) {
+    if ( streaming != "true" && sample.strategy == "SINGLE" ) {
         map_quant = single(
             read_file              = read_file,
             index_dir_star         = index_dir_star,
@@ -452,13 +550,16 @@ for sample: std.itercsv(sample_table.in) {
             cutadapt_format        = cutadapt_format,
             cutadapt_min_len       = cutadapt_min_len,
             star_sjdb_overhang     = star_sjdb_overhang,
+            star_shared_genome     = star_shared_genome,
+            star_twopass_mode      = star_twopass_mode,
+            star_twopass1_reads_n  = star_twopass1_reads_n,
             kallisto_frag_len_mean = kallisto_frag_len_mean,
             kallisto_frag_len_sd   = kallisto_frag_len_sd,
             @name                  = "map_quant_" + sample_name
         )
     }
 
-    if ( sample.strategy == "PAIRED" ) {
+    if ( streaming != "true" && sample.strategy == "PAIRED" ) {
         map_quant = paired(
             read_file              = read_file,
             index_dir_star         = index_dir_star,
@@ -467,6 +568,51 @@ for sample: std.itercsv(sample_table.in) {
             cutadapt_format        = cutadapt_format,
             cutadapt_min_len       = cutadapt_min_len,
             star_sjdb_overhang     = star_sjdb_overhang,
+            star_shared_genome     = star_shared_genome,
+            star_twopass_mode      = star_twopass_mode,
+            star_twopass1_reads_n  = star_twopass1_reads_n,
+            @name                  = "map_quant_" + sample_name
+        )
+    }
+
+    if ( streaming == "true" && sample.strategy == "SINGLE" ) {
+        map_quant = streamed(
+            read_file              = read_file,
+            index_dir_star         = index_dir_star,
+            index_kallisto         = index_kallisto,
+            sample_name            = sample_name,
+            paired                 = "{{FALSE}}",
+            adapter                = "AAAAAAAAAAAAAAAAAAAAAAAAA",
+            front                  = "{{FALSE}}",
+            adapter_mate           = "{{FALSE}}",
+            front_mate             = "{{FALSE}}",
+            cutadapt_format        = cutadapt_format,
+            cutadapt_min_len       = cutadapt_min_len,
+            star_sjdb_overhang     = star_sjdb_overhang,
+            kallisto_frag_len_mean = kallisto_frag_len_mean,
+            kallisto_frag_len_sd   = kallisto_frag_len_sd,
+            stream_executable      = stream_executable,
+            @name                  = "map_quant_" + sample_name
+        )
+    }
+
+    if ( streaming == "true" && sample.strategy == "PAIRED" ) {
+        map_quant = streamed(
+            read_file              = read_file,
+            index_dir_star         = index_dir_star,
+            index_kallisto         = index_kallisto,
+            sample_name            = sample_name,
+            paired                 = "{{TRUE}}",
+            adapter                = "AAAAAAAAAAAAAAAAAAAA",
+            front                  = "TTTTTTTTTTTTTTTTTTTT",
+            adapter_mate           = "AAAAAAAAAAAAAAAAAAAA",
+            front_mate             = "TTTTTTTTTTTTTTTTTTTT",
+            cutadapt_format        = cutadapt_format,
+            cutadapt_min_len       = cutadapt_min_len,
+            star_sjdb_overhang     = star_sjdb_overhang,
+            kallisto_frag_len_mean = "{{FALSE}}",
+            kallisto_frag_len_sd   = "{{FALSE}}",
+            stream_executable      = stream_executable,
             @name                  = "map_quant_" + sample_name
         )
     }
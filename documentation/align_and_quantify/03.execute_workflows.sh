@@ -11,7 +11,9 @@
 ###  DESCRIPTION  ###
 #####################
 
-# Builds and (optionally) executes Anduril commands.
+# Builds and (optionally) executes Anduril commands. Workflows are executed in the background under
+# a global concurrency limit, largest sample table chunks first, with locally executed components of
+# all workflows sharing a single node-local resource broker.
 
 ####################
 ###  PARAMETERS  ###
@@ -21,6 +23,7 @@
 root="$(dirname $(dirname $(cd "$(dirname "$0" )" && pwd)))"
 
 # Set other parameters
+scriptDir="${root}/frameworksAuxiliary/anduril/lib"
 bundleDir="${root}/frameworksAuxiliary/anduril/bundle"
 execRootDir="${root}/.tmp/align_and_quantify"
 logRootDir="${root}/logFiles/align_and_quantify/anduril"
@@ -29,9 +32,14 @@ threads=2
 workflowDir="${root}/.tmp/anduril/align_and_quantify/workflows"
 workflowPrefix="workflow."
 workflowSuffix=".and"
+tableDir="${root}/.tmp/anduril/align_and_quantify/sample_tables"
+tablePrefix="table."
+tableSuffix=".tsv"
+brokerDir="${root}/.tmp/anduril/align_and_quantify/broker"
 commandFile="${root}/.tmp/anduril/align_and_quantify/commands"
-timeout=0    # timeout (in sec) between executing different Anduril instances
-             # if set to 0, only commands written to $commandFile (no execution!)
+summaryFile="${logDir}/workflows.summary.tsv"
+maxWorkflows=0    # maximum number of concurrently executed Anduril instances
+                  # if set to 0, only commands written to $commandFile (no execution!)
 
 
 ########################
@@ -56,50 +64,36 @@ rm -f "$logFile"; touch "$logFile"
 ###  MAIN  ###
 ##############
 
-# Delete and re-create command file
-rm -f "$commandFile"; touch "$commandFile"
-
 # Write log
 echo "Writing Anduril run commands to file '$commandFile'..." >> "$logFile"
 
-# Iterate over workflows
-for workflow in "${workflowDir}/${workflowPrefix}"*"${workflowSuffix}"; do
-
-    # Get ID
-    id=$(sed -r "s~${workflowDir}/${workflowPrefix}(.*)${workflowSuffix}~\1~" <(echo "$workflow"))
-
-    # Write Anduril run command
-    cat >> "$commandFile" <<- EOF
-# Workflow ID: $id
-nohup anduril run "$workflow" \\
-    --bundle "$bundleDir" \\
-    --execution-dir "${execRootDir}/${id}" \\
-    --log "${logRootDir}/${id}" \\
-    --threads $threads \\
-    &> /dev/null &
-
-EOF
-
-    # Unless execution is not desired...
-    if [ "$timeout" -ne "0" ]; then
-
-        # Write log message
-        echo "Executing workflow '$workflow'..." >> "$logFile"
-
-        # Execute workflow
-        nohup anduril run "$workflow" \
-            --bundle "$bundleDir" \
-            --execution-dir "${execRootDir}/${id}" \
-            --log "${logRootDir}/${id}" \
-            --threads $threads \
-            &> /dev/null &
-
-        # Sleep for specified time
-        sleep $timeout
-
-    fi
-
-done
+# Build scheduler command
+scheduler=(
+    "${scriptDir}/schedule_workflows.py"
+    --workflow-dir "$workflowDir"
+    --workflow-prefix "$workflowPrefix"
+    --workflow-suffix "$workflowSuffix"
+    --table-dir "$tableDir"
+    --table-prefix "$tablePrefix"
+    --table-suffix "$tableSuffix"
+    --bundle "$bundleDir"
+    --execution-root "$execRootDir"
+    --log-root "$logRootDir"
+    --threads "$threads"
+    --broker-dir "$brokerDir"
+    --commands "$commandFile"
+)
+
+# Write commands only...
+if [ "$maxWorkflows" -eq "0" ]; then
+    "${scheduler[@]}" --max-workflows 1 --dry-run &>> "$logFile"
+
+# ...or write commands and execute workflows in the background
+else
+    mkdir -p "$brokerDir"
+    nohup "${scheduler[@]}" --max-workflows "$maxWorkflows" --summary "$summaryFile" &>> "$logFile" &
+    echo "Scheduler started in the background (PID: $!); summary will be written to '$summaryFile'." >> "$logFile"
+fi
 
 
 #############
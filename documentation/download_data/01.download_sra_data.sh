@@ -11,7 +11,8 @@
 ###  DESCRIPTION  ###
 #####################
 
-# Downloads RNA-Seq data from SRA.
+# Downloads RNA-Seq data from SRA. Runs are downloaded concurrently; interrupted downloads are
+# resumed and only complete files are kept.
 
 
 ####################
@@ -26,6 +27,8 @@ scriptDir="${root}/scriptsSoftware"
 sampleTable="${root}/internalResources/samples.tsv"
 outDir="${root}/rawData/sra"
 logDir="${root}/logFiles/download_data"
+sraRoot="ftp://ftp-trace.ncbi.nih.gov/sra/sra-instant/reads/ByRun/sra"
+workers=4
 
 
 ########################
@@ -56,7 +59,10 @@ sed -i "s~\[\[ROOT\]\]~$root~" "$sampleTable"
 
 # Download RNA-seq run data
 echo "Processing sample table '$sampleTable'..." >> "$logFile"
-"${scriptDir}/download_SRA_data_from_sample_table.sh" "$sampleTable" "$outDir" &>> "$logFile"
+"${scriptDir}/download_SRA_data_from_sample_table.py" "$sampleTable" "$outDir" \
+    --sra-root "$sraRoot" \
+    --workers "$workers" \
+    &>> "$logFile"
 
 
 #############
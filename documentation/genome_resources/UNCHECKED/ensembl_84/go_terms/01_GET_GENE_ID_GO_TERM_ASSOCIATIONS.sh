@@ -102,55 +102,79 @@ wget -qO- "$url" | awk -F '\t' '{ for (i=1; i <= 6; i++) {if ($i == "" ) next }
 
 ## CONVERT TO GAF FORMAT
 
+# Duplicate associations are removed
+
 # Human
 echo "Convert human associations to GAF format..." >> "$logFile"
 gaf_hsa="${outDirHsa}/${outPrefixHsa}.gaf.gz"
-zcat "$outfile_hsa" | "$script" --db "$db" --symbol $col_sym --name $col_name --taxon "$tax_hsa" --verbose 2>> "$logFile" | uniq | sort -t $'\t' -k5,5 | gzip > "$gaf_hsa" 2>> "$logFile"
+zcat "$outfile_hsa" | "$script" --db "$db" --symbol $col_sym --name $col_name --taxon "$tax_hsa" --deduplicate --verbose 2>> "$logFile" | sort -t $'\t' -k5,5 | gzip > "$gaf_hsa" 2>> "$logFile"
 
 # Mouse
 echo "Convert mouse associations to GAF format..." >> "$logFile"
 gaf_mmu="${outDirMmu}/${outPrefixMmu}.gaf.gz"
-zcat "$outfile_mmu" | "$script" --db "$db" --symbol $col_sym --name $col_name --taxon "$tax_mmu" --verbose 2>> "$logFile" | uniq | sort -t $'\t' -k5,5 | gzip > "$gaf_mmu" 2>> "$logFile"
+zcat "$outfile_mmu" | "$script" --db "$db" --symbol $col_sym --name $col_name --taxon "$tax_mmu" --deduplicate --verbose 2>> "$logFile" | sort -t $'\t' -k5,5 | gzip > "$gaf_mmu" 2>> "$logFile"
 
 # Chimpanzee
 echo "Convert chimpanzee associations to GAF format..." >> "$logFile"
 gaf_ptr="${outDirPtr}/${outPrefixPtr}.gaf.gz"
-zcat "$outfile_ptr" | "$script" --db "$db" --symbol $col_sym --name $col_name --taxon "$tax_ptr" --verbose 2>> "$logFile" | uniq | sort -t $'\t' -k5,5 | gzip > "$gaf_ptr" 2>> "$logFile"
+zcat "$outfile_ptr" | "$script" --db "$db" --symbol $col_sym --name $col_name --taxon "$tax_ptr" --deduplicate --verbose 2>> "$logFile" | sort -t $'\t' -k5,5 | gzip > "$gaf_ptr" 2>> "$logFile"
 
 
 ## EXTRACT ENSEMBL GENE IDS & GENE SYMBOLS PER GO CATEGORY OF INTEREST
 
+# Gene members are taken from the BioMart tables, i.e. they include associations that are not
+# written to the GAF files (e.g. those with evidence codes rejected during conversion); each table
+# is scanned once for all GO terms of interest
+
 # Human
+out_dir="${outDirHsa}/gene_members_per_category"
+mkdir -p "$out_dir"
+while read -r term; do
+    term_short=$(echo $term | cut -f 2 -d ":")
+    : > "${out_dir}/${outPrefixHsa}.${term_short}.ensembl_gene_ids"
+    : > "${out_dir}/${outPrefixHsa}.${term_short}.gene_symbols"
+done < <(cut -f1 "$goTerms")
+awk -F '\t' -v prefix="${out_dir}/${outPrefixHsa}" 'NR == FNR { split($1, t, ":"); terms[$1] = t[2]; next } $2 in terms { out = prefix "." terms[$2]; print $1 >> (out ".ensembl_gene_ids"); print $5 >> (out ".gene_symbols") }' <(cut -f1 "$goTerms") <(zcat "$outfile_hsa")
 while read -r term; do
     term_short=$(echo $term | cut -f 2 -d ":")
-    out_dir="${outDirHsa}/gene_members_per_category"
-    mkdir -p "$out_dir"
     ids_hsa="${out_dir}/${outPrefixHsa}.${term_short}.ensembl_gene_ids"
     sym_hsa="${out_dir}/${outPrefixHsa}.${term_short}.gene_symbols"
-    awk -v term=$term '$2 == term { print $1 }' <(zcat "$outfile_hsa") | sort -u > "$ids_hsa"
-    awk -v term=$term '$2 == term { print $5 }' <(zcat "$outfile_hsa") | sort -u > "$sym_hsa"
+    sort -u -o "$ids_hsa" "$ids_hsa"
+    sort -u -o "$sym_hsa" "$sym_hsa"
 done < <(cut -f1 "$goTerms")
 
 # Mouse
+out_dir="${outDirMmu}/gene_members_per_category"
+mkdir -p "$out_dir"
+while read -r term; do
+    term_short=$(echo $term | cut -f 2 -d ":")
+    : > "${out_dir}/${outPrefixMmu}.${term_short}.ensembl_gene_ids"
+    : > "${out_dir}/${outPrefixMmu}.${term_short}.gene_symbols"
+done < <(cut -f1 "$goTerms")
+awk -F '\t' -v prefix="${out_dir}/${outPrefixMmu}" 'NR == FNR { split($1, t, ":"); terms[$1] = t[2]; next } $2 in terms { out = prefix "." terms[$2]; print $1 >> (out ".ensembl_gene_ids"); print $5 >> (out ".gene_symbols") }' <(cut -f1 "$goTerms") <(zcat "$outfile_mmu")
 while read -r term; do
     term_short=$(echo $term | cut -f 2 -d ":")
-    out_dir="${outDirMmu}/gene_members_per_category"
-    mkdir -p "$out_dir"
     ids_mmu="${out_dir}/${outPrefixMmu}.${term_short}.ensembl_gene_ids"
     sym_mmu="${out_dir}/${outPrefixMmu}.${term_short}.gene_symbols"
-    awk -v term=$term '$2 == term { print $1 }' <(zcat "$outfile_mmu") | sort -u > "$ids_mmu"
-    awk -v term=$term '$2 == term { print $5 }' <(zcat "$outfile_mmu") | sort -u > "$sym_mmu"
+    sort -u -o "$ids_mmu" "$ids_mmu"
+    sort -u -o "$sym_mmu" "$sym_mmu"
 done < <(cut -f1 "$goTerms")
 
-# Human
+# Chimpanzee
+out_dir="${outDirPtr}/gene_members_per_category"
+mkdir -p "$out_dir"
+while read -r term; do
+    term_short=$(echo $term | cut -f 2 -d ":")
+    : > "${out_dir}/${outPrefixPtr}.${term_short}.ensembl_gene_ids"
+    : > "${out_dir}/${outPrefixPtr}.${term_short}.gene_symbols"
+done < <(cut -f1 "$goTerms")
+awk -F '\t' -v prefix="${out_dir}/${outPrefixPtr}" 'NR == FNR { split($1, t, ":"); terms[$1] = t[2]; next } $2 in terms { out = prefix "." terms[$2]; print $1 >> (out ".ensembl_gene_ids"); print $5 >> (out ".gene_symbols") }' <(cut -f1 "$goTerms") <(zcat "$outfile_ptr")
 while read -r term; do
     term_short=$(echo $term | cut -f 2 -d ":")
-    out_dir="${outDirPtr}/gene_members_per_category"
-    mkdir -p "$out_dir"
     ids_ptr="${out_dir}/${outPrefixPtr}.${term_short}.ensembl_gene_ids"
     sym_ptr="${out_dir}/${outPrefixPtr}.${term_short}.gene_symbols"
-    awk -v term=$term '$2 == term { print $1 }' <(zcat "$outfile_ptr") | sort -u > "$ids_ptr"
-    awk -v term=$term '$2 == term { print $5 }' <(zcat "$outfile_ptr") | sort -u > "$sym_ptr"
+    sort -u -o "$ids_ptr" "$ids_ptr"
+    sort -u -o "$sym_ptr" "$sym_ptr"
 done < <(cut -f1 "$goTerms")
 
 
@@ -70,19 +70,23 @@ gunzip --stdout "$ptrTranscripts" > "$ptr_trx"
 
 ### READ & ALIGNMENT STATISTICS ###
 
+# Tables are updated incrementally: only new or changed log files are parsed (see sidecar index
+# files '<out_file>.index'); delete the index to rebuild a table from scratch. Tables are
+# also written in Feather format ('<out_file>.feather') if the Python module 'pyarrow' is available
+
 # Summarize poly(A) tail removal statistics
 in_dir="${dataDir}/processing/polyA_removal/stats"
 in_prefix=""
 in_suffix=".processing.polyA_removal.stats"
 out_file="${outDir}/processing.polyA_removal.stats"
-"${scriptDir}/parse_cutadapt_logs.py" "$in_dir" "$in_prefix" "$in_suffix" > "$out_file" 2>> "$logFile"
+"${scriptDir}/parse_cutadapt_logs.py" "$in_dir" "$in_prefix" "$in_suffix" --output "$out_file" --feather "${out_file}.feather" 2>> "$logFile"
 
 # Summarize alignment statistics
 in_dir="${dataDir}/alignments/stats"
 in_prefix=""
 in_suffix=".alignments.stats"
 out_file="${outDir}/alignments.stats"
-"${scriptDir}/parse_STAR_logs.py" "$in_dir" "$in_prefix" "$in_suffix" > "$out_file" 2>> "$logFile"
+"${scriptDir}/parse_STAR_logs.py" "$in_dir" "$in_prefix" "$in_suffix" --output "$out_file" --feather "${out_file}.feather" 2>> "$logFile"
 
 
 ### TRANSCRIPT & GENE EXPRESSION: TPM ###
@@ -1,16 +1,13 @@
 #!/usr/bin/env python
 
 # Import modules
+import os
 import sys
-import anduril
 import anduril_custom_functions
-from anduril.args import *
+from anduril.args import component, tempdir
 
-# Command template
-command = '{_executable}$$$-b^^^{b}$$$-c^^^{c}$$$-m^^^{m}$$$infile###INFILE_infile$$$outfile###OUTFILE_outfile'.format(_executable=_executable, b=b, c=c, m=m)
-
-# Execute command
-exit_status = anduril_custom_functions.main(component, command, tempdir)
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
 
 # Return exit status
 sys.exit(exit_status)
@@ -1,16 +1,13 @@
 #!/usr/bin/env python
 
 # Import modules
+import os
 import sys
-import anduril
 import anduril_custom_functions
-from anduril.args import *
+from anduril.args import component, tempdir
 
-# Command template
-command = '{_executable}$$$-B^^^{B}$$$-C^^^{C}$$$-F^^^{F}$$$-H^^^{H}$$$-1.0^^^{_10}$$$-@^^^{at}$$$-b^^^{b}$$$-c^^^{c}$$$-f^^^{f}$$$-h^^^{h}$$$-l^^^{l}$$$-m^^^{m}$$$-q^^^{q}$$$-r^^^{r}$$$-s^^^{s}$$$-u^^^{u}$$$-x^^^{x}$$$-L^^^INFILE_L$$$-R^^^INFILE_R$$$-T^^^INFILE_T$$$-t^^^INFILE_t$$$-U^^^OUTFILE_U$$$-o^^^OUTFILE_o$$$infile###INFILE_infile$$$region###{region}'.format(_executable=_executable, B=B, C=C, F=F, H=H, _10=_10, at=at, b=b, c=c, f=f, h=h, l=l, m=m, q=q, r=r, s=s, u=u, x=x, region=region)
-
-# Execute command
-exit_status = anduril_custom_functions.main(component, command, tempdir)
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
 
 # Return exit status
 sys.exit(exit_status)
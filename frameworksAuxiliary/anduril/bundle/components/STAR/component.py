@@ -1,16 +1,13 @@
 #!/usr/bin/env python
 
 # Import modules
+import os
 import sys
-import anduril
 import anduril_custom_functions
-from anduril.args import *
+from anduril.args import component, tempdir
 
-# Command template
-command = '{_executable}$$$--alignEndsType^^^{alignEndsType}$$$--alignIntronMax^^^{alignIntronMax}$$$--alignIntronMin^^^{alignIntronMin}$$$--alignMatesGapMax^^^{alignMatesGapMax}$$$--alignSJDBoverhangMin^^^{alignSJDBoverhangMin}$$$--alignSJoverhangMin^^^{alignSJoverhangMin}$$$--alignSoftClipAtReferenceEnds^^^{alignSoftClipAtReferenceEnds}$$$--alignSplicedMateMapLmin^^^{alignSplicedMateMapLmin}$$$--alignSplicedMateMapLminOverLmate^^^{alignSplicedMateMapLminOverLmate}$$$--alignTranscriptsPerReadNmax^^^{alignTranscriptsPerReadNmax}$$$--alignTranscriptsPerWindowNmax^^^{alignTranscriptsPerWindowNmax}$$$--alignWindowsPerReadNmax^^^{alignWindowsPerReadNmax}$$$--bamRemoveDuplicatesMate2basesN^^^{bamRemoveDuplicatesMate2basesN}$$$--bamRemoveDuplicatesType^^^{bamRemoveDuplicatesType}$$$--chimJunctionOverhangMin^^^{chimJunctionOverhangMin}$$$--chimOutType^^^{chimOutType}$$$--chimScoreDropMax^^^{chimScoreDropMax}$$$--chimScoreJunctionNonGTAG^^^{chimScoreJunctionNonGTAG}$$$--chimScoreMin^^^{chimScoreMin}$$$--chimScoreSeparation^^^{chimScoreSeparation}$$$--chimSegmentMin^^^{chimSegmentMin}$$$--clip3pAdapterMMp^^^{clip3pAdapterMMp}$$$--clip3pAdapterSeq^^^{clip3pAdapterSeq}$$$--clip3pAfterAdapterNbases^^^{clip3pAfterAdapterNbases}$$$--clip3pNbases^^^{clip3pNbases}$$$--clip5pNbases^^^{clip5pNbases}$$$--genomeChrBinNbits^^^{genomeChrBinNbits}$$$--genomeLoad^^^{genomeLoad}$$$--genomeSAindexNbases^^^{genomeSAindexNbases}$$$--genomeSAsparseD^^^{genomeSAsparseD}$$$--limitBAMsortRAM^^^{limitBAMsortRAM}$$$--limitGenomeGenerateRAM^^^{limitGenomeGenerateRAM}$$$--limitIObufferSize^^^{limitIObufferSize}$$$--limitOutSAMoneReadBytes^^^{limitOutSAMoneReadBytes}$$$--limitOutSJcollapsed^^^{limitOutSJcollapsed}$$$--limitOutSJoneRead^^^{limitOutSJoneRead}$$$--outBAMcompression^^^{outBAMcompression}$$$--outBAMsortingThreadN^^^{outBAMsortingThreadN}$$$--outFilterIntronMotifs^^^{outFilterIntronMotifs}$$$--outFilterMatchNmin^^^{outFilterMatchNmin}$$$--outFilterMatchNminOverLread^^^{outFilterMatchNminOverLread}$$$--outFilterMismatchNmax^^^{outFilterMismatchNmax}$$$--outFilterMismatchNoverLmax^^^{outFilterMismatchNoverLmax}$$$--outFilterMismatchNoverReadLmax^^^{outFilterMismatchNoverReadLmax}$$$--outFilterMultimapNmax^^^{outFilterMultimapNmax}$$$--outFilterMultimapScoreRange^^^{outFilterMultimapScoreRange}$$$--outFilterScoreMin^^^{outFilterScoreMin}$$$--outFilterScoreMinOverLread^^^{outFilterScoreMinOverLread}$$$--outFilterType^^^{outFilterType}$$$--outQSconversionAdd^^^{outQSconversionAdd}$$$--outReadsUnmapped^^^{outReadsUnmapped}$$$--outSAMattrRGline^^^{outSAMattrRGline}$$$--outSAMattributes^^^{outSAMattributes}$$$--outSAMflagAND^^^{outSAMflagAND}$$$--outSAMflagOR^^^{outSAMflagOR}$$$--outSAMheaderHD^^^{outSAMheaderHD}$$$--outSAMheaderPG^^^{outSAMheaderPG}$$$--outSAMmapqUnique^^^{outSAMmapqUnique}$$$--outSAMmode^^^{outSAMmode}$$$--outSAMorder^^^{outSAMorder}$$$--outSAMprimaryFlag^^^{outSAMprimaryFlag}$$$--outSAMreadID^^^{outSAMreadID}$$$--outSAMstrandField^^^{outSAMstrandField}$$$--outSAMtype^^^{outSAMtype}$$$--outSAMunmapped^^^{outSAMunmapped}$$$--outSJfilterCountTotalMin^^^{outSJfilterCountTotalMin}$$$--outSJfilterCountUniqueMin^^^{outSJfilterCountUniqueMin}$$$--outSJfilterDistToOtherSJmin^^^{outSJfilterDistToOtherSJmin}$$$--outSJfilterIntronMaxVsReadN^^^{outSJfilterIntronMaxVsReadN}$$$--outSJfilterOverhangMin^^^{outSJfilterOverhangMin}$$$--outSJfilterReads^^^{outSJfilterReads}$$$--outStd^^^{outStd}$$$--outTmpDir^^^{outTmpDir}$$$--outWigNorm^^^{outWigNorm}$$$--outWigReferencesPrefix^^^{outWigReferencesPrefix}$$$--outWigStrand^^^{outWigStrand}$$$--outWigType^^^{outWigType}$$$--quantMode^^^{quantMode}$$$--quantTranscriptomeBAMcompression^^^{quantTranscriptomeBAMcompression}$$$--quantTranscriptomeBan^^^{quantTranscriptomeBan}$$$--readFilesCommand^^^{readFilesCommand}$$$--readMapNumber^^^{readMapNumber}$$$--readMatesLengthsIn^^^{readMatesLengthsIn}$$$--runMode^^^{runMode}$$$--runThreadN^^^{runThreadN}$$$--scoreDelBase^^^{scoreDelBase}$$$--scoreDelOpen^^^{scoreDelOpen}$$$--scoreGap^^^{scoreGap}$$$--scoreGapATAC^^^{scoreGapATAC}$$$--scoreGapGCAG^^^{scoreGapGCAG}$$$--scoreGapNoncan^^^{scoreGapNoncan}$$$--scoreGenomicLengthLog2scale^^^{scoreGenomicLengthLog2scale}$$$--scoreInsBase^^^{scoreInsBase}$$$--scoreInsOpen^^^{scoreInsOpen}$$$--scoreStitchSJshift^^^{scoreStitchSJshift}$$$--seedMultimapNmax^^^{seedMultimapNmax}$$$--seedNoneLociPerWindow^^^{seedNoneLociPerWindow}$$$--seedPerReadNmax^^^{seedPerReadNmax}$$$--seedPerWindowNmax^^^{seedPerWindowNmax}$$$--seedSearchLmax^^^{seedSearchLmax}$$$--seedSearchStartLmax^^^{seedSearchStartLmax}$$$--seedSearchStartLmaxOverLread^^^{seedSearchStartLmaxOverLread}$$$--sjdbGTFchrPrefix^^^{sjdbGTFchrPrefix}$$$--sjdbGTFfeatureExon^^^{sjdbGTFfeatureExon}$$$--sjdbGTFtagExonParentGene^^^{sjdbGTFtagExonParentGene}$$$--sjdbGTFtagExonParentTranscript^^^{sjdbGTFtagExonParentTranscript}$$$--sjdbOverhang^^^{sjdbOverhang}$$$--sjdbScore^^^{sjdbScore}$$$--sysShell^^^{sysShell}$$$--twopass1readsN^^^{twopass1readsN}$$$--twopassMode^^^{twopassMode}$$$--winAnchorDistNbins^^^{winAnchorDistNbins}$$$--winAnchorMultimapNmax^^^{winAnchorMultimapNmax}$$$--winBinNbits^^^{winBinNbits}$$$--winFlankNbins^^^{winFlankNbins}$$$--genomeDir^^^INDIR_genomeDir$$$--genomeFastaFiles^^^INFILE_genomeFastaFiles$$$--inputBAMfile^^^INFILE_inputBAMfile$$$--outSAMheaderCommentFile^^^INFILE_outSAMheaderCommentFile$$$--readFilesIn^^^INFILE_readFilesIn$$$--readFilesIn_ADD_1^^^INFILE_readFilesIn_ADD_1$$$--sjdbFileChrStartEnd^^^INFILE_sjdbFileChrStartEnd$$$--sjdbGTFfile^^^INFILE_sjdbGTFfile$$$--genomeDir^^^OUTDIRMAKE_genomeDir$$$--outFileNamePrefix^^^OUTDIRMAKE_outFileNamePrefix'.format(_executable=_executable, alignEndsType=alignEndsType, alignIntronMax=alignIntronMax, alignIntronMin=alignIntronMin, alignMatesGapMax=alignMatesGapMax, alignSJDBoverhangMin=alignSJDBoverhangMin, alignSJoverhangMin=alignSJoverhangMin, alignSoftClipAtReferenceEnds=alignSoftClipAtReferenceEnds, alignSplicedMateMapLmin=alignSplicedMateMapLmin, alignSplicedMateMapLminOverLmate=alignSplicedMateMapLminOverLmate, alignTranscriptsPerReadNmax=alignTranscriptsPerReadNmax, alignTranscriptsPerWindowNmax=alignTranscriptsPerWindowNmax, alignWindowsPerReadNmax=alignWindowsPerReadNmax, bamRemoveDuplicatesMate2basesN=bamRemoveDuplicatesMate2basesN, bamRemoveDuplicatesType=bamRemoveDuplicatesType, chimJunctionOverhangMin=chimJunctionOverhangMin, chimOutType=chimOutType, chimScoreDropMax=chimScoreDropMax, chimScoreJunctionNonGTAG=chimScoreJunctionNonGTAG, chimScoreMin=chimScoreMin, chimScoreSeparation=chimScoreSeparation, chimSegmentMin=chimSegmentMin, clip3pAdapterMMp=clip3pAdapterMMp, clip3pAdapterSeq=clip3pAdapterSeq, clip3pAfterAdapterNbases=clip3pAfterAdapterNbases, clip3pNbases=clip3pNbases, clip5pNbases=clip5pNbases, genomeChrBinNbits=genomeChrBinNbits, genomeLoad=genomeLoad, genomeSAindexNbases=genomeSAindexNbases, genomeSAsparseD=genomeSAsparseD, limitBAMsortRAM=limitBAMsortRAM, limitGenomeGenerateRAM=limitGenomeGenerateRAM, limitIObufferSize=limitIObufferSize, limitOutSAMoneReadBytes=limitOutSAMoneReadBytes, limitOutSJcollapsed=limitOutSJcollapsed, limitOutSJoneRead=limitOutSJoneRead, outBAMcompression=outBAMcompression, outBAMsortingThreadN=outBAMsortingThreadN, outFilterIntronMotifs=outFilterIntronMotifs, outFilterMatchNmin=outFilterMatchNmin, outFilterMatchNminOverLread=outFilterMatchNminOverLread, outFilterMismatchNmax=outFilterMismatchNmax, outFilterMismatchNoverLmax=outFilterMismatchNoverLmax, outFilterMismatchNoverReadLmax=outFilterMismatchNoverReadLmax, outFilterMultimapNmax=outFilterMultimapNmax, outFilterMultimapScoreRange=outFilterMultimapScoreRange, outFilterScoreMin=outFilterScoreMin, outFilterScoreMinOverLread=outFilterScoreMinOverLread, outFilterType=outFilterType, outQSconversionAdd=outQSconversionAdd, outReadsUnmapped=outReadsUnmapped, outSAMattrRGline=outSAMattrRGline, outSAMattributes=outSAMattributes, outSAMflagAND=outSAMflagAND, outSAMflagOR=outSAMflagOR, outSAMheaderHD=outSAMheaderHD, outSAMheaderPG=outSAMheaderPG, outSAMmapqUnique=outSAMmapqUnique, outSAMmode=outSAMmode, outSAMorder=outSAMorder, outSAMprimaryFlag=outSAMprimaryFlag, outSAMreadID=outSAMreadID, outSAMstrandField=outSAMstrandField, outSAMtype=outSAMtype, outSAMunmapped=outSAMunmapped, outSJfilterCountTotalMin=outSJfilterCountTotalMin, outSJfilterCountUniqueMin=outSJfilterCountUniqueMin, outSJfilterDistToOtherSJmin=outSJfilterDistToOtherSJmin, outSJfilterIntronMaxVsReadN=outSJfilterIntronMaxVsReadN, outSJfilterOverhangMin=outSJfilterOverhangMin, outSJfilterReads=outSJfilterReads, outStd=outStd, outTmpDir=outTmpDir, outWigNorm=outWigNorm, outWigReferencesPrefix=outWigReferencesPrefix, outWigStrand=outWigStrand, outWigType=outWigType, quantMode=quantMode, quantTranscriptomeBAMcompression=quantTranscriptomeBAMcompression, quantTranscriptomeBan=quantTranscriptomeBan, readFilesCommand=readFilesCommand, readMapNumber=readMapNumber, readMatesLengthsIn=readMatesLengthsIn, runMode=runMode, runThreadN=runThreadN, scoreDelBase=scoreDelBase, scoreDelOpen=scoreDelOpen, scoreGap=scoreGap, scoreGapATAC=scoreGapATAC, scoreGapGCAG=scoreGapGCAG, scoreGapNoncan=scoreGapNoncan, scoreGenomicLengthLog2scale=scoreGenomicLengthLog2scale, scoreInsBase=scoreInsBase, scoreInsOpen=scoreInsOpen, scoreStitchSJshift=scoreStitchSJshift, seedMultimapNmax=seedMultimapNmax, seedNoneLociPerWindow=seedNoneLociPerWindow, seedPerReadNmax=seedPerReadNmax, seedPerWindowNmax=seedPerWindowNmax, seedSearchLmax=seedSearchLmax, seedSearchStartLmax=seedSearchStartLmax, seedSearchStartLmaxOverLread=seedSearchStartLmaxOverLread, sjdbGTFchrPrefix=sjdbGTFchrPrefix, sjdbGTFfeatureExon=sjdbGTFfeatureExon, sjdbGTFtagExonParentGene=sjdbGTFtagExonParentGene, sjdbGTFtagExonParentTranscript=sjdbGTFtagExonParentTranscript, sjdbOverhang=sjdbOverhang, sjdbScore=sjdbScore, sysShell=sysShell, twopass1readsN=twopass1readsN, twopassMode=twopassMode, winAnchorDistNbins=winAnchorDistNbins, winAnchorMultimapNmax=winAnchorMultimapNmax, winBinNbits=winBinNbits, winFlankNbins=winFlankNbins)
-
-# Execute command
-exit_status = anduril_custom_functions.main(component, command, tempdir)
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
 
 # Return exit status
 sys.exit(exit_status)
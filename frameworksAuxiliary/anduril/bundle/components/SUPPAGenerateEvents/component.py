@@ -1,16 +1,13 @@
 #!/usr/bin/env python
 
 # Import modules
+import os
 import sys
-import anduril
 import anduril_custom_functions
-from anduril.args import *
+from anduril.args import component, tempdir
 
-# Command template
-command = '{_executable}$$$--boundary^^^{boundary}$$$--event-type^^^{event_type}$$$--exon-length^^^{exon_length}$$$--format^^^{format}$$$--mode^^^{mode}$$$--pool-genes^^^{pool_genes}$$$--threshold^^^{threshold}$$$--input-file^^^INFILE_input_file$$$--output-file^^^OUTDIRMAKE_output_file'.format(_executable=_executable, boundary=boundary, event_type=event_type, exon_length=exon_length, format=format, mode=mode, pool_genes=pool_genes, threshold=threshold)
-
-# Execute command
-exit_status = anduril_custom_functions.main(component, command, tempdir)
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
 
 # Return exit status
 sys.exit(exit_status)
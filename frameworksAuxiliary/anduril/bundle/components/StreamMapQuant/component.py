@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+
+# Import modules
+import os
+import sys
+import anduril_custom_functions
+from anduril.args import component, tempdir
+
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
+
+# Return exit status
+sys.exit(exit_status)
@@ -1,16 +1,13 @@
 #!/usr/bin/env python
 
 # Import modules
+import os
 import sys
-import anduril
 import anduril_custom_functions
-from anduril.args import *
+from anduril.args import component, tempdir
 
-# Command template
-command = '{_executable}$$$--bias^^^{bias}$$$--bootstrap-samples^^^{bootstrap_samples}$$$--fragment-length^^^{fragment_length}$$$--plaintext^^^{plaintext}$$$--sd^^^{sd}$$$--seed^^^{seed}$$$--single^^^{single}$$$--threads^^^{threads}$$$--index^^^INFILE_index$$$--output-dir^^^OUTDIR_output_dir$$$readseqs###INFILE_readseqs$$$readseqs_paired###INFILE_readseqs_paired$$$>###OUTFILE_pseudobam'.format(_executable=_executable, bias=bias, bootstrap_samples=bootstrap_samples, fragment_length=fragment_length, plaintext=plaintext, sd=sd, seed=seed, single=single, threads=threads)
-
-# Execute command
-exit_status = anduril_custom_functions.main(component, command, tempdir)
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
 
 # Return exit status
 sys.exit(exit_status)
@@ -126,8 +126,11 @@ def getExecPath(tempdir):
 def validateParameters(component, execDir):
 
     # Validate input/output/parameters
+    markPhase("validate_inputs")
     component = validateInputPaths(component)
+    markPhase("validate_outputs")
     component = validateOutputPaths(component, execDir)
+    markPhase("validate_parameters")
     component = validateRequiredParams(component)
 
     # Return 'component' object
@@ -136,168 +139,236 @@ def validateParameters(component, execDir):
 #<-- Input -->#
 def validateInputPaths(component):
 
-    # Import regex module
-    import re
-
     # Get dictionary of input ports
     inputDict = component.input.to_dict()
 
-    # Compile regular expressions
-    reInFile = re.compile(r'^INFILE_')
-    reInDir = re.compile(r'^INDIR_')
+    # Validate input ports for which a destination is indicated (in parallel)
+    ports = [(str(port), str(destination)) for port, destination in inputDict.items() if destination is not None]
+    errors = mapPorts(validateInputPath, ports)
 
-    # Loop over dictionary of input ports
-    for port, destination in inputDict.items():
+    # Die if any destination is invalid (first port in order)
+    for error in errors:
+        if error is not None:
+            sys.stderr.write(error + '[ERROR] Execution aborted.\n')
+            sys.exit(1)
 
-        # For input ports for which a destination is indicated...
-        if destination is not None:
+    # Update and return component
+    component.input.update(inputDict)
+    return(component)
 
-            # Convert to strings
-            port = str(port)
-            destination = str(destination)
+#<-- Validate single input port -->#
+def validateInputPath(port, destination):
+### Returns an error message if the destination of an input port is invalid, else 'None'. Checks
+### are based on a single 'stat' call; input directories that were validated before (in this or
+### other runs) are not accessed again unless they have been modified (cf. 'getValidationCacheFile').
 
-            # Die if destination does not exist
-            if not os.path.exists(destination):
-                sys.stderr.write('[ERROR] Input destination "{destination}" to port "{port}" not found!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                sys.exit(1)
+    # Import stat module
+    import stat
 
-            # If input port requests FILE:
-            if reInFile.match(port):
+    # Die if destination does not exist
+    try:
+        status = os.stat(destination)
+    except OSError:
+        return('[ERROR] Input destination "{destination}" to port "{port}" not found!\n'.format(destination=destination, port=port))
 
-                # Die if destination is not a file
-                if not os.path.isfile(destination):
-                    sys.stderr.write('[ERROR] Input destination "{destination}" to port "{port}" is not a file!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                    sys.exit(1)
+    # If input port requests FILE:
+    if port.startswith('INFILE_'):
 
-                # Die if destination file is not readable
-                if not os.access(destination, os.R_OK):
-                    sys.stderr.write('[ERROR] Input destination file "{destination}" to port "{port}" is not readable!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                    sys.exit(1)
+        # Die if destination is not a file
+        if not stat.S_ISREG(status.st_mode):
+            return('[ERROR] Input destination "{destination}" to port "{port}" is not a file!\n'.format(destination=destination, port=port))
 
-            # If input port requests DIRECTORY:
-            elif reInDir.match(port):
+        # Die if destination file is not readable
+        if not os.access(destination, os.R_OK):
+            return('[ERROR] Input destination file "{destination}" to port "{port}" is not readable!\n'.format(destination=destination, port=port))
 
-                # Die if destination is not a directory
-                if not os.path.isdir(destination):
-                    sys.stderr.write('[ERROR] Input destination "{destination}" to port "{port}" is not a directory!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                    sys.exit(1)
+    # If input port requests DIRECTORY:
+    elif port.startswith('INDIR_'):
 
-                # Die if destination directory is not accessible
-                if not os.access(destination, os.X_OK):
-                    sys.stderr.write('[ERROR] Input destination directory "{destination}" to port "{port}" is not accessible!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                    sys.exit(1)
+        # Die if destination is not a directory
+        if not stat.S_ISDIR(status.st_mode):
+            return('[ERROR] Input destination "{destination}" to port "{port}" is not a directory!\n'.format(destination=destination, port=port))
 
-                # Die if destination directory is empty
-                if len(os.listdir(destination)) == 0:
-                    sys.stderr.write('[ERROR] Input destination directory "{destination}" to port "{port}" is not empty!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                    sys.exit(1)
+        # Skip further checks if directory was validated before
+        cacheFile = getValidationCacheFile(destination, status)
+        if cacheFile is not None:
+            try:
+                with open(cacheFile, 'r') as cache_handle:
+                    if cache_handle.read() == destination:
+                        return(None)
+            except IOError:
+                pass
 
-            # Die if input port has illegal formatting:
-            else:
-                sys.stderr.write('[ERROR] Input port "{port}" has illegal format!\n[ERROR] Execution aborted.\n'.format(port=port))
-                sys.exit(1)
+        # Die if destination directory is not accessible
+        if not os.access(destination, os.X_OK):
+            return('[ERROR] Input destination directory "{destination}" to port "{port}" is not accessible!\n'.format(destination=destination, port=port))
 
-    # Update and return component
-    component.input.update(inputDict)
-    return(component)
+        # Die if destination directory is empty
+        if isEmptyDirectory(destination):
+            return('[ERROR] Input destination directory "{destination}" to port "{port}" is not empty!\n'.format(destination=destination, port=port))
+
+        # Cache validation result
+        if cacheFile is not None:
+            storeTemplateCacheFile(cacheFile, destination)
+
+    # Die if input port has illegal formatting:
+    else:
+        return('[ERROR] Input port "{port}" has illegal format!\n'.format(port=port))
+
+    # Return
+    return(None)
 
 #<-- Output -->
 def validateOutputPaths(component, execDir):
 
-    # Import regex module
-    import re
-
     # Get dictionary of output ports
     outputDict = component.output.to_dict()
 
-    # Compile regular expressions
-    reOutFile = re.compile(r'^OUTFILE_')
-    reOutDir = re.compile(r'^OUTDIR_')
-    reOutDirMake = re.compile(r'^OUTDIRMAKE_')
+    # Validate output ports (in parallel)
+    ports = [(str(port), str(destination), execDir) for port, destination in outputDict.items()]
+    results = mapPorts(validateOutputPath, ports)
 
-    # Loop over output list
-    for port, destination in outputDict.items():
+    # Die if any destination is invalid (first port in order)
+    for (port, destination, execDir), (error, validated) in zip(ports, results):
+        if error is not None:
+            sys.stderr.write(error + '[ERROR] Execution aborted.\n')
+            sys.exit(1)
+        outputDict[port] = validated
 
-        # Convert to strings
-        port = str(port)
-        destination = str(destination)
+    # Update and return component
+    component.output.update(outputDict)
+    return(component)
 
-        # Assert that the destination output file path equals the execution path plus the keyword
-        if not destination == os.path.join(execDir, port):
-            sys.stderr.write('[ERROR] Path to output port "{port}" not within execution directory "{execDir}"!\n[ERROR] Execution aborted.\n'.format(port=port, execDir=execDir))
-            sys.exit(1)
+#<-- Validate single output port -->#
+def validateOutputPath(port, destination, execDir):
+### Returns a tuple of an error message ('None' if the destination is valid) and the destination
+### (for 'OUTDIRMAKE_' ports with trailing '/').
 
-        # If output port requests FILE:
-        if reOutFile.match(port):
+    # Assert that the destination output file path equals the execution path plus the keyword
+    if not destination == os.path.join(execDir, port):
+        return('[ERROR] Path to output port "{port}" not within execution directory "{execDir}"!\n'.format(port=port, execDir=execDir), destination)
 
-            # Die if destination file exists
-            if os.path.exists(destination):
-                sys.stderr.write('[ERROR] Output destination file "{destination}" from port "{port}" already exists!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                sys.exit(1)
+    # If output port requests FILE:
+    if port.startswith('OUTFILE_'):
+
+        # Die if destination file exists
+        if os.path.exists(destination):
+            return('[ERROR] Output destination file "{destination}" from port "{port}" already exists!\n'.format(destination=destination, port=port), destination)
+
+        # Die if destination file is not writable
+        try:
+            open(destination, 'w').close()
+        except (IOError, OSError):
+            return('[ERROR] Output destination file "{destination}" from port "{port}" is not writable!\n'.format(destination=destination, port=port), destination)
+
+    # If output port requests ABSENT DIRECTORY (created by the executable):
+    elif port.startswith('OUTDIR_'):
+
+        # Die if destination folder exists
+        if os.path.exists(destination):
+            return('[ERROR] Output destination directory "{destination}" from port "{port}" already exists!\n'.format(destination=destination, port=port), destination)
+
+    # If output port requests PRESENT DIRECTORY:
+    elif port.startswith('OUTDIRMAKE_'):
 
-            # Die if destination file is not writable
+        # Ensure that destination is interpreted as directory by executing program (append '/')
+        destination = destination + '/'
+
+        # Try to create directory if it does not exist
+        if not os.path.exists(destination):
             try:
-                open(destination, 'w').close()
-            except OSError, errorCode:
-                sys.stderr.write('[ERROR] Output destination file "{destination}" from port "{port}" is not writable!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                sys.exit(1)
+                os.mkdir(destination)
+            except OSError:
+                return('[ERROR] Output destination directory "{destination}" from port "{port}" does not exist and cannot be created!\n'.format(destination=destination, port=port), destination)
 
-        # If output port requests ABSENT DIRECTORY (created by the executable):
-        elif reOutDir.match(port):
+        # Die if destination is not a directory
+        if not os.path.isdir(destination):
+            return('[ERROR] Output destination directory "{destination}" to port "{port}" is not a directory!\n'.format(destination=destination, port=port), destination)
 
-            # Die if destination folder exists
-            if os.path.exists(destination):
-                sys.stderr.write('[ERROR] Output destination directory "{destination}" from port "{port}" already exists!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                sys.exit(1)
+        # Die if destination directory is not accessible
+        if not os.access(destination, os.X_OK):
+            return('[ERROR] Output destination directory "{destination}" to port "{port}" is not accessible!\n'.format(destination=destination, port=port), destination)
 
-        # If output port requests PRESENT DIRECTORY:
-        elif reOutDirMake.match(port):
+    # Die if output port has illegal formatting:
+    else:
+        return('[ERROR] Output port "{port}" has illegal format!\n'.format(port=port), destination)
 
-            # Ensure that destination is interpreted as directory by executing program (append '/')
-            destination = outputDict[port] = outputDict[port] + '/'
+    # Return
+    return(None, destination)
 
-            # Try to create directory if it does not exist
-            if not os.path.exists(destination):
-                try:
-                    os.mkdir(destination)
-                except OSError, errorCode:
-                    sys.stderr.write('[ERROR] Output destination directory "{destination}" from port "{port}" does not exist and cannot be created!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                    sys.exit(1)
+#<-- Apply validation function to ports in parallel -->#
+def mapPorts(function, ports, threads=16):
+### Calls 'function' for each tuple of arguments in 'ports' and returns the results in the same
+### order. Metadata calls on network file systems are slow, so ports are processed by a pool of
+### up to 'threads' threads.
 
-            # Die if destination is not a directory
-            if not os.path.isdir(destination):
-                sys.stderr.write('[ERROR] Output destination directory "{destination}" to port "{port}" is not a directory!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                sys.exit(1)
+    # Process single port directly
+    if len(ports) < 2:
+        return([function(*args) for args in ports])
 
-            # Die if destination directory is not accessible
-            if not os.access(destination, os.X_OK):
-                sys.stderr.write('[ERROR] Output destination directory "{destination}" to port "{port}" is not accessible!\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port))
-                sys.exit(1)
+    # Process ports in thread pool
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(threads, len(ports)))
+    try:
+        results = pool.map(lambda args: function(*args), ports)
+    finally:
+        pool.close()
+        pool.join()
 
-        # Die if output port has illegal formatting:
-        else:
-            sys.stderr.write('[ERROR] Output port "{port}" has illegal format!\n[ERROR] Execution aborted.\n'.format(port=port))
-            sys.exit(1)
+    # Return results
+    return(results)
 
-    # Update and return component
-    component.output.update(outputDict)
-    return(component)
+#<-- Check whether directory is empty -->#
+def isEmptyDirectory(directory):
+### Stops at the first directory entry if 'scandir' is available ('os.scandir' or module 'scandir');
+### falls back to 'os.listdir' otherwise.
+
+    # Get 'scandir' function
+    try:
+        scandir = os.scandir
+    except AttributeError:
+        try:
+            from scandir import scandir
+        except ImportError:
+            return(len(os.listdir(directory)) == 0)
+
+    # Check for first entry
+    for entry in scandir(directory):
+        return(False)
+    return(True)
+
+#<-- Get validation cache file -->#
+def getValidationCacheFile(path, status):
+### Returns the cache file indicating that the input directory 'path' was validated (cf.
+### 'getTemplateCacheDir'; the file contains the path), indexed by path, device, inode and
+### modification/change times, or 'None' if the cache is disabled or not trusted. Directories are modified when entries are added or removed, so
+### shared read-only resources (e.g. genome indices) are validated only once.
+
+    # Import hashlib module
+    import hashlib
+
+    # Return if cache is disabled
+    cacheDir = getTemplateCacheDir()
+    if cacheDir is None:
+        return(None)
+
+    # Return cache file
+    cacheKey = hashlib.sha1(repr((path, status.st_dev, status.st_ino, status.st_mtime, status.st_ctime))).hexdigest()
+    return(os.path.join(cacheDir, cacheKey + ".valid"))
 
 #<-- Parameters -->#
 def validateRequiredParams(component):
 
     # Import modules
-    import subprocess
     import re
 
     # Get dictionary of parameters
     paramDict = component.param.to_dict()
 
-    # Check whether executable is installed and accessible (using shell function 'which')
+    # Check whether executable is installed and accessible
     executableList = paramDict['_executable'].split(None, 1)
-    process = subprocess.Popen(["which", str(executableList[0])], stdout=subprocess.PIPE)
-    location = process.stdout.read().rstrip()
-    if not os.path.exists(location):
+    location = findExecutable(str(executableList[0]))
+    if location is None:
         sys.stderr.write('[ERROR] Executable "{executable}" not found!\n[ERROR] Execution aborted.\n'.format(executable=executableList[0]))
         sys.exit(1)
     else:
@@ -339,40 +410,233 @@ def validateRequiredParams(component):
 
 #<-- Remove command expression markup and handle optional/multi/switch parameters & input/output ports
 def renderCommand (component, command, tempdir, execdir, separator='$$$', spacerNonPositional='^^^', spacerPositional='###', supportedRedirectors=['>', '2>', '&>']):
-
-    # Import regular expression module
-    import re
-
-    # Replace reserved metavalues/placeholders
-    command = replacePlaceholders(component, command, tempdir, execdir)
+### Renders the command from the compiled instruction list (cf. 'compileCommand'); only placeholders
+### (cf. 'replacePlaceholders'), input/output paths, optional ports and redirections are resolved
+### per invocation.
 
     # Get dictionaries of output ports and parameters
     inputDict = component.input.to_dict()
     outputDict = component.output.to_dict()
     paramDict = component.param.to_dict()
 
+    # Get compiled command
+    instructions = getCompiledCommand(command, inputDict, outputDict, separator, spacerNonPositional, spacerPositional, supportedRedirectors)
+
+    # Initialize 'stdout' and 'stderr'
+    stdout = stderr = None
+
+    # Iterate over instructions
+    commandList = []
+    for instruction in instructions:
+        kind = instruction[0]
+
+        # Literal text; replace reserved placeholders
+        if kind == 'text':
+            replace = instruction[1]
+            if '{{' in replace:
+                replace = replacePlaceholders(component, replace, tempdir, execdir)
+
+        # Redirector
+        elif kind == 'redirect':
+            option, argument = instruction[1:]
+            if '_' + argument not in paramDict or paramDict['_' + argument]:
+                validateRedirectionTarget(component, outputDict[argument])
+                stdout, stderr = setStdOutErr(stdout, stderr, option, outputDict[argument])
+            replace = ''
+
+        # Input port; non-positional ports are followed by their '_ADD_<n>' ports
+        elif kind == 'input':
+            option, argument, group = instruction[1:]
+            if inputDict[argument] is None:
+                replace = ''
+            elif option is None:
+                replace = inputDict[argument]
+            else:
+                replace = option + ' ' + ' '.join([inputDict[argument]] + [inputDict[arg] for arg in group if inputDict[arg] is not None])
+
+        # Output port
+        elif kind == 'output':
+            option, argument = instruction[1:]
+            if '_' + argument in paramDict and not paramDict['_' + argument]:
+                replace = ''
+            elif option is None:
+                replace = outputDict[argument]
+            else:
+                replace = option + ' ' + outputDict[argument]
+
+        # Add item to command list
+        commandList.append(replace)
+
+    # Remove empty strings from processed command list
+    commandList = [item for item in commandList if item]
+
+    # Ensure executable is addressed by full absolute path
+    commandList[0] = paramDict['_executable']
+
+    # Join command list items by spaces
+    command = ' '.join(commandList)
+
+    # Return command string
+    return(command, stdout, stderr)
+
+#<-- Get compiled command from cache -->#
+def getCompiledCommand(command, inputDict, outputDict, separator, spacerNonPositional, spacerPositional, supportedRedirectors):
+### Returns the instruction list of 'command' (cf. 'compileCommand'). Instruction lists are stored
+### as JSON in the template cache (cf. 'getTemplateCacheDir'), indexed by the hash of the command and
+### the names of the ports. As ports are referenced by name and placeholders (e.g. '{{TEMPDIR}}') are
+### only filled in when rendering, all instances of a component with identical parameters share a
+### single entry.
+
+    # Import modules
+    import hashlib
+    import json
+
+    # Get cache directory
+    cacheDir = getTemplateCacheDir()
+
+    # Compile command if cache is disabled
+    compileArgs = (command, sorted(inputDict), sorted(outputDict), separator, spacerNonPositional, spacerPositional, supportedRedirectors)
+    if cacheDir is None:
+        return(compileCommand(*compileArgs))
+
+    # Load instructions from cache
+    cacheKey = hashlib.sha1(repr((2,) + compileArgs)).hexdigest()
+    cacheFile = os.path.join(cacheDir, cacheKey + ".json")
+    try:
+        with open(cacheFile, 'r') as cache_handle:
+            return(loadInstructions(json.load(cache_handle)))
+    except (IOError, ValueError, TypeError):
+        pass
+
+    # Compile command
+    instructions = compileCommand(*compileArgs)
+
+    # Store instructions in cache
+    storeTemplateCacheFile(cacheFile, json.dumps(instructions))
+
+    # Return instructions
+    return(instructions)
+
+#<-- Convert instruction list loaded from JSON -->#
+def loadInstructions(instructions):
+### Restores the types of an instruction list loaded from JSON (lists to tuples, unicode to str).
+
+    # Convert values recursively
+    def convert(value):
+        if isinstance(value, list):
+            return(tuple([convert(item) for item in value]))
+        if isinstance(value, unicode):
+            return(value.encode('utf-8'))
+        return(value)
+
+    # Return instructions
+    return([convert(instruction) for instruction in instructions])
+
+#<-- Get template cache directory -->#
+def getTemplateCacheDir(env_var="ANDURIL_TEMPLATE_CACHE"):
+### Returns the directory in which compiled commands, command templates, executable locations and
+### validation results are cached: the value of the environment variable 'ANDURIL_TEMPLATE_CACHE'
+### (default: per-user directory in the system's temporary directory) or 'None' if it is set to
+### 'none' or if the directory cannot be trusted (cf. 'isTrustedCacheDir').
+
+    # Import tempfile module
+    import tempfile
+
+    # Get cache directory
+    cacheDir = os.environ.get(env_var, os.path.join(tempfile.gettempdir(), "anduril_templates_{uid}".format(uid=os.getuid())))
+
+    # Return cache directory
+    if cacheDir.lower() == "none" or not isTrustedCacheDir(cacheDir):
+        return(None)
+    return(cacheDir)
+
+#<-- Check template cache directory -->#
+UNTRUSTED_CACHE_DIRS = set()
+def isTrustedCacheDir(cacheDir):
+### Creates 'cacheDir' (with owner-only permissions) if it does not exist and returns 'True' if it is
+### a directory (not a symbolic link) owned by the current user with mode 0700. Cached files are
+### used without further checks, so directories that other users could have created or could write
+### to (e.g. in a shared temporary directory) are not used; a warning is written once per directory.
+
+    # Import stat module
+    import stat
+
+    # Create directory
+    try:
+        if not os.path.lexists(cacheDir):
+            os.makedirs(cacheDir, 0700)
+    except OSError:
+        pass
+
+    # Check type, owner and mode of directory
+    try:
+        status = os.lstat(cacheDir)
+        trusted = stat.S_ISDIR(status.st_mode) and status.st_uid == os.getuid() and stat.S_IMODE(status.st_mode) == 0700
+    except OSError:
+        trusted = False
+
+    # Warn if directory is not trusted
+    if not trusted and cacheDir not in UNTRUSTED_CACHE_DIRS:
+        UNTRUSTED_CACHE_DIRS.add(cacheDir)
+        sys.stderr.write('[WARNING] Template cache directory "{cacheDir}" is not a directory owned by the current user with mode 0700; cache disabled.\n'.format(cacheDir=cacheDir))
+
+    # Return whether directory is trusted
+    return(trusted)
+
+#<-- Store file in template cache -->#
+def storeTemplateCacheFile(cacheFile, content):
+### Writes 'content' atomically to 'cacheFile' (in a directory returned by 'getTemplateCacheDir').
+
+    # Store file
+    try:
+        tmpFile = "{cacheFile}.{pid}".format(cacheFile=cacheFile, pid=os.getpid())
+        with open(tmpFile, 'wb') as cache_handle:
+            cache_handle.write(content)
+        os.rename(tmpFile, cacheFile)
+    except (IOError, OSError), errorCode:
+        sys.stderr.write('[WARNING] File could not be stored in template cache:\n[WARNING] {errorCode}\n'.format(errorCode=errorCode))
+
+#<-- Compile command into instruction list -->#
+def compileCommand(command, inputKeys, outputKeys, separator='$$$', spacerNonPositional='^^^', spacerPositional='###', supportedRedirectors=['>', '2>', '&>']):
+### Parses the command expressions into a list of instructions, one per expression:
+### ('text', <value>) - literal value (parameters, metavalues, executable); may contain placeholders
+### ('redirect', <redirector>, <output port>) - redirection of STDOUT/STDERR to output port
+### ('input', <option|None>, <input port>, <multi-input ports>) - input port (positional: 'None')
+### ('output', <option|None>, <output port>) - output port (positional: 'None')
+
+    # Import regular expression module
+    import re
+
     # Compile regular expressions
     regexExpr = re.compile(r'([^\s]+?)' + r'(' + re.escape(spacerNonPositional) + r'|' + re.escape(spacerPositional) + r')' + r'(.+)')
     regexArgMeta = re.compile(r'\{\{' + r'(.*)' + r'\}\}')
+    regexPlaceholder = re.compile(r'\{\{' + r'(CORES|MEMBYCORE|TEMPDIR|EXECDIR)' + r'\}\}')
     regexInt = re.compile(r'^\d+$')
     regexMultiList = re.compile(r'\[\[' + r'(.*)' + r'\]\]')
     regexEmptyOrSpace = re.compile(r'^[^\s]*$')
-    regexAdd = re.compile(r'_ADD_\d+$')
+    regexAdd = re.compile(r'(.+)_ADD_\d+$')
+
+    # Group multi-input ports ('<port>_ADD_<n>') by port
+    inputKeys = set(inputKeys)
+    outputKeys = set(outputKeys)
+    multiInputs = {}
+    for key in sorted(inputKeys):
+        matchAdd = regexAdd.match(key)
+        if matchAdd:
+            multiInputs.setdefault(matchAdd.group(1), []).append(key)
 
     # Split command by separator
     commandList = command.split(separator)
 
-    # Initialize 'stdout' and 'stderr'
-    stdout = stderr = None
-
     # Initialize redirector flag (after the first redirector, only further redirectors are allowed)
     redirectorEncountered = False
 
     # Iterate over command list/index
+    instructions = []
     for index, expression in enumerate(commandList):
 
-        # Initialize replacement value
-        replace = ''
+        # Initialize instruction (expressions that do not match are kept)
+        instruction = ('text', expression)
 
         # If expression matches expected format
         matchExpr = regexExpr.match(expression)
@@ -391,10 +655,7 @@ def renderCommand (component, command, tempdir, execdir, separator='$$$', spacer
             # If option is redirector
             if option in supportedRedirectors:
                 redirectorEncountered = True
-                if '_' + argument not in paramDict.keys() or paramDict['_' + argument]:
-                    validateRedirectionTarget(component, outputDict[argument])
-                    stdout, stderr = setStdOutErr(stdout, stderr, option, outputDict[argument])
-                replace = ''
+                instruction = ('redirect', option, argument)
 
             # Die if a redirector expression has been processed before
             elif redirectorEncountered:
@@ -404,22 +665,22 @@ def renderCommand (component, command, tempdir, execdir, separator='$$$', spacer
             # Check for inputs, other outputs and parameters
             else:
 
-                # If argument is a metavalue of the form {{VALUE}}
+                # If argument is a metavalue of the form {{VALUE}} (placeholders are kept; cf. 'replacePlaceholders')
                 matchArgMeta = regexArgMeta.match(argument)
-                if matchArgMeta:
+                if matchArgMeta and not regexPlaceholder.search(argument):
                     argContent = str(matchArgMeta.group(1))
 
                     # Metavalue: {{FALSE}} / unset switch
                     if argContent in ['FALSE', '']:
-                        replace = ''
+                        instruction = ('text', '')
 
                     # Metavalue: {{TRUE}} / set switch
                     elif argContent == 'TRUE':
-                        replace = option
+                        instruction = ('text', option)
 
                     # Metavalue: {{<int>}} / repeat switch
                     elif regexInt.match(argContent):
-                        replace = ' '.join([option] * int(argContent))
+                        instruction = ('text', ' '.join([option] * int(argContent)))
 
                     # Metavalue: {{[[item1//item2//.../itemN]]}} / repeat option with arguments
                     elif regexMultiList.match(argContent):
@@ -428,81 +689,49 @@ def renderCommand (component, command, tempdir, execdir, separator='$$$', spacer
                         for arg in argsList:
                             if regexEmptyOrSpace.match(arg):
                                 replaceList.append(option + ' ' + arg)
-                        if replaceList:
-                            replace = ' '.join(replaceList)
-                        else:
-                            replace = ''
+                        instruction = ('text', ' '.join(replaceList))
 
                     # Die if unknown metavalue
                     else:
                         sys.stderr.write('[ERROR] The metavalue "{argContent}" in expression "{expression}" was not recognized!\n[ERROR] Execution aborted.\n'.format(argContent=argContent, expression=expression))
                         sys.exit(1)
 
-                # If argument is input port
-                elif argument in inputDict.keys():
+                # If argument is input port ('_ADD_<n>' ports are added to their main port)
+                elif argument in inputKeys:
 
-                    if inputDict[argument] is None:
-                        replace = ''
-                    elif regexAdd.search(argument):
-                        replace = ''
+                    if regexAdd.match(argument):
+                        instruction = ('text', '')
                     elif spacer == spacerNonPositional:
-                        regexFindMultiInputs = re.compile(r'^' + re.escape(argument) + regexAdd.pattern)
-                        argList = sorted([arg for arg in inputDict.keys() if regexFindMultiInputs.search(arg)])
-                        valString = ' '.join([inputDict[argument]] + [inputDict[arg] for arg in argList if inputDict[arg] is not None])
-                        replace = option + ' ' + valString
-                    elif spacer == spacerPositional:
-                        replace = inputDict[argument]
+                        instruction = ('input', option, argument, tuple(multiInputs.get(argument, [])))
+                    else:
+                        instruction = ('input', None, argument, ())
 
                 # If argument is output port
-                elif argument in outputDict.keys():
+                elif argument in outputKeys:
 
-                    if '_' + argument in paramDict.keys() and not paramDict['_' + argument]:
-                        replace = ''
-                    elif spacer == spacerPositional:
-                        replace = outputDict[argument]
-                    elif spacer == spacerNonPositional:
-                        replace = option + ' ' + outputDict[argument]
+                    if spacer == spacerPositional:
+                        instruction = ('output', None, argument)
                     else:
-                        sys.stderr.write('[ERROR] Unexpected output port expression "{expression}"!\n[ERROR] Execution aborted.\n'.format(expression=expression))
-                        sys.exit(1)
+                        instruction = ('output', option, argument)
 
                 # If option is non-positional
                 elif spacer == spacerNonPositional:
-                    replace = option + ' ' + argument
+                    instruction = ('text', option + ' ' + argument)
 
                 # If option is positional
-                elif spacer == spacerPositional:
-                    replace = argument
-
-                # Catch exception
                 else:
-                    sys.stderr.write('[ERROR] Unexpected parameter expression "{expression}"!\n[ERROR] Execution aborted.\n'.format(expression=expression))
-                    sys.exit(1)
-
-            # Replace expression
-            commandList[index] = replace
-
-        # Ignore first expression (command executable)
-        elif index == 0:
-            pass
+                    instruction = ('text', argument)
 
-        # Die if expression is not of expected format
-        else:
+        # Die if expression is not of expected format (the first expression is the executable)
+        elif index != 0:
             sys.stderr.write('[ERROR] The expression "{expression}" is not of the expected format!\n[ERROR] Execution aborted.\n'.format(expression=expression))
             sys.exit(1)
 
-    # Remove empty strings from processed command list
-    commandList = [item for item in commandList if item]
-
-    # Ensure executable is addressed by full absolute path
-    commandList[0] = paramDict['_executable']
-
-    # Join command list items by spaces
-    command = ' '.join(commandList)
+        # Add instruction
+        instructions.append(instruction)
 
-    # Return command string
-    return(command, stdout, stderr)
-    pass
+    # Return instructions
+    return(instructions)
 
 #<-- Substitute placeholder variables with corresponding values -->#
 def replacePlaceholders(component, command, tempdir, execdir):
@@ -626,14 +855,28 @@ def executeCommand(component, execDir, command, stdout, stderr):
     # Split command into arguments
     command = shlex.split(command)
 
+    # Hold genome index in shared memory of node (if enabled)
+    command = getSharedGenomeCommand(component, command)
+
     # Get STDOUT/STDERR filenames
     stdout_filename, stderr_filename = getStdOutErrFiles(stdout, stderr, component, execDir)
 
+    # Get STDOUT/STDERR streams that are not redirected to output ports (captured in the log)
+    windows = dict([(name, None) for name, target in [("stdout", stdout), ("stderr", stderr)] if target is None])
+
     # Execute command remotely, locally or not at all
+    markPhase("execute")
     if   component.param._execMode == "remote":
-        exit_status = executeRemotelyDRMAAtoSGE(component, command, stdout_filename, stderr_filename)
+        compression, suffix = getStdOutErrCompression()
+        remote_stdout = stdout_filename[:len(stdout_filename) - len(suffix)] if "stdout" in windows else stdout_filename
+        remote_stderr = stderr_filename[:len(stderr_filename) - len(suffix)] if "stderr" in windows else stderr_filename
+        exit_status = executeRemotelyWithResubmission(component, command, remote_stdout, remote_stderr)
+        for name, source, target in [("stdout", remote_stdout, stdout_filename), ("stderr", remote_stderr, stderr_filename)]:
+            if name in windows and os.path.isfile(source):
+                windows[name] = compressStdOutErrFile(source, target, compression)
     elif component.param._execMode == "local":
-        exit_status = executeLocally(command, stdout_filename, stderr_filename)
+        resources_filename = os.path.join(execDir, component.meta.instanceName) + ".resources"
+        exit_status = executeLocally(component, command, stdout_filename, stderr_filename, resources_filename, windows)
     elif component.param._execMode == "none":
         exit_status = -1
     else:
@@ -641,7 +884,8 @@ def executeCommand(component, execDir, command, stdout, stderr):
         sys.exit(1)
 
     # Print command output
-    printStdOutErr(stdout, stdout_filename, stderr, stderr_filename)
+    markPhase("print_output")
+    printStdOutErr(stdout, stdout_filename, stderr, stderr_filename, windows)
 
     # Print exit status
     printTitleValue("Exit status", exit_status)
@@ -655,37 +899,82 @@ def getStdOutErrFiles(stdout, stderr, component, execDir):
     # Get basic file path from execution directory and instance name
     base_path = os.path.join(execDir, component.meta.instanceName)
 
+    # Get suffix of compressed files
+    compression, suffix = getStdOutErrCompression()
+
     # Set 'stdout'
     if stdout is None:
-        stdout = base_path + ".stdout"
+        stdout = base_path + ".stdout" + suffix
 
     # Set 'stderr'
     if stderr is None:
-        stderr = base_path + ".stderr"
+        stderr = base_path + ".stderr" + suffix
 
     # Return 'stdout' and 'stderr' filehandles
     return(stdout, stderr)
 
 #<-- Local execution -->#
-def executeLocally(command, stdout, stderr):
+def executeLocally(component, command, stdout, stderr, resources, windows):
+### Streams that are keys of 'windows' are piped through 'teeStream' into their (optionally
+### compressed) files; the head/tail windows of these streams are stored in 'windows'.
 
     # Import modules
     import subprocess
     import datetime
-
-    # Open 'stdout' and 'stderr' filehandles
-    stdout_handle = open(stdout, 'w')
-    stderr_handle = open(stderr, 'w')
+    import resource
 
     # Print progress section
     printHeader("Progress")
 
-    # Get & print submit/start time
-    time_submit = time_start = datetime.datetime.now()
-    printKeyValue("{0:31s}:".format("Started"), "{:%Y-%b-%d, %H:%M:%S}".format(time_start))
+    # Get & print submit time
+    time_submit = datetime.datetime.now()
+    printKeyValue("{0:31s}:".format("Submitted"), "{:%Y-%b-%d, %H:%M:%S}".format(time_submit))
+
+    # Execute command while sampling resource usage; close filehandles, release resources and stop
+    # tees (terminating the command, if still running) in any case
+    handles = {}
+    ticket = None
+    process = None
+    sampler = None
+    tees = []
+    try:
 
-    # Execute command
-    exit_status = subprocess.call(command, stdout=stdout_handle, stderr=stderr_handle)
+        # Open 'stdout' and 'stderr' filehandles
+        compression, suffix = getStdOutErrCompression()
+        for name, filename in [("stdout", stdout), ("stderr", stderr)]:
+            if name in windows:
+                handles[name] = openStdOutErrFile(filename, 'w', compression)
+            else:
+                handles[name] = open(filename, 'w')
+
+        # Wait until resource broker (if enabled) admits job
+        ticket = acquireLocalResources(component)
+
+        # Get & print start time
+        time_start = datetime.datetime.now()
+        printKeyValue("{0:31s}:".format("Started"), "{:%Y-%b-%d, %H:%M:%S}".format(time_start))
+
+        # Execute command
+        usage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        targets = dict([(name, subprocess.PIPE if name in windows else handles[name]) for name in handles])
+        process = subprocess.Popen(command, stdout=targets["stdout"], stderr=targets["stderr"])
+        sampler = startResourceSampler(process.pid, resources)
+        for name, source in [("stdout", process.stdout), ("stderr", process.stderr)]:
+            if name in windows:
+                tees.append(startStreamTee(name, source, handles[name], windows))
+        exit_status = process.wait()
+
+    finally:
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+        for tee in tees:
+            tee.join()
+        summary = stopResourceSampler(sampler)
+        releaseLocalResources(ticket)
+        for handle in handles.values():
+            handle.close()
+    usage_after = resource.getrusage(resource.RUSAGE_CHILDREN)
 
     # Get & print end time
     time_end = datetime.datetime.now()
@@ -694,16 +983,24 @@ def executeLocally(command, stdout, stderr):
     # Print time stats
     printTimeStats(submit=time_submit, start=time_start, end=time_end)
 
-    # Close 'stdout' and 'stderr' filehandles
-    stdout_handle.close()
-    stderr_handle.close()
+    # Print resource stats
+    printLocalResourceStats(usage_before, usage_after, (time_end - time_start).total_seconds(), summary, resources)
 
     # Return exit status
     return(exit_status)
 
+# Exit status of components whose job exceeded its runtime or was killed (e.g. for exceeding its
+# memory limit); such jobs are resubmitted if enabled (cf. 'executeRemotelyWithResubmission')
+RESUBMIT_EXIT_STATUS = 99
+
 #<-- DRMAA/SGE execution -->#
 def executeRemotelyDRMAAtoSGE(component, command, stdout, stderr):
 
+    # Submit through persistent submission daemon if available
+    socketPath = os.environ.get("ANDURIL_DRMAA_DAEMON_SOCKET")
+    if socketPath:
+        return(executeRemotelyViaDaemon(component, command, stdout, stderr, socketPath))
+
     # Import modules
     import drmaa
     import datetime
@@ -721,16 +1018,7 @@ def executeRemotelyDRMAAtoSGE(component, command, stdout, stderr):
     job_template.errorPath = ":" + stderr      # ':' required by DRMAA
     job_template.remoteCommand = command[0]
     job_template.args = command[1:]
-    job_template.nativeSpecification  = ''
-    job_template.nativeSpecification += ' -shell no' # execute job without wrapping shell
-    job_template.nativeSpecification += ' -b yes'    # binary command instead of job file
-#    job_template.nativeSpecification += ' -p 0'      # priority level (changing priorities currently not implemented at user level)
-#    job_template.nativeSpecification += ' -w e'      # jobs with invalid requests will be rejected; currently inactivated because of grid engine problem
-    job_template.nativeSpecification += ' -w n'      # no job validation
-#    currently inactivated because of grid engine problem
-    job_template.nativeSpecification += ' -pe smp {cpus} -l membycore={mem} -l runtime={rt}'.format(cpus=component.param._cores, mem=component.param._membycore, rt=component.param._runtime)
-    job_template.nativeSpecification += ' -v LD_LIBRARY_PATH="{}"'.format(os.environ["LD_LIBRARY_PATH"])
-    job_template.nativeSpecification += ' -v PATH="{}"'.format(os.environ["PATH"])
+    job_template.nativeSpecification = getDRMAANativeSpecification(component)
 
     # Submit job
     try:
@@ -741,6 +1029,7 @@ def executeRemotelyDRMAAtoSGE(component, command, stdout, stderr):
 
     # Print job ID
     printTitleValue("Job ID", job_id)
+    recordManifest({'job_id': str(job_id)})
 
     # Print progress section header
     printHeader("Progress")
@@ -750,10 +1039,9 @@ def executeRemotelyDRMAAtoSGE(component, command, stdout, stderr):
     printKeyValue("{0:31s}:".format("Submitted"), "{:%Y-%b-%d, %H:%M:%S}".format(time_submit))
 
     # Check job status until job runs; die in case of problems
-    checkDRMAAJobStatus(session, job_id)
+    time_start = checkDRMAAJobStatus(session, job_id)
 
-    # Get & print job start time
-    time_start = datetime.datetime.now()
+    # Print job start time
     printKeyValue("{0:31s}:".format("Started"), "{:%Y-%b-%d, %H:%M:%S}".format(time_start))
 
     # Wait for job to end
@@ -770,7 +1058,7 @@ def executeRemotelyDRMAAtoSGE(component, command, stdout, stderr):
     session.exit()
 
     # Print time stats
-    printTimeStats(submit=time_submit, start=time_start, end=time_end)
+    printTimeStats(submit=time_submit, start=time_start, end=time_end, resourceUsage=job_info.resourceUsage)
 
     # Print resource stats
     printDRMAAResourceStats(job_info.resourceUsage)
@@ -778,46 +1066,190 @@ def executeRemotelyDRMAAtoSGE(component, command, stdout, stderr):
     # Return exit status
     return(job_info.exitStatus)
 
+#<-- DRMAA: Build native specification -->#
+def getDRMAANativeSpecification(component):
+
+    # Build native specification
+    nativeSpecification  = ''
+    nativeSpecification += ' -shell no' # execute job without wrapping shell
+    nativeSpecification += ' -b yes'    # binary command instead of job file
+#    nativeSpecification += ' -p 0'      # priority level (changing priorities currently not implemented at user level)
+#    nativeSpecification += ' -w e'      # jobs with invalid requests will be rejected; currently inactivated because of grid engine problem
+    nativeSpecification += ' -w n'      # no job validation
+#    currently inactivated because of grid engine problem
+    nativeSpecification += ' -pe smp {cpus} -l membycore={mem} -l runtime={rt}'.format(cpus=component.param._cores, mem=component.param._membycore, rt=component.param._runtime)
+    nativeSpecification += ' -v LD_LIBRARY_PATH="{}"'.format(os.environ["LD_LIBRARY_PATH"])
+    nativeSpecification += ' -v PATH="{}"'.format(os.environ["PATH"])
+
+    # Return native specification
+    return(nativeSpecification)
+
+#<-- DRMAA: Execution through persistent submission daemon -->#
+def executeRemotelyViaDaemon(component, command, stdout, stderr, socketPath):
+### Sends the job to the submission daemon ('drmaa_submission_daemon.py') listening on 'socketPath'
+### and waits for the daemon to report that the job was submitted, started running and finished.
+### Dies if the daemon reports that the job stayed in an inactive state (e.g. held or suspended) for
+### too long (cf. 'checkDRMAAJobStatus').
+
+    # Import modules
+    import socket
+    import json
+    import datetime
+
+    # Connect to daemon
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socketPath)
+    except socket.error, errorCode:
+        sys.stderr.write('[ERROR] Cannot connect to DRMAA submission daemon at "{socketPath}":\n[ERROR] {errorCode}\n[ERROR] Execution aborted.\n'.format(socketPath=socketPath, errorCode=errorCode))
+        sys.exit(1)
+    connection_handle = connection.makefile('rw')
+
+    # Send job description
+    job = {
+        'jobName': str(component.meta.instanceName),
+        'stdout': stdout,
+        'stderr': stderr,
+        'command': command,
+        'nativeSpecification': getDRMAANativeSpecification(component),
+    }
+    connection_handle.write(json.dumps({'action': 'submit', 'job': job}) + "\n")
+    connection_handle.flush()
+
+    # Process events
+    job_id = None
+    time_submit = time_start = None
+    while True:
+
+        # Set timeout: runtime limit once job runs
+        if time_start is not None:
+            remaining = getRuntimeSeconds(component.param._runtime) - (datetime.datetime.now() - time_start).total_seconds()
+            connection.settimeout(max(remaining, 1))
+
+        # Get event
+        try:
+            line = connection_handle.readline()
+        except socket.timeout:
+            connection_handle.write(json.dumps({'action': 'terminate'}) + "\n")
+            connection_handle.flush()
+            sys.stderr.write("[ERROR] Job '%s' exceeded specified runtime (%s seconds).\n[ERROR] Execution aborted.\n" % (job_id, component.param._runtime))
+            sys.exit(RESUBMIT_EXIT_STATUS)
+        if not line:
+            sys.stderr.write("[ERROR] Connection to DRMAA submission daemon lost (job '%s').\n[ERROR] Execution aborted.\n" % job_id)
+            sys.exit(1)
+        event = json.loads(line)
+
+        # Job denied
+        if event['event'] == 'denied':
+            sys.stderr.write('[ERROR] Job was denied by DRM with the following error code:\n[ERROR] {errorCode}\n[ERROR] Execution aborted.\n'.format(errorCode=event['error']))
+            sys.exit(1)
+
+        # Job in prolonged inactive state (terminated by daemon)
+        elif event['event'] == 'inactive':
+            sys.stderr.write("[ERROR] Job '%s' is in a prolonged inactive state (job status: '%s').\n[ERROR] Execution aborted.\n" % (job_id, event['status']))
+            sys.exit(1)
+
+        # Job submitted
+        elif event['event'] == 'submitted':
+            job_id = event['job_id']
+            printTitleValue("Job ID", job_id)
+            recordManifest({'job_id': str(job_id)})
+            printHeader("Progress")
+            time_submit = datetime.datetime.now()
+            printKeyValue("{0:31s}:".format("Submitted"), "{:%Y-%b-%d, %H:%M:%S}".format(time_submit))
+
+        # Job running (or already done/failed; the 'finished' event follows and is classified below)
+        elif event['event'] == 'running':
+            time_start = datetime.datetime.fromtimestamp(event['time'])
+            printKeyValue("{0:31s}:".format("Started"), "{:%Y-%b-%d, %H:%M:%S}".format(time_start))
+
+        # Job finished
+        elif event['event'] == 'finished':
+            break
+
+    # Close connection
+    connection_handle.close()
+    connection.close()
+
+    # Set start time if job finished before the daemon reported it running
+    if time_start is None:
+        time_start = datetime.datetime.now()
+        printKeyValue("{0:31s}:".format("Started"), "{:%Y-%b-%d, %H:%M:%S}".format(time_start))
+
+    # Die if job did not finish regularly
+    checkDRMAAJobExit(job_id, event['wasAborted'], event['hasSignal'], event['terminatedSignal'], event['hasExited'])
+
+    # Get & print job end time
+    time_end = datetime.datetime.now()
+    printKeyValue("{0:31s}:".format("Finished"), "{:%Y-%b-%d, %H:%M:%S}".format(time_end))
+
+    # Print time stats
+    printTimeStats(submit=time_submit, start=time_start, end=time_end, resourceUsage=event['resourceUsage'])
+
+    # Print resource stats
+    printDRMAAResourceStats(event['resourceUsage'])
+
+    # Return exit status
+    return(event['exitStatus'])
+
 #<-- DRMAA: Check status of jobs that are not running -->#
-def checkDRMAAJobStatus(session, job_id, timeout_active=0.5, tries_inactive=60, timeout_inactive=60):
-### Continuously checks the status of a DRMAA submitted job based on the job ID and the DRMAA session.
-### Function waits (timeout_active seconds) as long as job is in active queue and returns successfully (no return value) if job execution commences.
-### Function dies with error if (a) job fails or (b) stays in an inactive state continuously (tries_inactive * timeout_inactive seconds). 
+def checkDRMAAJobStatus(session, job_id, interval_min=0.5, interval_max=60, backoff=2.0, jitter=0.1, max_inactive=3600):
+### Checks the status of a DRMAA submitted job based on the job ID and the DRMAA session until the job starts running.
+### Checks are spaced with exponential backoff (starting at interval_min, multiplied by 'backoff' up to interval_max seconds, each randomly
+### stretched/shrunk by up to 'jitter') so that many concurrently waiting components do not flood the scheduler; the interval is reset on
+### every change of the job status.
+### Function returns the time at which the job was first observed running (or finished) and dies with error if the job stays in an
+### inactive state continuously for more than max_inactive seconds.
 
     # Import modules
-    import drmaa, time
+    import drmaa, time, datetime
 
-    # Set tries
-    tries = tries_inactive
+    # Initialize interval, previous status and start of inactivity
+    interval = interval_min
+    previous = None
+    inactive_since = None
 
-    # While there are tries left...
-    while tries > 0:
+    # Check status until job runs
+    while True:
 
         # Get job status
         status = session.jobStatus(job_id)
 
+        # Reset interval if status changed
+        if status != previous:
+            interval = interval_min
+            previous = status
+
         # If job...
-        # ...is in active queue, reset tries, sleep and try again
-        if   status == 'queued_active':
-            tries = tries_inactive
-            time.sleep(timeout_active)
-        # ...is running, break out of loop
-        elif status == 'running':
-            break
-        # ...failed, die with error
-        elif status == 'failed':
-            sys.stderr.write("[ERROR] Job '%s' failed!\n[ERROR] Execution aborted.\n" % job_id)
-            sys.exit(1)
-        # Else sleep and try again for a specified amount of times, then die
+        # ...is running, already done or failed, return time of observation (failures, e.g. jobs killed for
+        # exceeding their memory limit, are classified after waiting for the job; cf. 'checkDRMAAJobExit')
+        if status in ['running', 'done', 'failed']:
+            return(datetime.datetime.now())
+        # ...is in active queue, reset inactivity
+        elif status == 'queued_active':
+            inactive_since = None
+        # ...is in any other (inactive) state, die if state persists
         else:
-            if tries == 1:
+            if inactive_since is None:
+                inactive_since = time.time()
+            elif time.time() - inactive_since > max_inactive:
                 sys.stderr.write("[ERROR] Job '%s' is in a prolonged inactive state.\n[ERROR] Execution aborted.\n" % job_id)
                 session.control(job_id, drmaa.JobControlAction.TERMINATE)
                 sys.exit(1)
-            else:
-		tries -= 1
-                print "Job '{0}' not in active queue (job status: '{1}'). Trying again in {2} seconds ({3} tries left).".format(job_id, status, timeout_inactive, tries)
-                time.sleep(timeout_inactive)
+            print "Job '{0}' not in active queue (job status: '{1}'). Trying again in {2:.1f} seconds.".format(job_id, status, interval)
+
+        # Sleep and increase interval
+        time.sleep(getBackoffInterval(interval, jitter))
+        interval = min(interval * backoff, interval_max)
+
+#<-- Get randomized backoff interval -->#
+def getBackoffInterval(interval, jitter):
+
+    # Import random module
+    import random
+
+    # Return interval stretched/shrunk by random jitter
+    return(interval * random.uniform(1 - jitter, 1 + jitter))
 
 #<--- DRMAA: Wait for running jobs to finish --->#
 def waitForDRMAAJobToFinish(session, job_id, component):
@@ -829,31 +1261,58 @@ def waitForDRMAAJobToFinish(session, job_id, component):
     try:
         job_info = session.wait(job_id, timeout=int(getRuntimeSeconds(component.param._runtime)))
 
-    # ...but die if it times out
+    # ...but terminate job and die if it times out
     except drmaa.errors.ExitTimeoutException:
         sys.stderr.write("[ERROR] Job '%s' exceeded specified runtime (%s seconds).\n[ERROR] Execution aborted.\n" % (job_id, component.param._runtime))
-        sys.exit(1)
+        try:
+            session.control(job_id, drmaa.JobControlAction.TERMINATE)
+        except drmaa.errors.DrmaaException:
+            pass
+        session.exit()
+        sys.exit(RESUBMIT_EXIT_STATUS)
+
+    # Die if job did not finish regularly (closing the session, so that the job can be resubmitted)
+    try:
+        checkDRMAAJobExit(job_id, job_info.wasAborted, job_info.hasSignal, job_info.terminatedSignal, job_info.hasExited)
+    except SystemExit:
+        session.exit()
+        raise
+
+    # Return job info
+    return(job_info)
+
+#<--- DRMAA: Check whether jobs finished regularly --->#
+def checkDRMAAJobExit(job_id, wasAborted, hasSignal, terminatedSignal, hasExited):
 
     # Die if job was aborted
-    if job_info.wasAborted:
+    if wasAborted:
         sys.stderr.write("[ERROR] Job '%s' was aborted.\n[ERROR] Execution aborted.\n" % job_id)
         sys.exit(1)
 
     # Die if job was killed
-    if job_info.hasSignal:
-        sys.stderr.write("[ERROR] Job '%s' was killed (signal: %s).\n[ERROR] Execution aborted.\n" % (job_id, job_info.terminatedSignal))
-        sys.exit(1)
+    if hasSignal:
+        sys.stderr.write("[ERROR] Job '%s' was killed (signal: %s).\n[ERROR] Execution aborted.\n" % (job_id, terminatedSignal))
+        sys.exit(RESUBMIT_EXIT_STATUS)
 
     # Die if job ended prematurely for any other reason
-    if not job_info.hasExited:
+    if not hasExited:
         sys.stderr.write("[ERROR] Job '%s' exited prematurely.\n[ERROR] Execution aborted.\n" % job_id)
         sys.exit(1)
 
-    # Return job info
-    return(job_info)
-
 #<-- Print time statistics -->#
-def printTimeStats(submit, start, end):
+def printTimeStats(submit, start, end, resourceUsage=None):
+### Prints queue, run and total times. If the DRM application reports submission, start and end
+### times in 'resourceUsage' (e.g. Grid Engine), these are used instead of the times observed by
+### the component, and the delay with which the component noticed the job start is reported.
+
+    # Get times reported by scheduler
+    scheduler = getDRMAASchedulerTimes(resourceUsage)
+
+    # Calculate start latency and use scheduler times
+    start_latency = None
+    if scheduler is not None:
+        start_latency = max((start - scheduler['start']).total_seconds(), 0)
+        submit, start, end = scheduler['submit'], scheduler['start'], scheduler['end']
 
     # Calculate durations
     queue_time = start - submit
@@ -867,6 +1326,40 @@ def printTimeStats(submit, start, end):
     printKeyValue("{0:31s}:".format("Queue time"), "{0:.3f} s".format(float(queue_time.total_seconds()), "s"))
     printKeyValue("{0:31s}:".format("Runtime"), "{0:.3f} s".format(float(run_time.total_seconds()), "s"))
     printKeyValue("{0:31s}:".format("Total time"), "{0:.3f} s".format(float(total_time.total_seconds()), "s"))
+    if start_latency is not None:
+        printKeyValue("{0:31s}:".format("Start latency"), "{0:.3f} s".format(float(start_latency)))
+    printKeyValue("{0:31s}:".format("Time source"), "scheduler" if scheduler is not None else "component")
+
+    # Record times in run manifest
+    recordManifest({'submit': submit.isoformat(), 'start': start.isoformat(), 'end': end.isoformat(), 'queue_s': queue_time.total_seconds(), 'run_s': run_time.total_seconds(), 'total_s': total_time.total_seconds(), 'start_latency_s': start_latency, 'source': "scheduler" if scheduler is not None else "component"}, section='times')
+
+#<-- Get submission/start/end times reported by the DRM application -->#
+def getDRMAASchedulerTimes(resourceUsage):
+### Returns a dictionary of datetime objects ('submit', 'start', 'end') or 'None' if the times are
+### not available. Times reported in milliseconds since the epoch are converted.
+
+    # Import datetime module
+    import datetime
+
+    # Return if resource usage is not available
+    if not resourceUsage:
+        return(None)
+
+    # Convert times
+    times = {}
+    for key, name in [('submit', 'submission_time'), ('start', 'start_time'), ('end', 'end_time')]:
+        try:
+            value = float(resourceUsage[name])
+        except (KeyError, TypeError, ValueError):
+            return(None)
+        if value <= 0:
+            return(None)
+        if value > 1e11:
+            value /= 1000
+        times[key] = datetime.datetime.fromtimestamp(value)
+
+    # Return times
+    return(times)
 
 #<-- Print resource statistics -->#
 def printDRMAAResourceStats(dict):
@@ -891,8 +1384,21 @@ def printDRMAAResourceStats(dict):
    printKeyValue("{0:31s}:".format("Voluntary context switches"), "{0:.0f}".format(float(dict['ru_nvcsw'])))
    printKeyValue("{0:31s}:".format("Involuntary context switches"), "{0:.0f}".format(float(dict['ru_nivcsw'])))
 
+   # Record resources in run manifest
+   keys = [('wallclock_s', 'ru_wallclock'), ('utime_s', 'ru_utime'), ('stime_s', 'ru_stime'), ('cpu_s', 'cpu'), ('mem_gbs', 'mem'), ('maxvmem_bytes', 'maxvmem'), ('maxrss_kb', 'ru_maxrss'), ('io_gb', 'io'), ('iow_s', 'iow'), ('inblock', 'ru_inblock'), ('oublock', 'ru_oublock'), ('minflt', 'ru_minflt'), ('majflt', 'ru_majflt'), ('nvcsw', 'ru_nvcsw'), ('nivcsw', 'ru_nivcsw')]
+   values = {}
+   for key, name in keys:
+       values[key] = float(dict[name])
+   recordManifest(values, section='resources')
+
 #<-- Print STDOUT/STDERR -->#
-def printStdOutErr(stdout, stdout_filename, stderr, stderr_filename):
+def printStdOutErr(stdout, stdout_filename, stderr, stderr_filename, windows=None):
+### Prints the STDOUT/STDERR of the command. Only a head/tail window of each stream is printed (cf.
+### 'getStdOutErrWindowSize'); windows captured during execution are passed in 'windows'.
+
+    # Initialize windows
+    if windows is None:
+        windows = {}
 
     # STDOUT: Print header
     printHeader("Command STDOUT")
@@ -901,17 +1407,9 @@ def printStdOutErr(stdout, stdout_filename, stderr, stderr_filename):
     if stdout is not None:
         sys.stdout.write("< [STDOUT] was redirected to output file '%s'. >\n" % stdout_filename)
 
-    # Else write entire content of STDOUT file
+    # Else write window of STDOUT file
     else:
-        if os.path.exists(stdout_filename):
-            if os.path.getsize(stdout_filename) > 0:
-                sys.stdout.write('< [STDOUT] as saved in file "{file}": >\n'.format(file=stdout_filename))
-                stdout_handle = open(stdout_filename, 'r')
-                sys.stdout.write(stdout_handle.read())
-            else:
-                sys.stdout.write('< [STDOUT] as saved in file "{file}" is empty. >\n'.format(file=stdout_filename))
-        else:
-            sys.stdout.write('< [STDOUT] file "{file}" was not produced. >\n'.format(file=stdout_filename))
+        printStdOutErrWindow("STDOUT", stdout_filename, windows.get("stdout"))
 
     # STDERR: Print header
     printHeader("Command STDERR")
@@ -920,17 +1418,1011 @@ def printStdOutErr(stdout, stdout_filename, stderr, stderr_filename):
     if stderr is not None:
         sys.stdout.write("< [STDERR] was redirected to output file '%s'. >\n" % stderr_filename)
 
-    # Else write entire content of STDERR file
+    # Else write window of STDERR file
     else:
-        if os.path.exists(stderr_filename):
-            if os.path.getsize(stderr_filename) > 0:
-                sys.stdout.write('< [STDERR] as saved in file "{file}": >\n'.format(file=stderr_filename))
-                stderr_handle = open(stderr_filename, 'r')
-                sys.stdout.write(stderr_handle.read())
-            else:
-                sys.stdout.write('< [STDERR] as saved in file "{file}" is empty. >\n'.format(file=stderr_filename))
+        printStdOutErrWindow("STDERR", stderr_filename, windows.get("stderr"))
+
+#<-- Print window of STDOUT/STDERR -->#
+def printStdOutErrWindow(label, filename, window=None):
+
+    # Return if file was not produced
+    if not os.path.exists(filename):
+        sys.stdout.write('< [{label}] file "{file}" was not produced. >\n'.format(label=label, file=filename))
+        return
+
+    # Print entire stream in chunks if window size is not limited
+    if window is None and getStdOutErrWindowSize() is None:
+        source_handle = openStdOutErrFile(filename, 'r')
+        chunk = source_handle.read(65536)
+        if chunk:
+            sys.stdout.write('< [{label}] as saved in file "{file}": >\n'.format(label=label, file=filename))
+            sys.stdout.write(chunk)
+            copyStream(source_handle, sys.stdout, newStreamWindow())
         else:
-            sys.stdout.write('< [STDERR] file "{file}" was not produced. >\n'.format(file=stderr_filename))
+            sys.stdout.write('< [{label}] as saved in file "{file}" is empty. >\n'.format(label=label, file=filename))
+        source_handle.close()
+        return
+
+    # Read window from file if it was not captured
+    if window is None:
+        window = readStreamWindow(filename)
+
+    # Return if file is empty
+    if window['total'] == 0:
+        sys.stdout.write('< [{label}] as saved in file "{file}" is empty. >\n'.format(label=label, file=filename))
+        return
+
+    # Write head, number of omitted bytes and tail
+    sys.stdout.write('< [{label}] as saved in file "{file}": >\n'.format(label=label, file=filename))
+    sys.stdout.write(''.join(window['head']))
+    omitted = window['total'] - window['head_size'] - window['tail_size']
+    if omitted > 0:
+        sys.stdout.write('\n< [{label}] {omitted} bytes omitted; see file "{file}". >\n'.format(label=label, omitted=omitted, file=filename))
+    sys.stdout.write(''.join(window['tail']))
+
+
+###########################################
+#<--- STREAMING STDOUT/STDERR CAPTURE --->#
+###########################################
+
+#<-- Get STDOUT/STDERR compression -->#
+def getStdOutErrCompression(env_var="ANDURIL_STDOUTERR_COMPRESSION"):
+### Returns the compression method ('gzip', 'zstd' or 'None') and file suffix for STDOUT/STDERR files
+### that are not redirected to output ports. 'zstd' requires the 'zstandard' module and falls back
+### to 'gzip' if it is not available.
+
+    # Get compression method
+    compression = os.environ.get(env_var, "").strip().lower()
+
+    # Return compression method and suffix
+    if compression in ["", "none"]:
+        return(None, "")
+    if compression in ["zstd", "zst"]:
+        try:
+            import zstandard
+            return("zstd", ".zst")
+        except ImportError:
+            compression = "gzip"
+    if compression in ["gzip", "gz"]:
+        return("gzip", ".gz")
+    sys.stderr.write("[ERROR] Illegal STDOUT/STDERR compression '{compression}'!\n[ERROR] Execution aborted.\n".format(compression=compression))
+    sys.exit(1)
+
+#<-- Get size of STDOUT/STDERR head/tail windows -->#
+def getStdOutErrWindowSize(env_var="ANDURIL_STDOUTERR_WINDOW", default="1M"):
+### Returns the number of bytes printed from both the head and the tail of STDOUT/STDERR, or 'None'
+### to print the entire streams (window size 0).
+
+    # Get window size
+    size = getMemoryBytes(os.environ.get(env_var, default))
+
+    # Return window size
+    if size <= 0:
+        return(None)
+    return(size)
+
+#<-- Open (compressed) STDOUT/STDERR file -->#
+def openStdOutErrFile(filename, mode, compression=None):
+
+    # Import gzip module
+    import gzip
+
+    # Guess compression from file name when reading
+    if mode == 'r':
+        if filename.endswith(".gz"):
+            compression = "gzip"
+        elif filename.endswith(".zst"):
+            compression = "zstd"
+
+    # Open file
+    if compression == "gzip":
+        return(gzip.open(filename, mode + 'b'))
+    if compression == "zstd":
+        import zstandard
+        if mode == 'r':
+            return(zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb')))
+        return(zstandard.ZstdCompressor().stream_writer(open(filename, 'wb')))
+    return(open(filename, mode + 'b'))
+
+#<-- Create STDOUT/STDERR window -->#
+def newStreamWindow():
+### Returns an empty window holding up to 'getStdOutErrWindowSize' bytes from each of the head and
+### the tail of a stream, and the total number of bytes seen. Without a limit, only the total is
+### counted.
+
+    # Import collections module
+    import collections
+
+    # Return window
+    return({'limit': getStdOutErrWindowSize(), 'head': [], 'head_size': 0, 'tail': collections.deque(), 'tail_size': 0, 'total': 0})
+
+#<-- Add chunk to STDOUT/STDERR window -->#
+def updateStreamWindow(window, chunk):
+
+    # Count bytes
+    window['total'] += len(chunk)
+    limit = window['limit']
+    if limit is None:
+        return
+
+    # Fill head
+    if window['head_size'] < limit:
+        head = chunk[:limit - window['head_size']]
+        window['head'].append(head)
+        window['head_size'] += len(head)
+        chunk = chunk[len(head):]
+
+    # Fill tail and drop bytes beyond limit
+    if chunk:
+        window['tail'].append(chunk)
+        window['tail_size'] += len(chunk)
+        while window['tail_size'] > limit:
+            excess = window['tail_size'] - limit
+            first = window['tail'].popleft()
+            if len(first) > excess:
+                window['tail'].appendleft(first[excess:])
+            window['tail_size'] -= min(len(first), excess)
+
+#<-- Copy stream in chunks and record window -->#
+def copyStream(source, target, window, chunk_size=65536):
+### Copies the readable file object 'source' into 'target' (if not 'None') in chunks of
+### 'chunk_size' bytes, and records head, tail and size in 'window'.
+
+    # Copy chunks
+    while True:
+        chunk = source.read(chunk_size) if hasattr(source, 'read') else os.read(source, chunk_size)
+        if not chunk:
+            break
+        if target is not None:
+            target.write(chunk)
+        updateStreamWindow(window, chunk)
+
+    # Return window
+    return(window)
+
+#<-- Start streaming STDOUT/STDERR of running job to file -->#
+def startStreamTee(name, source, target, windows):
+### Starts a thread that forwards the pipe 'source' in chunks to 'target' while the job is running
+### and stores the window of the stream in 'windows[name]'. Only the window is kept in memory;
+### without a window limit, the window is discarded and printed from 'target' later.
+
+    # Import threading module
+    import threading
+
+    # Copy stream
+    def tee():
+        window = copyStream(source.fileno(), target, newStreamWindow())
+        source.close()
+        if window['limit'] is not None:
+            windows[name] = window
+
+    # Start thread
+    thread = threading.Thread(target=tee)
+    thread.daemon = True
+    thread.start()
+
+    # Return thread
+    return(thread)
+
+#<-- Compress STDOUT/STDERR file -->#
+def compressStdOutErrFile(source, target, compression):
+### Compresses 'source' into 'target' in chunks (e.g. after remote execution, where jobs write to
+### uncompressed files) and returns the window of the stream (or 'None' without window limit).
+
+    # Return if files are not compressed
+    if compression is None or source == target:
+        return(None)
+
+    # Compress file
+    source_handle = open(source, 'rb')
+    target_handle = openStdOutErrFile(target, 'w', compression)
+    window = copyStream(source_handle, target_handle, newStreamWindow())
+    source_handle.close()
+    target_handle.close()
+    os.remove(source)
+
+    # Return window
+    if window['limit'] is None:
+        return(None)
+    return(window)
+
+#<-- Read STDOUT/STDERR window from file -->#
+def readStreamWindow(filename):
+### Reads the window of an existing STDOUT/STDERR file. The tail of uncompressed files is read
+### directly; compressed files are decompressed in chunks.
+
+    # Initialize window
+    window = newStreamWindow()
+    limit = window['limit']
+
+    # Read head and tail of uncompressed file
+    if not filename.endswith((".gz", ".zst")):
+        size = os.path.getsize(filename)
+        with open(filename, 'rb') as source_handle:
+            updateStreamWindow(window, source_handle.read(limit))
+            source_handle.seek(max(limit, size - limit))
+            updateStreamWindow(window, source_handle.read(limit))
+        window['total'] = size
+        return(window)
+
+    # Decompress file in chunks
+    source_handle = openStdOutErrFile(filename, 'r')
+    copyStream(source_handle, None, window)
+    source_handle.close()
+    return(window)
+
+
+#########################
+#<--- SHARED GENOMES --->#
+#########################
+
+#<-- Get shared genome mode -->#
+def getSharedGenomeMode(component, env_var="ANDURIL_STAR_SHARED_GENOME"):
+### Returns the shared genome mode of STAR components: 'node' (genome indices are held in shared
+### memory of the executing node, cf. 'star_shared_genome.py'), 'keep' (as 'node', but indices are
+### not removed when the last job finishes) or 'None' if disabled (default). The mode is set by the
+### component parameter '_sharedGenome' (if defined and not 'none') or the environment variable
+### 'env_var'. Components that do not define '_sharedGenome' (i.e. all but STAR) are never wrapped.
+
+    # Return if component does not support shared genomes
+    paramDict = component.param.to_dict()
+    if '_sharedGenome' not in paramDict:
+        return(None)
+
+    # Get mode from component parameter or environment
+    mode = str(paramDict['_sharedGenome'] or "none").strip().lower()
+    if mode in ["", "none"]:
+        mode = os.environ.get(env_var, "none").strip().lower()
+
+    # Return mode
+    if mode in ["", "none", "0", "false"]:
+        return(None)
+    if mode in ["node", "1", "true"]:
+        return("node")
+    if mode == "keep":
+        return("keep")
+    sys.stderr.write("[WARNING] Illegal shared genome mode '{mode}'. Shared genome disabled.\n".format(mode=mode))
+    return(None)
+
+#<-- Wrap command for shared genome -->#
+def getSharedGenomeCommand(component, command, env_var="ANDURIL_STAR_SHARED_GENOME_DIR", env_var_grace="ANDURIL_STAR_SHARED_GENOME_GRACE"):
+### Returns the command (list of arguments) wrapped by 'star_shared_genome.py' if a shared genome
+### mode is set (cf. 'getSharedGenomeMode'); lock and state files are written to the node-local
+### directory 'env_var' (default: '/dev/shm'). In mode 'node', indices are removed if no job attached
+### to them for 'env_var_grace' seconds (default: 60) after the last job finished.
+
+    # Return command unchanged if shared genome is disabled
+    mode = getSharedGenomeMode(component)
+    if mode is None:
+        return(command)
+
+    # Build wrapper command
+    wrapper = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "star_shared_genome.py")]
+    if os.environ.get(env_var):
+        wrapper += ["--lock-dir", os.environ[env_var]]
+    if mode == "keep":
+        wrapper += ["--keep"]
+    elif os.environ.get(env_var_grace):
+        wrapper += ["--grace", os.environ[env_var_grace]]
+    recordManifest({'shared_genome': mode})
+
+    # Return wrapped command
+    return(wrapper + ["--"] + command)
+
+
+#################################
+#<--- LOCAL RESOURCE BROKER --->#
+#################################
+
+#<-- Get memory size in bytes -->#
+def getMemoryBytes(memory):
+### Converts memory strings of the form '<int>[KMG]' (cf. '_membycore') to bytes.
+
+    # Get multiplier from suffix
+    memory = str(memory).strip().upper()
+    multipliers = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if memory[-1:] in multipliers:
+        return(int(memory[:-1]) * multipliers[memory[-1]])
+
+    # Return bytes
+    return(int(memory))
+
+#<-- Get node resource budget -->#
+def getLocalResourceBudget():
+### Returns the number of cores and the amount of memory (in bytes) that locally executed jobs may
+### use concurrently. Defaults to all cores and the total memory of the node; can be overridden by
+### the environment variables 'ANDURIL_LOCAL_CORES' and 'ANDURIL_LOCAL_MEMORY' (e.g. '200G').
+
+    # Import modules
+    import multiprocessing
+
+    # Get cores
+    cores = int(os.environ.get("ANDURIL_LOCAL_CORES", multiprocessing.cpu_count()))
+
+    # Get memory
+    if os.environ.get("ANDURIL_LOCAL_MEMORY"):
+        memory = getMemoryBytes(os.environ["ANDURIL_LOCAL_MEMORY"])
+    else:
+        memory = 0
+        with open("/proc/meminfo", 'r') as meminfo_handle:
+            for line in meminfo_handle:
+                if line.startswith("MemTotal:"):
+                    memory = int(line.split()[1]) * 1024
+                    break
+
+    # Return budget
+    return(cores, memory)
+
+#<-- Load, update and store broker ledger under exclusive lock -->#
+def updateLocalBrokerLedger(brokerDir, update):
+### Calls 'update' with the ledger (dictionary) of the resource broker in 'brokerDir' while holding
+### an exclusive lock, writes back the modified ledger and returns the return value of 'update'.
+### Entries of processes that no longer exist are removed from the ledger first.
+
+    # Import modules
+    import fcntl
+    import json
+    import errno
+
+    # Acquire lock
+    lock_handle = open(os.path.join(brokerDir, "lock"), 'a')
+    fcntl.flock(lock_handle, fcntl.LOCK_EX)
+    try:
+
+        # Load ledger
+        ledgerFile = os.path.join(brokerDir, "ledger.json")
+        ledger = {'next_ticket': 1, 'queued': [], 'running': []}
+        if os.path.isfile(ledgerFile) and os.path.getsize(ledgerFile) > 0:
+            with open(ledgerFile, 'r') as ledger_handle:
+                ledger = json.load(ledger_handle)
+
+        # Remove entries of dead processes
+        for state in ['queued', 'running']:
+            alive = []
+            for entry in ledger[state]:
+                try:
+                    os.kill(entry['pid'], 0)
+                except OSError, errorCode:
+                    if errorCode.errno == errno.ESRCH:
+                        continue
+                alive.append(entry)
+            ledger[state] = alive
+
+        # Update ledger
+        value = update(ledger)
+
+        # Store ledger
+        tmpFile = "{ledgerFile}.{pid}".format(ledgerFile=ledgerFile, pid=os.getpid())
+        with open(tmpFile, 'w') as ledger_handle:
+            json.dump(ledger, ledger_handle)
+        os.rename(tmpFile, ledgerFile)
+
+    # Release lock
+    finally:
+        fcntl.flock(lock_handle, fcntl.LOCK_UN)
+        lock_handle.close()
+
+    # Return value
+    return(value)
+
+#<-- Wait for admission by local resource broker -->#
+def acquireLocalResources(component, interval_min=0.2, interval_max=5.0):
+### Registers the job's declared resources ('_cores' x '_membycore') with the node-local resource
+### broker and blocks until the job is admitted. The broker is a ledger in the directory given by
+### the environment variable 'ANDURIL_LOCAL_BROKER', shared by all Anduril instances on the node.
+### Jobs are admitted in order of priority (environment variable 'ANDURIL_LOCAL_PRIORITY', higher
+### first) and submission (FIFO) once their resources fit into the node's free budget; a job whose
+### request exceeds the total budget is admitted when no other job is running.
+### Returns a ticket for 'releaseLocalResources' or 'None' if the broker is disabled.
+
+    # Import modules
+    import time
+
+    # Return if broker is disabled
+    brokerDir = os.environ.get("ANDURIL_LOCAL_BROKER")
+    if not brokerDir:
+        return(None)
+
+    # Create broker directory
+    if not os.path.isdir(brokerDir):
+        try:
+            os.makedirs(brokerDir)
+        except OSError:
+            if not os.path.isdir(brokerDir):
+                raise
+
+    # Get requested resources and node budget
+    cores = int(component.param._cores)
+    memory = cores * getMemoryBytes(component.param._membycore)
+    priority = int(os.environ.get("ANDURIL_LOCAL_PRIORITY", 0))
+    budget_cores, budget_memory = getLocalResourceBudget()
+
+    # Enqueue job
+    def enqueue(ledger):
+        ticket = ledger['next_ticket']
+        ledger['next_ticket'] += 1
+        ledger['queued'].append({'ticket': ticket, 'pid': os.getpid(), 'cores': cores, 'memory': memory, 'priority': priority, 'instance': str(component.meta.instanceName)})
+        return(ticket)
+    ticket = updateLocalBrokerLedger(brokerDir, enqueue)
+
+    # Admit job if it is next in line and fits into the free budget
+    def admit(ledger):
+        queued = sorted(ledger['queued'], key=lambda entry: (-entry['priority'], entry['ticket']))
+        if queued[0]['ticket'] != ticket:
+            return(False)
+        used_cores = sum([entry['cores'] for entry in ledger['running']])
+        used_memory = sum([entry['memory'] for entry in ledger['running']])
+        fits = used_cores + cores <= budget_cores and used_memory + memory <= budget_memory
+        if not fits and ledger['running']:
+            return(False)
+        ledger['queued'] = [entry for entry in ledger['queued'] if entry['ticket'] != ticket]
+        ledger['running'].append(queued[0])
+        return(True)
+
+    # Wait for admission
+    brokerInfo = "{cores} cores, {memory:.1f} GB (node budget: {budget_cores} cores, {budget_memory:.1f} GB)".format(cores=cores, memory=memory / 1024.0 ** 3, budget_cores=budget_cores, budget_memory=budget_memory / 1024.0 ** 3)
+    printKeyValue("{0:31s}:".format("Resources requested"), brokerInfo)
+    interval = interval_min
+    while not updateLocalBrokerLedger(brokerDir, admit):
+        time.sleep(interval)
+        interval = min(interval * 2, interval_max)
+
+    # Return ticket
+    return((brokerDir, ticket))
+
+#<-- Release resources admitted by local resource broker -->#
+def releaseLocalResources(ticket):
+
+    # Return if broker is disabled
+    if ticket is None:
+        return
+
+    # Remove job from ledger
+    brokerDir, ticket = ticket
+    def release(ledger):
+        ledger['running'] = [entry for entry in ledger['running'] if entry['ticket'] != ticket]
+    updateLocalBrokerLedger(brokerDir, release)
+
+
+#####################################
+#<--- LOCAL RESOURCE MONITORING --->#
+#####################################
+
+#<-- Get resource sampling interval -->#
+def getResourceSamplingInterval(env_var="ANDURIL_RESOURCE_SAMPLING_INTERVAL", default=1.0):
+### Returns the interval (in seconds) at which the resource usage of locally executed jobs is
+### sampled, or 'None' if sampling is disabled (interval <= 0) or '/proc' is not available.
+
+    # Return if process information is not available
+    if not os.path.isdir("/proc/self"):
+        return(None)
+
+    # Get interval
+    try:
+        interval = float(os.environ.get(env_var, default))
+    except ValueError:
+        sys.stderr.write("[WARNING] Illegal resource sampling interval '{value}'. Sampling disabled.\n".format(value=os.environ[env_var]))
+        return(None)
+
+    # Return interval
+    if interval <= 0:
+        return(None)
+    return(interval)
+
+#<-- Get process tree -->#
+def getProcessTree(root_pid):
+### Returns a dictionary of the fields of '/proc/<pid>/stat' (following the command name) of the
+### process 'root_pid' and all of its descendants, indexed by process ID.
+
+    # Read status of all processes
+    stats = {}
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(os.path.join("/proc", entry, "stat"), 'r') as stat_handle:
+                stat = stat_handle.read()
+        except (IOError, OSError):
+            continue
+        fields = stat[stat.rfind(')') + 2:].split()
+        stats[int(entry)] = fields
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    # Collect descendants of root process
+    tree = {}
+    pids = [root_pid]
+    while pids:
+        pid = pids.pop()
+        if pid in stats:
+            tree[pid] = stats[pid]
+            pids.extend(children.get(pid, []))
+
+    # Return process tree
+    return(tree)
+
+#<-- Sample resource usage of process tree -->#
+def sampleProcessTree(root_pid, filename, interval, stop, summary):
+### Samples CPU usage, resident/virtual memory, read/write bytes and open file descriptors of the
+### process tree rooted at 'root_pid' every 'interval' seconds until 'stop' is set. Each sample is
+### written to the tab-separated time series 'filename'; peaks and integrals are stored in
+### 'summary'. CPU time and I/O of processes include those of their terminated children; to avoid
+### counting these twice, cumulative values are summed over live processes and reported as the
+### maximum observed so far.
+
+    # Import modules
+    import time
+
+    # Get system constants
+    ticks = float(os.sysconf('SC_CLK_TCK'))
+    page_size = os.sysconf('SC_PAGE_SIZE')
+
+    # Initialize counters
+    iow = {}
+    cpu = 0.0
+    read = 0
+    write = 0
+    last_cpu = 0.0
+    last_time = time.time()
+    time_start = last_time
+
+    # Open time series file
+    series_handle = open(filename, 'w')
+    series_handle.write("time\tprocesses\tcpu_cores\trss_bytes\tvmem_bytes\tread_bytes\twrite_bytes\topen_fds\n")
+
+    # Sample until job has finished
+    while True:
+
+        # Get process tree
+        now = time.time()
+        tree = getProcessTree(root_pid)
+        tree_cpu = 0.0
+        tree_read = 0
+        tree_write = 0
+        rss = 0
+        vmem = 0
+        fds = 0
+        for pid, fields in tree.items():
+
+            # Get CPU time (incl. terminated children), memory and I/O wait (processes are identified
+            # by PID & start time)
+            tree_cpu += sum([int(field) for field in fields[11:15]]) / ticks
+            rss += int(fields[21]) * page_size
+            vmem += int(fields[20])
+            if len(fields) > 39:
+                iow[(pid, fields[19])] = int(fields[39]) / ticks
+
+            # Get I/O (incl. terminated children)
+            try:
+                with open("/proc/{pid}/io".format(pid=pid), 'r') as io_handle:
+                    for line in io_handle:
+                        name, value = line.split(':')
+                        if name == "read_bytes":
+                            tree_read += int(value)
+                        elif name == "write_bytes":
+                            tree_write += int(value)
+            except (IOError, OSError, ValueError):
+                pass
+
+            # Get open file descriptors
+            try:
+                fds += len(os.listdir("/proc/{pid}/fd".format(pid=pid)))
+            except OSError:
+                pass
+
+        # Calculate cumulative values and CPU usage since previous sample
+        cpu = max(cpu, tree_cpu)
+        read = max(read, tree_read)
+        write = max(write, tree_write)
+        cpu_cores = (cpu - last_cpu) / (now - last_time) if now > last_time else 0.0
+
+        # Update summary
+        summary['samples'] += 1
+        summary['mem'] += rss / 1024.0 ** 3 * (now - last_time)
+        summary['maxrss'] = max(summary['maxrss'], rss)
+        summary['maxvmem'] = max(summary['maxvmem'], vmem)
+        summary['maxcpu'] = max(summary['maxcpu'], cpu_cores)
+        summary['maxfds'] = max(summary['maxfds'], fds)
+        summary['maxprocs'] = max(summary['maxprocs'], len(tree))
+        summary['read'] = read
+        summary['write'] = write
+        summary['iow'] = sum(iow.values())
+
+        # Write sample
+        if tree:
+            series_handle.write("{time:.2f}\t{procs}\t{cpu:.2f}\t{rss}\t{vmem}\t{read}\t{write}\t{fds}\n".format(time=now - time_start, procs=len(tree), cpu=cpu_cores, rss=rss, vmem=vmem, read=read, write=write, fds=fds))
+            series_handle.flush()
+        last_cpu = cpu
+        last_time = now
+
+        # Wait for next sample
+        if stop.wait(interval) or stop.is_set():
+            break
+
+    # Close time series file
+    series_handle.close()
+
+#<-- Start resource sampling -->#
+def startResourceSampler(pid, filename):
+### Starts sampling the resource usage of process 'pid' and its descendants in a background thread.
+### Returns a handle for 'stopResourceSampler' or 'None' if sampling is disabled.
+
+    # Import threading module
+    import threading
+
+    # Return if sampling is disabled
+    interval = getResourceSamplingInterval()
+    if interval is None:
+        return(None)
+
+    # Start sampling thread
+    stop = threading.Event()
+    summary = {'samples': 0, 'mem': 0.0, 'maxrss': 0, 'maxvmem': 0, 'maxcpu': 0.0, 'maxfds': 0, 'maxprocs': 0, 'read': 0, 'write': 0, 'iow': 0.0}
+    thread = threading.Thread(target=sampleProcessTree, args=(pid, filename, interval, stop, summary))
+    thread.daemon = True
+    thread.start()
+
+    # Return handle
+    return((thread, stop, summary))
+
+#<-- Stop resource sampling -->#
+def stopResourceSampler(sampler):
+
+    # Return if sampling is disabled
+    if sampler is None:
+        return(None)
+
+    # Stop sampling thread and return summary
+    thread, stop, summary = sampler
+    stop.set()
+    thread.join()
+    return(summary)
+
+#<-- Print resource statistics of local execution -->#
+def printLocalResourceStats(usage_before, usage_after, wallclock, summary, filename):
+### Prints resource statistics in the layout of 'printDRMAAResourceStats'. CPU times, block I/O,
+### page faults and context switches are taken from the resource usage of terminated children
+### ('usage_before'/'usage_after'); memory, I/O and peak values from the sampled time series.
+
+    # Get accounting values
+    stats = {}
+    stats['ru_wallclock'] = wallclock
+    for key in ['ru_utime', 'ru_stime', 'ru_inblock', 'ru_oublock', 'ru_minflt', 'ru_majflt', 'ru_nvcsw', 'ru_nivcsw']:
+        stats[key] = getattr(usage_after, key) - getattr(usage_before, key)
+    stats['cpu'] = stats['ru_utime'] + stats['ru_stime']
+
+    # Get sampled values; maximum resident set size of the entire tree (in kb)
+    if summary is None:
+        summary = {'samples': 0, 'mem': 0.0, 'maxrss': 0, 'maxvmem': 0, 'read': 0, 'write': 0, 'iow': 0.0}
+    stats['mem'] = summary['mem']
+    stats['maxvmem'] = summary['maxvmem']
+    stats['ru_maxrss'] = max(summary['maxrss'] / 1024.0, usage_after.ru_maxrss)
+    stats['io'] = (summary['read'] + summary['write']) / 1024.0 ** 3
+    stats['iow'] = summary['iow']
+
+    # Print resources of interest
+    printDRMAAResourceStats(stats)
+
+    # Print sampled peaks
+    if summary['samples'] > 0:
+        printKeyValue("{0:31s}:".format("Maximum CPU usage"), "{0:.2f} cores".format(summary['maxcpu']))
+        printKeyValue("{0:31s}:".format("Maximum processes"), "{0:d}".format(summary['maxprocs']))
+        printKeyValue("{0:31s}:".format("Maximum open file descriptors"), "{0:d}".format(summary['maxfds']))
+        printKeyValue("{0:31s}:".format("Bytes read"), "{0:d}".format(summary['read']))
+        printKeyValue("{0:31s}:".format("Bytes written"), "{0:d}".format(summary['write']))
+        printKeyValue("{0:31s}:".format("Resource samples"), "{0:d} ({1})".format(summary['samples'], filename))
+
+        # Record sampled peaks in run manifest
+        recordManifest({'max_cpu_cores': summary['maxcpu'], 'max_processes': summary['maxprocs'], 'max_fds': summary['maxfds'], 'read_bytes': summary['read'], 'write_bytes': summary['write'], 'samples': summary['samples'], 'samples_file': filename}, section='resources')
+
+
+########################
+#<--- RESULT CACHE --->#
+########################
+
+#<-- Get result cache directory -->#
+def getResultCacheDir(env_var="ANDURIL_RESULT_CACHE"):
+### Returns the root directory of the persistent result cache or 'None' if caching is disabled.
+### Caching is enabled by setting the environment variable 'env_var' to a (writable) directory.
+
+    # Get cache directory from environment
+    cacheDir = os.environ.get(env_var)
+
+    # Return 'None' if caching is disabled
+    if not cacheDir:
+        return(None)
+
+    # Create cache directory if it does not exist; disable caching if it cannot be created
+    if not os.path.isdir(cacheDir):
+        try:
+            os.makedirs(cacheDir)
+        except OSError, errorCode:
+            sys.stderr.write('[WARNING] Result cache directory "{cacheDir}" cannot be created! Result cache disabled.\n'.format(cacheDir=cacheDir))
+            return(None)
+
+    # Return cache directory
+    return(cacheDir)
+
+#<-- Get content fingerprint of a file -->#
+def getFileFingerprint(path, cacheDir, chunk_size=1048576):
+### Returns the SHA1 hex digest of the content of file 'path'.
+### Digests are memoized in the result cache and reused as long as path, inode, size and mtime are unchanged.
+
+    # Import modules
+    import hashlib
+
+    # Build memo key from file status
+    stat = os.stat(path)
+    memoKey = "{path}\t{dev}\t{ino}\t{size}\t{mtime!r}".format(path=os.path.abspath(path), dev=stat.st_dev, ino=stat.st_ino, size=stat.st_size, mtime=stat.st_mtime)
+    memoFile = os.path.join(cacheDir, "fingerprints", hashlib.sha1(memoKey).hexdigest())
+
+    # Return memoized digest if available
+    if os.path.isfile(memoFile):
+        with open(memoFile, 'r') as memo_handle:
+            digest = memo_handle.read().strip()
+        if digest:
+            return(digest)
+
+    # Hash file content chunk-wise
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as file_handle:
+        chunk = file_handle.read(chunk_size)
+        while chunk:
+            sha1.update(chunk)
+            chunk = file_handle.read(chunk_size)
+    digest = sha1.hexdigest()
+
+    # Memoize digest (failures are not fatal)
+    try:
+        if not os.path.isdir(os.path.dirname(memoFile)):
+            os.makedirs(os.path.dirname(memoFile))
+        tmpFile = "{memoFile}.{pid}".format(memoFile=memoFile, pid=os.getpid())
+        with open(tmpFile, 'w') as memo_handle:
+            memo_handle.write(digest + "\n")
+        os.rename(tmpFile, memoFile)
+    except (IOError, OSError):
+        pass
+
+    # Return digest
+    return(digest)
+
+#<-- Get content fingerprint of a file or directory tree -->#
+def getPathFingerprint(path, cacheDir):
+
+    # Import modules
+    import hashlib
+
+    # Files: return content fingerprint
+    if not os.path.isdir(path):
+        return(getFileFingerprint(path, cacheDir))
+
+    # Directories: combine relative paths and content fingerprints of all files (sorted)
+    sha1 = hashlib.sha1()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            filepath = os.path.join(dirpath, filename)
+            sha1.update("{relpath}\t{digest}\n".format(relpath=os.path.relpath(filepath, path), digest=getFileFingerprint(filepath, cacheDir)))
+
+    # Return fingerprint
+    return(sha1.hexdigest())
+
+#<-- Get result cache key -->#
+def getResultCacheKey(component, command, execDir, tempdir, cacheDir):
+### Builds a key from the rendered command, the executable and the content of all input ports.
+### Instance-specific paths (execution/temporary directory, input destinations) are replaced by
+### placeholders so that identical invocations of different instances map to the same key.
+
+    # Import modules
+    import hashlib
+    import re
+
+    # Get dictionaries of input ports and parameters
+    inputDict = component.input.to_dict()
+    paramDict = component.param.to_dict()
+
+    # Compile regular expressions
+    reInPort = re.compile(r'^IN(FILE|DIR)_')
+
+    # Initialize hash
+    sha1 = hashlib.sha1()
+
+    # Normalize command: replace input destinations and instance directories with placeholders
+    normalized = command
+    for port in sorted(inputDict, key=lambda port: -len(str(inputDict[port] or ''))):
+        if inputDict[port] is not None:
+            normalized = normalized.replace(str(inputDict[port]), "{{" + str(port) + "}}")
+    normalized = normalized.replace(str(tempdir), "{{TEMPDIR}}").replace(str(execDir), "{{EXECDIR}}")
+    sha1.update("command\t{command}\n".format(command=normalized))
+
+    # Add executable fingerprint
+    executable = paramDict['_executable'].split(None, 1)[0]
+    sha1.update("executable\t{digest}\n".format(digest=getFileFingerprint(executable, cacheDir)))
+
+    # Add input fingerprints
+    for port in sorted(inputDict):
+        if inputDict[port] is not None and reInPort.match(str(port)):
+            sha1.update("{port}\t{digest}\n".format(port=port, digest=getPathFingerprint(str(inputDict[port]), cacheDir)))
+
+    # Return key
+    return(sha1.hexdigest())
+
+#<-- Get path of cache entry -->#
+def getResultCacheEntry(cacheDir, cacheKey):
+
+    # Return entry path
+    return(os.path.join(cacheDir, "entries", cacheKey[:2], cacheKey))
+
+#<-- Link file or directory tree -->#
+def linkPath(source, target):
+### Hard-links file 'source' to 'target' or, for directories, recreates the tree and hard-links all
+### files. Falls back to copying if hard links are not possible (e.g. across file systems).
+
+    # Import modules
+    import shutil
+
+    # Directories: recreate tree
+    if os.path.isdir(source):
+        if not os.path.isdir(target):
+            os.makedirs(target)
+        for name in os.listdir(source):
+            linkPath(os.path.join(source, name), os.path.join(target, name))
+
+    # Files: link or copy
+    else:
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+#<-- Get status of files in cache entry -->#
+def getCachedFileStatus(entry):
+### Returns a dictionary of the sizes and modification times of all files of cache entry 'entry'
+### (relative path -> [size, mtime]), except for the entry description.
+
+    # Collect file status
+    status = {}
+    for dirpath, dirnames, filenames in os.walk(entry):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relpath = os.path.relpath(path, entry)
+            if relpath != "entry.json":
+                stat = os.stat(path)
+                status[relpath] = [stat.st_size, stat.st_mtime]
+
+    # Return status
+    return(status)
+
+#<-- Restore results from cache -->#
+def restoreCachedResults(component, execDir, cacheDir, cacheKey, stdout, stderr):
+### Links the outputs of a cached invocation into the execution directory. Cached files are
+### read-only (cf. 'storeCachedResults'); entries whose files were modified nevertheless (size or
+### modification time differ from those recorded when the entry was stored) are removed.
+### Returns 'True' on cache hit, 'False' otherwise.
+
+    # Import modules
+    import json
+    import shutil
+
+    # Get cache entry
+    entry = getResultCacheEntry(cacheDir, cacheKey)
+    entryFile = os.path.join(entry, "entry.json")
+
+    # Return if entry is not available
+    if not os.path.isfile(entryFile):
+        printTitleValue("Result cache", "Miss (key: {key})".format(key=cacheKey))
+        return(False)
+
+    # Load entry
+    with open(entryFile, 'r') as entry_handle:
+        entryDict = json.load(entry_handle)
+
+    # Remove entry if cached files were modified
+    if 'files' not in entryDict or getCachedFileStatus(entry) != entryDict['files']:
+        sys.stderr.write('[WARNING] Files of result cache entry "{entry}" were modified; entry removed.\n'.format(entry=entry))
+        shutil.rmtree(entry, ignore_errors=True)
+        printTitleValue("Result cache", "Miss (key: {key}; modified entry removed)".format(key=cacheKey))
+        return(False)
+
+    # Get dictionary of output ports
+    outputDict = component.output.to_dict()
+
+    # Link outputs
+    for port in sorted(outputDict):
+        source = os.path.join(entry, "outputs", str(port))
+        destination = str(outputDict[port]).rstrip('/')
+        if not os.path.exists(source):
+            continue
+        if os.path.isfile(destination):
+            os.remove(destination)
+        linkPath(source, destination)
+
+    # Link STDOUT/STDERR files
+    stdout_filename, stderr_filename = getStdOutErrFiles(stdout, stderr, component, execDir)
+    compression, suffix = getStdOutErrCompression()
+    for name, target, filename in [("stdout", stdout, stdout_filename), ("stderr", stderr, stderr_filename)]:
+        source = os.path.join(entry, name + (suffix if target is None else ""))
+        if os.path.isfile(source) and not os.path.exists(filename):
+            linkPath(source, filename)
+
+    # Print cache information
+    printTitleValue("Result cache", "Hit (key: {key}; created: {created})".format(key=cacheKey, created=entryDict['created']))
+
+    # Print command output
+    printStdOutErr(stdout, stdout_filename, stderr, stderr_filename)
+
+    # Print exit status
+    printTitleValue("Exit status", entryDict['exit_status'])
+
+    # Return
+    return(True)
+
+#<-- Store results in cache -->#
+def storeCachedResults(component, execDir, cacheDir, cacheKey, command, stdout, stderr, exit_status):
+### Links the outputs of a successful invocation into a new cache entry.
+### Entries are assembled in a temporary directory and atomically renamed into place. As outputs are
+### hard-linked, the cached files (and thus also the outputs of all instances linked to them) are
+### made read-only, so that outputs cannot be modified in place; their sizes and modification times
+### are recorded in the entry description and checked when the entry is restored.
+
+    # Import modules
+    import json
+    import stat
+    import shutil
+    import datetime
+
+    # Get cache entry
+    entry = getResultCacheEntry(cacheDir, cacheKey)
+
+    # Return if entry already exists
+    if os.path.exists(entry):
+        return
+
+    # Build temporary entry
+    tmpEntry = os.path.join(cacheDir, "tmp", "{key}.{pid}".format(key=cacheKey, pid=os.getpid()))
+    try:
+        os.makedirs(os.path.join(tmpEntry, "outputs"))
+
+        # Link outputs
+        outputDict = component.output.to_dict()
+        for port in sorted(outputDict):
+            source = str(outputDict[port]).rstrip('/')
+            if os.path.exists(source):
+                linkPath(source, os.path.join(tmpEntry, "outputs", str(port)))
+
+        # Link STDOUT/STDERR files
+        stdout_filename, stderr_filename = getStdOutErrFiles(stdout, stderr, component, execDir)
+        compression, suffix = getStdOutErrCompression()
+        for name, target, filename in [("stdout", stdout, stdout_filename), ("stderr", stderr, stderr_filename)]:
+            if os.path.isfile(filename):
+                linkPath(filename, os.path.join(tmpEntry, name + (suffix if target is None else "")))
+
+        # Make cached files read-only
+        for dirpath, dirnames, filenames in os.walk(tmpEntry):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                os.chmod(path, stat.S_IMODE(os.stat(path).st_mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+        # Write entry description
+        with open(os.path.join(tmpEntry, "entry.json"), 'w') as entry_handle:
+            json.dump({'key': cacheKey, 'command': command, 'exit_status': exit_status, 'instance': str(component.meta.instanceName), 'created': "{:%Y-%b-%d, %H:%M:%S}".format(datetime.datetime.now()), 'files': getCachedFileStatus(tmpEntry)}, entry_handle, indent=4, sort_keys=True)
+
+        # Move entry into place
+        if not os.path.isdir(os.path.dirname(entry)):
+            os.makedirs(os.path.dirname(entry))
+        if os.path.exists(entry):
+            shutil.rmtree(tmpEntry, ignore_errors=True)
+            return
+        os.rename(tmpEntry, entry)
+
+    # Failures to store results are not fatal
+    except (IOError, OSError), errorCode:
+        sys.stderr.write('[WARNING] Results could not be stored in result cache:\n[WARNING] {errorCode}\n'.format(errorCode=errorCode))
+        shutil.rmtree(tmpEntry, ignore_errors=True)
+        return
+
+    # Print cache information
+    printTitleValue("Result cache", "Stored (key: {key})".format(key=cacheKey))
 
 
 #######################################
@@ -986,31 +2478,835 @@ def createMissingOutputFiles(component):
                 sys.exit(1)
 
 
+#######################
+#<--- CHECKPOINTS --->#
+#######################
+
+# Checkpoint of the current component instance (cf. 'startCheckpoint')
+checkpoint = {}
+
+# Parameters that do not affect the results of a component instance
+CHECKPOINT_IGNORED_PARAMETERS = ['_cores', '_membycore', '_runtime', '_execMode', '_profile', '_sharedGenome']
+
+#<-- Check whether checkpoints are enabled -->#
+def getCheckpointMode(env_var="ANDURIL_CHECKPOINT"):
+### Returns 'True' if checkpoint-aware execution is enabled by setting the environment variable
+### 'env_var' (to any value other than '0', 'false' or 'none').
+
+    # Return mode
+    return(os.environ.get(env_var, "none").strip().lower() not in ["", "0", "false", "none"])
+
+#<-- Get checkpoint fingerprint mode -->#
+def getCheckpointFingerprintMode(env_var="ANDURIL_CHECKPOINT_FINGERPRINT"):
+### Returns how inputs and outputs of checkpointed instances are fingerprinted: 'stat' (default; size,
+### modification time and inode of all files) or 'content' (SHA1 digest of the content of all files,
+### cf. 'getPathFingerprint'; requires reading all files).
+
+    # Get mode
+    mode = os.environ.get(env_var, "stat").strip().lower()
+
+    # Return mode
+    if mode in ["", "stat"]:
+        return("stat")
+    if mode == "content":
+        return("content")
+    sys.stderr.write("[WARNING] Illegal checkpoint fingerprint mode '{mode}'. Using 'stat'.\n".format(mode=mode))
+    return("stat")
+
+#<-- Get checkpoint fingerprint of a file or directory tree -->#
+def getCheckpointFingerprint(path, memoDir):
+### Returns the fingerprint of file or directory 'path' according to the checkpoint fingerprint mode
+### (cf. 'getCheckpointFingerprintMode'); content fingerprints are memoized in 'memoDir'.
+
+    # Import modules
+    import hashlib
+
+    # Content fingerprint
+    if getCheckpointFingerprintMode() == "content":
+        return("content:" + getPathFingerprint(path, memoDir))
+
+    # Stat fingerprint: combine relative paths, sizes, modification times and inodes of all files (sorted)
+    paths = [path]
+    if os.path.isdir(path):
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            paths.extend([os.path.join(dirpath, filename) for filename in sorted(filenames)])
+    sha1 = hashlib.sha1()
+    for filepath in paths:
+        stat = os.stat(filepath)
+        sha1.update("{relpath}\t{size}\t{mtime!r}\t{dev}\t{ino}\n".format(relpath=os.path.relpath(filepath, path), size=stat.st_size, mtime=stat.st_mtime, dev=stat.st_dev, ino=stat.st_ino))
+
+    # Return fingerprint
+    return("stat:" + sha1.hexdigest())
+
+#<-- Get checkpoint key -->#
+def getCheckpointKey(component, command, memoDir):
+### Builds a key from the command template, the parameters (except resource requests, which may be
+### escalated between attempts) and the fingerprints of all input ports (cf. 'getCheckpointFingerprint').
+
+    # Import modules
+    import hashlib
+    import re
+
+    # Get dictionaries of input ports and parameters
+    inputDict = component.input.to_dict()
+    paramDict = component.param.to_dict()
+
+    # Compile regular expressions
+    reInPort = re.compile(r'^IN(FILE|DIR)_')
+
+    # Add command and parameters
+    sha1 = hashlib.sha1()
+    sha1.update("command\t{command}\n".format(command=command))
+    for name in sorted(paramDict):
+        if name not in CHECKPOINT_IGNORED_PARAMETERS:
+            sha1.update("{name}\t{value}\n".format(name=name, value=paramDict[name]))
+
+    # Add input fingerprints
+    for port in sorted(inputDict):
+        if inputDict[port] is not None and reInPort.match(str(port)):
+            sha1.update("{port}\t{digest}\n".format(port=port, digest=getCheckpointFingerprint(str(inputDict[port]), memoDir)))
+
+    # Return key
+    return(sha1.hexdigest())
+
+#<-- Get output fingerprints -->#
+def getOutputFingerprints(component, memoDir):
+### Returns a dictionary of output ports and the fingerprints of their destinations ('None' for
+### missing destinations; cf. 'getCheckpointFingerprint').
+
+    # Get fingerprints
+    fingerprints = {}
+    for port, destination in component.output.to_dict().items():
+        destination = str(destination).rstrip('/')
+        fingerprints[str(port)] = getCheckpointFingerprint(destination, memoDir) if os.path.exists(destination) else None
+
+    # Return fingerprints
+    return(fingerprints)
+
+#<-- Remove outputs of previous attempts -->#
+def clearOutputs(component, recreate=False):
+### Removes the destinations of all output ports, so that they can be validated (cf.
+### 'validateOutputPaths') and written again. With 'recreate', the destinations of already
+### validated ports are prepared again instead ('OUTFILE_': empty file; 'OUTDIRMAKE_': directory).
+
+    # Import shutil module
+    import shutil
+
+    # Remove destinations
+    for port, destination in component.output.to_dict().items():
+        destination = str(destination).rstrip('/')
+        try:
+            if os.path.isdir(destination) and not os.path.islink(destination):
+                shutil.rmtree(destination)
+            elif os.path.lexists(destination):
+                os.remove(destination)
+        except OSError, errorCode:
+            sys.stderr.write('[ERROR] Output destination "{destination}" of port "{port}" of a previous attempt cannot be removed:\n[ERROR] {errorCode}\n[ERROR] Execution aborted.\n'.format(destination=destination, port=port, errorCode=errorCode))
+            sys.exit(1)
+
+        # Prepare destination again
+        if recreate and str(port).startswith('OUTFILE_'):
+            open(destination, 'w').close()
+        elif recreate and str(port).startswith('OUTDIRMAKE_'):
+            os.mkdir(destination)
+
+#<-- Write checkpoint -->#
+def writeCheckpoint(values=None):
+### Updates the checkpoint with 'values' and writes it atomically (JSON).
+
+    # Import json module
+    import json
+
+    # Update and write checkpoint
+    if values is not None:
+        checkpoint['data'].update(values)
+    tmpFile = "{filename}.{pid}".format(filename=checkpoint['file'], pid=os.getpid())
+    try:
+        with open(tmpFile, 'w') as checkpoint_handle:
+            json.dump(checkpoint['data'], checkpoint_handle, sort_keys=True, indent=1)
+        os.rename(tmpFile, checkpoint['file'])
+    except (IOError, OSError), errorCode:
+        sys.stderr.write('[WARNING] Checkpoint could not be written:\n[WARNING] {errorCode}\n'.format(errorCode=errorCode))
+
+#<-- Start checkpoint -->#
+def startCheckpoint(component, command, execDir, tempdir):
+### Reads the checkpoint ('<instance>.checkpoint' in the execution directory) of previous attempts
+### if checkpoints are enabled (cf. 'getCheckpointMode'). Returns 'True' if a previous attempt with
+### identical command, parameters and inputs completed and its outputs are unchanged, so that they
+### can be reused (the command, ports and parameters of that attempt are found in the 'rendered'
+### entry of the checkpoint). Otherwise, outputs of previous attempts are removed, resource requests escalated
+### by previous attempts (cf. 'executeRemotelyWithResubmission') are applied and the attempt is
+### recorded.
+
+    # Import modules
+    import json
+    import datetime
+
+    # Return if checkpoints are disabled
+    if not getCheckpointMode():
+        return(False)
+
+    # Get checkpoint file and directory in which content fingerprints are memoized (cf. 'getCheckpointFingerprint')
+    checkpoint.clear()
+    checkpoint['file'] = os.path.join(str(execDir), str(component.meta.instanceName) + ".checkpoint")
+    checkpoint['memo'] = getResultCacheDir() or getTemplateCacheDir() or str(tempdir)
+    key = getCheckpointKey(component, command, checkpoint['memo'])
+
+    # Read checkpoint of previous attempts
+    previous = None
+    try:
+        with open(checkpoint['file'], 'r') as checkpoint_handle:
+            previous = json.load(checkpoint_handle)
+    except IOError:
+        pass
+    except ValueError:
+        sys.stderr.write('[WARNING] Ignoring malformed checkpoint "{file}".\n'.format(file=checkpoint['file']))
+        previous = {}
+
+    # Reuse outputs of completed attempt if valid
+    if previous and previous.get('status') == "completed" and previous.get('key') == key and 'rendered' in previous:
+        if previous.get('outputs') == getOutputFingerprints(component, checkpoint['memo']):
+            checkpoint['data'] = previous
+            printTitleValue("Checkpoint", "Reusing outputs of attempt {attempt} (completed {completed}).".format(attempt=previous.get('attempt'), completed=previous.get('completed')))
+            recordManifest({'checkpoint': "reused"})
+            return(True)
+
+    # Remove outputs of previous attempts
+    if previous is not None:
+        clearOutputs(component)
+
+    # Apply escalated resource requests of previous attempts (of the same instance)
+    resources = (previous or {}).get('resources', {})
+    if previous and previous.get('key') == key:
+        try:
+            if getRuntimeSeconds(resources.get('_runtime', "0:00:00")) > getRuntimeSeconds(component.param._runtime):
+                component.param.update({'_runtime': str(resources['_runtime'])})
+            if getMemoryBytes(resources.get('_membycore', 0)) > getMemoryBytes(component.param._membycore):
+                component.param.update({'_membycore': str(resources['_membycore'])})
+        except (ValueError, IndexError):
+            pass
+
+    # Record attempt
+    checkpoint['data'] = {
+        'key': key,
+        'attempt': (previous or {}).get('attempt', 0) + 1 if previous and previous.get('key') == key else 1,
+        'status': "started",
+        'started': datetime.datetime.now().isoformat(),
+        'completed': None,
+        'exit_status': None,
+        'resources': {'_runtime': str(component.param._runtime), '_membycore': str(component.param._membycore)},
+        'outputs': None,
+    }
+    writeCheckpoint()
+    recordManifest({'checkpoint': "attempt {attempt}".format(attempt=checkpoint['data']['attempt'])})
+    return(False)
+
+#<-- Record values in checkpoint -->#
+def recordCheckpoint(values):
+### Adds 'values' to the checkpoint of the current attempt (written when the attempt finishes), e.g.
+### the rendered command, ports and parameters, which are reported again if outputs are reused.
+
+    # Add values if checkpoints are enabled
+    if checkpoint:
+        checkpoint['data'].update(values)
+
+#<-- Finish checkpoint -->#
+def finishCheckpoint(component, exit_status):
+### Records the result of the attempt; for successful attempts, the fingerprints of all outputs are
+### recorded to verify them before reuse.
+
+    # Import datetime module
+    import datetime
+
+    # Return if checkpoints are disabled
+    if not checkpoint:
+        return(None)
+
+    # Record result
+    values = {'exit_status': exit_status, 'completed': datetime.datetime.now().isoformat()}
+    if exit_status == 0:
+        values.update({'status': "completed", 'outputs': getOutputFingerprints(component, checkpoint['memo'])})
+    else:
+        values['status'] = "failed"
+    writeCheckpoint(values)
+
+#<-- Get resubmission settings -->#
+def getResubmissionSettings(env_var_attempts="ANDURIL_RESUBMISSIONS", env_var_factor="ANDURIL_RESUBMISSION_FACTOR", default_attempts=2, default_factor=2.0):
+### Returns the maximum number of resubmissions of remote jobs that exceeded their runtime or were
+### killed (e.g. for exceeding their memory limit) and the factor by which '_runtime' and
+### '_membycore' are escalated per resubmission. Resubmissions require checkpoints to be enabled.
+
+    # Return if checkpoints are disabled
+    if not getCheckpointMode():
+        return(0, 1.0)
+
+    # Get settings
+    try:
+        attempts = int(os.environ.get(env_var_attempts, default_attempts))
+        factor = float(os.environ.get(env_var_factor, default_factor))
+    except ValueError:
+        sys.stderr.write("[WARNING] Illegal resubmission settings. Resubmission disabled.\n")
+        return(0, 1.0)
+
+    # Return settings
+    return(max(attempts, 0), max(factor, 1.0))
+
+#<-- Escalate resource requests -->#
+def escalateResources(component, factor):
+
+    # Import math module
+    import math
+
+    # Escalate runtime (h:mm:ss) and memory per core (MiB)
+    runtime = int(math.ceil(getRuntimeSeconds(component.param._runtime) * factor))
+    membycore = int(math.ceil(getMemoryBytes(component.param._membycore) * factor / 1024.0 ** 2))
+    component.param.update({
+        '_runtime': "{hours}:{minutes:02d}:{seconds:02d}".format(hours=runtime // 3600, minutes=runtime % 3600 // 60, seconds=runtime % 60),
+        '_membycore': "{membycore}M".format(membycore=membycore),
+    })
+
+    # Record resources in checkpoint
+    if checkpoint:
+        writeCheckpoint({'resources': {'_runtime': component.param._runtime, '_membycore': component.param._membycore}})
+
+#<-- Execute remotely with resubmission -->#
+def executeRemotelyWithResubmission(component, command, stdout, stderr):
+### Executes the command remotely (cf. 'executeRemotelyDRMAAtoSGE'). Jobs that exceed their runtime
+### or are killed by a signal end with exit status 'RESUBMIT_EXIT_STATUS'; they are resubmitted with
+### escalated resource requests (cf. 'getResubmissionSettings') after their outputs are removed.
+
+    # Get resubmission settings
+    attempts, factor = getResubmissionSettings()
+
+    # Submit job until it finishes regularly
+    for attempt in range(attempts + 1):
+        try:
+            return(executeRemotelyDRMAAtoSGE(component, command, stdout, stderr))
+        except SystemExit, exitCode:
+            if exitCode.code != RESUBMIT_EXIT_STATUS or attempt == attempts:
+                raise
+
+        # Remove outputs and STDOUT/STDERR of killed job
+        clearOutputs(component, recreate=True)
+        for filename in set([stdout, stderr]):
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        # Escalate resource requests
+        escalateResources(component, factor)
+        printTitleValue("Resubmission", "Resubmitting job ({attempt} of {attempts}) with runtime {runtime} and memory per core {membycore}.".format(attempt=attempt + 1, attempts=attempts, runtime=component.param._runtime, membycore=component.param._membycore))
+        recordManifest({'resubmissions': attempt + 1})
+
+
+########################
+#<--- RUN MANIFEST --->#
+########################
+
+# Run manifest of the current component instance (cf. 'startManifest')
+manifest = {}
+
+#<-- Start run manifest -->#
+def startManifest(component, execDir, tempdir, schema=1):
+### Initializes the run manifest and registers 'writeManifest' to be called on exit, so that runs
+### that are aborted (status 'aborted') are recorded as well. Values are added by 'recordManifest'.
+
+    # Import modules
+    import atexit
+    import socket
+    import datetime
+
+    # Initialize manifest with stable set of fields
+    manifest.clear()
+    manifest.update({
+        'schema': schema,
+        'component': str(component.meta.componentName),
+        'instance': str(component.meta.instanceName),
+        'component_path': str(component.meta.componentPath),
+        'exec_dir': str(execDir),
+        'temp_dir': str(tempdir),
+        'host': socket.gethostname(),
+        'pid': os.getpid(),
+        'created': datetime.datetime.now().isoformat(),
+        'exec_mode': str(component.param._execMode),
+        'cores': None,
+        'membycore_bytes': None,
+        'runtime_limit_s': None,
+        'command': None,
+        'inputs': component.input.to_dict(),
+        'outputs': component.output.to_dict(),
+        'parameters': component.param.to_dict(),
+        'status': "aborted",
+        'exit_status': None,
+        'job_id': None,
+        'cache_key': None,
+        'cache_hit': None,
+        'times': {},
+        'resources': {},
+    })
+
+    # Add requested resources
+    try:
+        manifest['cores'] = int(component.param._cores)
+        manifest['membycore_bytes'] = getMemoryBytes(component.param._membycore)
+        manifest['runtime_limit_s'] = getRuntimeSeconds(component.param._runtime)
+    except (ValueError, AttributeError):
+        pass
+
+    # Write manifest on exit
+    atexit.register(writeManifest, os.path.join(str(execDir), str(component.meta.instanceName) + ".manifest.jsonl"))
+
+#<-- Record values in run manifest -->#
+def recordManifest(values, section=None):
+
+    # Add values to manifest or section of manifest
+    if section is None:
+        manifest.update(values)
+    else:
+        manifest.setdefault(section, {}).update(values)
+
+#<-- Write run manifest -->#
+def writeManifest(filename):
+### Appends the run manifest as a single JSON line to 'filename' (one line per execution), to be
+### merged across instances with 'index_run_manifests.py'.
+
+    # Import json module
+    import json
+
+    # Write manifest
+    try:
+        with open(filename, 'a') as manifest_handle:
+            manifest_handle.write(json.dumps(manifest, sort_keys=True, default=str) + "\n")
+    except (IOError, OSError), errorCode:
+        sys.stderr.write('[WARNING] Run manifest could not be written:\n[WARNING] {errorCode}\n'.format(errorCode=errorCode))
+
+
+#####################
+#<--- PROFILING --->#
+#####################
+
+# Profile of the current component instance (cf. 'startProfile')
+profile = {}
+
+#<-- Get profiling mode -->#
+def getProfileMode(component, env_var="ANDURIL_PROFILE"):
+### Returns the profiling mode: 'phases' (timings of the phases of the wrapper), 'sample' (phase
+### timings and sampling profiler) or 'None' if profiling is disabled (default). The mode is set
+### by the component parameter '_profile' (if defined and not 'none') or the environment variable
+### 'env_var'.
+
+    # Get mode from component parameter or environment
+    mode = str(component.param.to_dict().get('_profile') or "none").strip().lower()
+    if mode in ["", "none"]:
+        mode = os.environ.get(env_var, "none").strip().lower()
+
+    # Return mode
+    if mode in ["", "none", "0", "false"]:
+        return(None)
+    if mode in ["phases", "1", "true"]:
+        return("phases")
+    if mode == "sample":
+        return("sample")
+    sys.stderr.write("[WARNING] Illegal profiling mode '{mode}'. Profiling disabled.\n".format(mode=mode))
+    return(None)
+
+#<-- Get monotonic clock -->#
+def getMonotonicClock():
+### Returns a function that returns the time (in seconds) of a monotonic clock: 'time.monotonic'
+### (Python 3), 'clock_gettime(CLOCK_MONOTONIC)' (through 'ctypes') or 'time.time' if neither is
+### available.
+
+    # Import time module
+    import time
+
+    # Use 'time.monotonic' if available
+    if hasattr(time, 'monotonic'):
+        return(time.monotonic)
+
+    # Use 'clock_gettime' of the C library
+    try:
+        import ctypes
+        import ctypes.util
+
+        class timespec(ctypes.Structure):
+            _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+        clock_gettime = ctypes.CDLL(ctypes.util.find_library('rt'), use_errno=True).clock_gettime
+        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+        value = timespec()
+
+        def monotonic(clock_id=1):
+            if clock_gettime(clock_id, ctypes.byref(value)) != 0:
+                return(time.time())
+            return(value.tv_sec + value.tv_nsec * 1e-9)
+
+        monotonic()
+        return(monotonic)
+    except (ImportError, OSError, AttributeError):
+        return(time.time)
+
+#<-- Start profile -->#
+def startProfile(component):
+### Starts profiling the wrapper if enabled (cf. 'getProfileMode'). Profiling is started by 'launch'
+### or, for wrappers calling 'main' directly, by 'main'; subsequent calls have no effect.
+
+    # Return if profile was already started or profiling is disabled
+    if profile:
+        return(None)
+    mode = getProfileMode(component)
+    if mode is None:
+        return(None)
+
+    # Initialize profile
+    clock = getMonotonicClock()
+    profile.update({
+        'mode': mode,
+        'clock': clock,
+        'start': clock(),
+        'phases': [],
+        'stacks': {},
+        'interval': None,
+        'prefix': None,
+    })
+
+    # Start sampling profiler
+    if mode == "sample":
+        startSamplingProfiler()
+
+#<-- Start sampling profiler -->#
+def startSamplingProfiler(env_var="ANDURIL_PROFILE_INTERVAL", default=0.005):
+### Samples the call stack of the wrapper every 'env_var' seconds of CPU time (SIGPROF). Stacks are
+### counted in collapsed format ('frame;frame;...'), as expected by flame graph tools. The stack of
+### the main thread is sampled; CPU time of the threads capturing STDOUT/STDERR is thus attributed
+### to the main thread waiting for the job.
+
+    # Import signal module
+    import signal
+
+    # Get interval
+    try:
+        interval = float(os.environ.get(env_var, default))
+    except ValueError:
+        sys.stderr.write("[WARNING] Illegal profiling interval '{value}'. Sampling disabled.\n".format(value=os.environ[env_var]))
+        return(None)
+    if interval <= 0:
+        return(None)
+
+    # Define signal handler
+    stacks = profile['stacks']
+    def sample(signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append("{function} ({file}:{line})".format(function=code.co_name, file=os.path.basename(code.co_filename), line=code.co_firstlineno))
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        stacks[key] = stacks.get(key, 0) + 1
+
+    # Start timer; interrupted system calls are restarted
+    try:
+        signal.signal(signal.SIGPROF, sample)
+        signal.siginterrupt(signal.SIGPROF, False)
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    except (ValueError, AttributeError), errorCode:
+        sys.stderr.write("[WARNING] Sampling profiler could not be started:\n[WARNING] {errorCode}\n".format(errorCode=errorCode))
+        return(None)
+    profile['interval'] = interval
+
+#<-- Mark start of wrapper phase -->#
+def markPhase(name):
+### Records the start of phase 'name' if profiling is enabled; the previous phase ends.
+
+    # Record start time
+    if profile:
+        profile['phases'].append((name, profile['clock']()))
+
+#<-- Set profile output files -->#
+def setProfileOutput(execDir, instanceName):
+### Sets the prefix of the profile files in the execution directory and registers 'writeProfile' to
+### be called on exit. As exit functions are called in reverse order of registration, calling this
+### function after 'startManifest' adds the phase timings to the run manifest (section 'profile').
+
+    # Import atexit module
+    import atexit
+
+    # Return if profiling is disabled
+    if not profile:
+        return(None)
+
+    # Set prefix and write profile on exit
+    profile['prefix'] = os.path.join(str(execDir), str(instanceName))
+    atexit.register(writeProfile)
+
+#<-- Write profile -->#
+def writeProfile():
+### Prints the phase timings and writes them to '<instance>.profile.tsv' in the execution directory;
+### stacks of the sampling profiler (if enabled) are written to '<instance>.profile.folded'.
+
+    # Import signal module
+    import signal
+
+    # Stop sampling profiler
+    end = profile['clock']()
+    if profile['interval'] is not None:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+
+    # Get phase timings (wrapper code before the first phase is reported as phase 'start')
+    starts = [("start", profile['start'])] + profile['phases']
+    timings = []
+    for index, (name, start) in enumerate(starts):
+        stop = starts[index + 1][1] if index + 1 < len(starts) else end
+        timings.append((name, start - profile['start'], stop - start))
+    total = end - profile['start']
+
+    # Add timings to run manifest
+    durations = {}
+    for name, start, duration in timings:
+        durations[name + "_s"] = durations.get(name + "_s", 0) + duration
+    durations['total_s'] = total
+    recordManifest(durations, section='profile')
+
+    # Print timings
+    printHeader("Profile")
+    for name, start, duration in timings:
+        printKeyValue("{0:31s}:".format(name), "{duration:.6f} s ({percent:.1f}%)".format(duration=duration, percent=100.0 * duration / total if total > 0 else 0))
+    printKeyValue("{0:31s}:".format("Total"), "{total:.6f} s".format(total=total))
+
+    # Write timings and stacks
+    try:
+        with open(profile['prefix'] + ".profile.tsv", 'w') as profile_handle:
+            profile_handle.write("phase\tstart_s\tduration_s\n")
+            for name, start, duration in timings:
+                profile_handle.write("{name}\t{start:.6f}\t{duration:.6f}\n".format(name=name, start=start, duration=duration))
+        if profile['interval'] is not None:
+            with open(profile['prefix'] + ".profile.folded", 'w') as profile_handle:
+                for stack, count in sorted(profile['stacks'].items()):
+                    profile_handle.write("{stack} {count}\n".format(stack=stack, count=count))
+    except (IOError, OSError), errorCode:
+        sys.stderr.write('[WARNING] Profile could not be written:\n[WARNING] {errorCode}\n'.format(errorCode=errorCode))
+
+
+##############################
+#<--- COMPONENT LAUNCHER --->#
+##############################
+
+#<-- Launch component -->#
+def launch(component, tempdir, componentDir):
+### Shared entry point of all component wrappers ('component.py', cf. 'generate_component_launchers.py').
+### Builds the command template from 'component.json' in 'componentDir', fills in the parameter
+### values and executes the command. Returns the exit status.
+
+    # Start profile (if enabled)
+    startProfile(component)
+    markPhase("template")
+
+    # Get command template
+    template = getComponentTemplate(componentDir)
+
+    # Fill in parameter values
+    command = template.format(**component.param.to_dict())
+
+    # Execute command and return exit status
+    return(main(component, command, tempdir))
+
+#<-- Get command template of component -->#
+def getComponentTemplate(componentDir):
+### Returns the command template of the component in 'componentDir' (cf. 'buildCommandTemplate').
+### Templates are cached (cf. 'getTemplateCacheDir'), indexed by path, size and modification time
+### of 'component.json', so that the description only needs to be parsed after changes.
+
+    # Import modules
+    import hashlib
+    import json
+
+    # Get cache file
+    jsonFile = os.path.join(os.path.abspath(componentDir), "component.json")
+    jsonStat = os.stat(jsonFile)
+    cacheDir = getTemplateCacheDir()
+    cacheFile = None
+    if cacheDir is not None:
+        cacheKey = hashlib.sha1(repr((jsonFile, jsonStat.st_size, jsonStat.st_mtime))).hexdigest()
+        cacheFile = os.path.join(cacheDir, cacheKey + ".template")
+
+        # Load template from cache
+        try:
+            with open(cacheFile, 'r') as cache_handle:
+                return(cache_handle.read())
+        except IOError:
+            pass
+
+    # Build template
+    with open(jsonFile, 'r') as json_handle:
+        template = buildCommandTemplate(json.load(json_handle))
+
+    # Store template in cache
+    if cacheFile is not None:
+        storeTemplateCacheFile(cacheFile, template)
+
+    # Return template
+    return(template)
+
+#<-- Build command template from component description -->#
+def buildCommandTemplate(description, separator='$$$', spacerNonPositional='^^^', spacerPositional='###'):
+### Builds the command template (cf. 'renderCommand') from the component description (parsed
+### 'component.json'): the executable is followed by non-positional parameters, input and output
+### ports (each sorted by name), positional parameters and ports (sorted by position) and
+### redirected output ports. Parameter values are represented by '{<parameter>}' fields.
+
+    # Collect expressions
+    nonPositional = {'parameters': [], 'inputs': [], 'outputs': []}
+    positional = []
+    redirected = []
+    for section in ['parameters', 'inputs', 'outputs']:
+        for item in description[section]:
+            attributes = item['tagAttributes']
+            name = attributes['name']
+            argument = "{" + name + "}" if section == 'parameters' else name
+
+            # Redirected output port
+            if attributes.get('redirect', 'false') != 'false':
+                redirected.append((float(attributes['positional']), attributes['redirect'] + spacerPositional + argument))
+
+            # Positional parameter/port
+            elif attributes.get('positional', 'false') != 'false':
+                positional.append((float(attributes['positional']), attributes['optionName'] + spacerPositional + argument))
+
+            # Non-positional parameter/port
+            else:
+                nonPositional[section].append((name, attributes['optionName'] + spacerNonPositional + argument))
+
+    # Order expressions
+    expressions = ['{_executable}']
+    for section in ['parameters', 'inputs', 'outputs']:
+        expressions.extend([expression for key, expression in sorted(nonPositional[section])])
+    expressions.extend([expression for key, expression in sorted(positional)])
+    expressions.extend([expression for key, expression in sorted(redirected)])
+
+    # Return template
+    return(separator.join(expressions))
+
+#<-- Find executable in search path -->#
+def findExecutable(executable, env_var="PATH"):
+### Returns the absolute path of 'executable' (cf. shell function 'which') or 'None' if it is not
+### found. Locations are cached (cf. 'getTemplateCacheDir') for the current search path; cached
+### locations are only used if they are still executable regular files in the search path.
+
+    # Import modules
+    import hashlib
+
+    # Check executables given as paths directly
+    if os.sep in executable:
+        if os.path.isfile(executable) and os.access(executable, os.X_OK):
+            return(os.path.abspath(executable))
+        return(None)
+
+    # Load location from cache
+    searchPath = os.environ.get(env_var, os.defpath)
+    cacheDir = getTemplateCacheDir()
+    cacheFile = None
+    if cacheDir is not None:
+        cacheKey = hashlib.sha1(repr((executable, searchPath))).hexdigest()
+        cacheFile = os.path.join(cacheDir, cacheKey + ".location")
+        try:
+            with open(cacheFile, 'r') as cache_handle:
+                location = cache_handle.read()
+            directories = [os.path.abspath(directory or os.curdir) for directory in searchPath.split(os.pathsep)]
+            if os.path.isabs(location) and os.path.basename(location) == executable and os.path.dirname(location) in directories and os.path.isfile(location) and os.access(location, os.X_OK):
+                return(location)
+        except IOError:
+            pass
+
+    # Search path
+    for directory in searchPath.split(os.pathsep):
+        location = os.path.abspath(os.path.join(directory or os.curdir, executable))
+        if os.path.isfile(location) and os.access(location, os.X_OK):
+            if cacheFile is not None:
+                storeTemplateCacheFile(cacheFile, location)
+            return(location)
+
+    # Return if executable was not found
+    return(None)
+
+
 ################
 #<--- MAIN --->#
 ################
 def main(component, command, tempdir):
 
+    # Start profile (if enabled and not started by 'launch')
+    startProfile(component)
+    markPhase("setup")
+
     # Line buffering STDOUT/STDERR
     lineBufferStdOutErr()
 
     # Get execution path
     execDir = getExecPath(tempdir)
 
+    # Start run manifest (written on exit)
+    startManifest(component, execDir, tempdir)
+
+    # Write profile on exit (before run manifest)
+    setProfileOutput(execDir, component.meta.instanceName)
+
+    # Reuse outputs of completed previous attempt (if checkpoints are enabled)
+    markPhase("checkpoint")
+    if startCheckpoint(component, command, execDir, tempdir):
+        rendered = checkpoint['data']['rendered']
+        printMeta(component.meta.to_dict(), execDir, tempdir)
+        printDict(rendered['inputs'], "Input ports", format="{key:31s}: {value}")
+        printDict(rendered['outputs'], "Output ports", format="{key:31s}: {value}")
+        printDict(rendered['parameters'], "Parameters", format="{key:31s}: {value}")
+        printTitleValue("Command", rendered['command'])
+        recordManifest(rendered)
+        recordManifest({'status': "finished", 'exit_status': 0})
+        return(0)
+
     # Validate/modify input and output directories/files
     component = validateParameters(component, execDir)
 
     # Validate and return sanitized command and command STDOUT/STDERR ports
+    markPhase("render")
     command, stdout, stderr = renderCommand(component, command, tempdir, execDir)
 
     # Print job metadata, input/output files, parameters
+    markPhase("print_parameters")
     printParameters(component, command, execDir, tempdir)
-
-    # Execute command
-    exit_status = executeCommand(component, execDir, command, stdout, stderr)
+    rendered = {'command': command, 'inputs': component.input.to_dict(), 'outputs': component.output.to_dict(), 'parameters': component.param.to_dict()}
+    recordManifest(rendered)
+    recordCheckpoint({'rendered': rendered})
+
+    # Get result cache key (if result cache is enabled)
+    markPhase("cache_lookup")
+    cacheDir = getResultCacheDir()
+    cacheKey = None
+    if cacheDir is not None and component.param._execMode != "none":
+        cacheKey = getResultCacheKey(component, command, execDir, tempdir, cacheDir)
+
+    # Restore results from cache or execute command
+    if cacheKey is not None and restoreCachedResults(component, execDir, cacheDir, cacheKey, stdout, stderr):
+        exit_status = 0
+        recordManifest({'cache_key': cacheKey, 'cache_hit': True})
+    else:
+        exit_status = executeCommand(component, execDir, command, stdout, stderr)
+        recordManifest({'cache_key': cacheKey, 'cache_hit': False})
 
     # Create missing output files
+    markPhase("create_outputs")
     createMissingOutputFiles(component)
 
+    # Record attempt in checkpoint (if checkpoints are enabled)
+    finishCheckpoint(component, exit_status)
+
+    # Store results of successful executions in cache
+    if cacheKey is not None and exit_status == 0:
+        markPhase("cache_store")
+        storeCachedResults(component, execDir, cacheDir, cacheKey, command, stdout, stderr, exit_status)
+
+    # Record exit status in run manifest
+    markPhase("finish")
+    recordManifest({'status': "finished", 'exit_status': exit_status})
+
     # Return exit status
     return(exit_status)
@@ -0,0 +1,738 @@
+#!/usr/bin/env python
+
+## Alexander Kanitz, Biozentrum, University of Basel (alexander.kanitz@unibas.ch)
+## Persistent DRMAA submission daemon for Anduril components.
+##
+## Holds a single DRMAA session for all components of a workflow run. Components connect through a
+## UNIX socket (see 'executeRemotelyDRMAAtoSGE' in 'anduril_custom_functions.py'), send a job
+## description and receive 'submitted', 'running' and 'finished' events ('inactive' if the job was
+## terminated because it stayed in an inactive state for too long). Pending jobs are submitted
+## in batches; jobs with identical resource requests are submitted as a single array job through
+## 'runBulkJobs'. Completions are collected by a single 'wait(JOB_IDS_SESSION_ANY)' loop.
+##
+## Usage:
+##   drmaa_submission_daemon.py --socket PATH [--backend drmaa|local] [--local-slots N]
+##
+## The 'local' backend runs jobs as local subprocesses and can be used to test the daemon (and
+## DRMAA-based workflows) on a single machine.
+
+##########################
+#<--- GLOBAL MODULES --->#
+##########################
+import sys
+import os
+import json
+import time
+import threading
+import socket
+import select
+import subprocess
+import signal
+import random
+
+try:
+    import Queue as queue
+    import SocketServer as socketserver
+except ImportError:
+    import queue
+    import socketserver
+
+
+###############################
+#<--- LOCAL (FAKE) BACKEND --->#
+###############################
+
+#<-- Exceptions mirroring 'drmaa.errors' -->#
+class ExitTimeoutException(Exception):
+    pass
+
+class InvalidJobException(Exception):
+    pass
+
+class DeniedByDrmException(Exception):
+    pass
+
+#<-- Job template mirroring 'drmaa.JobTemplate' -->#
+class LocalJobTemplate(object):
+
+    PARAMETRIC_INDEX = '$drmaa_incr_ph$'
+
+    def __init__(self):
+        self.jobName = ''
+        self.outputPath = ''
+        self.errorPath = ''
+        self.remoteCommand = ''
+        self.args = []
+        self.nativeSpecification = ''
+
+#<-- Job info mirroring 'drmaa.JobInfo' -->#
+class LocalJobInfo(object):
+
+    def __init__(self, jobId, exitStatus, terminatedSignal, wasAborted, resourceUsage):
+        self.jobId = jobId
+        self.hasExited = terminatedSignal is None and not wasAborted
+        self.hasSignal = terminatedSignal is not None
+        self.terminatedSignal = terminatedSignal
+        self.exitStatus = exitStatus if exitStatus is not None else -1
+        self.wasAborted = wasAborted
+        self.hasCoreDump = False
+        self.resourceUsage = resourceUsage
+
+#<-- Session mirroring the subset of 'drmaa.Session' used by the Anduril components -->#
+class LocalSession(object):
+### Runs jobs as local subprocesses. At most 'slots' jobs run concurrently; the remaining jobs stay
+### in state 'queued_active' until a slot becomes available.
+
+    JOB_IDS_SESSION_ANY = 'DRMAA_JOB_IDS_SESSION_ANY'
+    TIMEOUT_WAIT_FOREVER = -1
+    TIMEOUT_NO_WAIT = 0
+
+    def __init__(self, slots=4, poll_interval=0.1):
+        self.slots = slots
+        self.poll_interval = poll_interval
+        self.lock = threading.RLock()
+        self.counter = 0
+        self.queued = []
+        self.jobs = {}
+
+    def initialize(self, contactString=None):
+        pass
+
+    def exit(self):
+        with self.lock:
+            for job in self.jobs.values():
+                if job['process'] is not None and job['info'] is None:
+                    job['process'].terminate()
+
+    def createJobTemplate(self):
+        return(LocalJobTemplate())
+
+    def deleteJobTemplate(self, jobTemplate):
+        pass
+
+    def runJob(self, jobTemplate, index=None):
+        with self.lock:
+            self.counter += 1
+            jobId = str(self.counter) if index is None else "{0}.{1}".format(self.counter, index)
+            self._enqueue(jobId, jobTemplate, index)
+            self._dispatch()
+        return(jobId)
+
+    def runBulkJobs(self, jobTemplate, beginIndex, endIndex, step):
+        with self.lock:
+            self.counter += 1
+            jobIds = []
+            for index in range(beginIndex, endIndex + 1, step):
+                jobId = "{0}.{1}".format(self.counter, index)
+                self._enqueue(jobId, jobTemplate, index)
+                jobIds.append(jobId)
+            self._dispatch()
+        return(jobIds)
+
+    def jobStatus(self, jobId):
+        with self.lock:
+            self._reap()
+            self._dispatch()
+            if jobId not in self.jobs:
+                raise InvalidJobException(jobId)
+            job = self.jobs[jobId]
+            if job['info'] is not None:
+                return('done' if job['info'].hasExited and job['info'].exitStatus == 0 else 'failed')
+            if job['process'] is not None:
+                return('running')
+            return('queued_active')
+
+    def control(self, jobId, action):
+        with self.lock:
+            job = self.jobs.get(jobId)
+            if job is None:
+                raise InvalidJobException(jobId)
+            if job['info'] is not None:
+                return
+            job['aborted'] = True
+            if job['process'] is not None:
+                os.kill(job['process'].pid, signal.SIGTERM)
+            elif jobId in self.queued:
+                self.queued.remove(jobId)
+                job['info'] = LocalJobInfo(jobId, None, None, True, {})
+
+    def wait(self, jobId, timeout=-1):
+        deadline = None if timeout < 0 else time.time() + timeout
+        while True:
+            with self.lock:
+                self._reap()
+                self._dispatch()
+                if jobId == self.JOB_IDS_SESSION_ANY:
+                    if not self.jobs:
+                        raise InvalidJobException(jobId)
+                    finished = [job_id for job_id, job in self.jobs.items() if job['info'] is not None]
+                    if finished:
+                        return(self.jobs.pop(finished[0])['info'])
+                else:
+                    if jobId not in self.jobs:
+                        raise InvalidJobException(jobId)
+                    if self.jobs[jobId]['info'] is not None:
+                        return(self.jobs.pop(jobId)['info'])
+            if deadline is not None and time.time() >= deadline:
+                raise ExitTimeoutException(jobId)
+            time.sleep(self.poll_interval)
+
+    def _enqueue(self, jobId, jobTemplate, index):
+        placeholder = LocalJobTemplate.PARAMETRIC_INDEX
+        expand = lambda value: value.replace(placeholder, str(index)) if index is not None else value
+        command = [expand(jobTemplate.remoteCommand)] + [expand(arg) for arg in jobTemplate.args]
+        self.jobs[jobId] = {
+            'command': command,
+            'stdout': expand(jobTemplate.outputPath).lstrip(':'),
+            'stderr': expand(jobTemplate.errorPath).lstrip(':'),
+            'process': None,
+            'info': None,
+            'aborted': False,
+            'submission_time': time.time(),
+            'start_time': None,
+        }
+        self.queued.append(jobId)
+
+    def _dispatch(self):
+        running = len([job for job in self.jobs.values() if job['process'] is not None and job['info'] is None])
+        while self.queued and running < self.slots:
+            jobId = self.queued.pop(0)
+            job = self.jobs[jobId]
+            stdout_handle = open(job['stdout'] or os.devnull, 'w')
+            stderr_handle = open(job['stderr'] or os.devnull, 'w')
+            job['start_time'] = time.time()
+            try:
+                job['process'] = subprocess.Popen(job['command'], stdout=stdout_handle, stderr=stderr_handle)
+            except OSError:
+                job['info'] = LocalJobInfo(jobId, 127, None, False, {})
+            stdout_handle.close()
+            stderr_handle.close()
+            if job['process'] is not None:
+                running += 1
+
+    def _reap(self):
+        for jobId, job in self.jobs.items():
+            if job['process'] is None or job['info'] is not None:
+                continue
+            pid, status, rusage = os.wait4(job['process'].pid, os.WNOHANG)
+            if pid == 0:
+                continue
+            job['process'].returncode = status
+            end_time = time.time()
+            resourceUsage = {
+                'submission_time': str(job['submission_time']),
+                'start_time': str(job['start_time']),
+                'end_time': str(end_time),
+                'ru_wallclock': str(end_time - job['start_time']),
+                'ru_utime': str(rusage.ru_utime),
+                'ru_stime': str(rusage.ru_stime),
+                'cpu': str(rusage.ru_utime + rusage.ru_stime),
+                'mem': '0',
+                'maxvmem': '0',
+                'ru_maxrss': str(rusage.ru_maxrss),
+                'io': '0',
+                'iow': '0',
+                'ru_inblock': str(rusage.ru_inblock),
+                'ru_oublock': str(rusage.ru_oublock),
+                'ru_minflt': str(rusage.ru_minflt),
+                'ru_majflt': str(rusage.ru_majflt),
+                'ru_nvcsw': str(rusage.ru_nvcsw),
+                'ru_nivcsw': str(rusage.ru_nivcsw),
+            }
+            if os.WIFSIGNALED(status):
+                job['info'] = LocalJobInfo(jobId, None, signal.Signals(os.WTERMSIG(status)).name if hasattr(signal, 'Signals') else str(os.WTERMSIG(status)), job['aborted'], resourceUsage)
+            else:
+                job['info'] = LocalJobInfo(jobId, os.WEXITSTATUS(status), None, job['aborted'], resourceUsage)
+
+#<-- Get backend -->#
+def getBackend(name, slots=4):
+### Returns a DRMAA session and a dictionary of backend-specific constants and exceptions.
+
+    # DRMAA backend
+    if name == "drmaa":
+        import drmaa
+        session = drmaa.Session()
+        backend = {
+            'JOB_IDS_SESSION_ANY': drmaa.Session.JOB_IDS_SESSION_ANY,
+            'PARAMETRIC_INDEX': drmaa.JobTemplate.PARAMETRIC_INDEX,
+            'TERMINATE': drmaa.JobControlAction.TERMINATE,
+            'ExitTimeoutException': drmaa.errors.ExitTimeoutException,
+            'InvalidJobException': drmaa.errors.InvalidJobException,
+            'DeniedByDrmException': drmaa.errors.DeniedByDrmException,
+        }
+
+    # Local (fake) backend
+    elif name == "local":
+        session = LocalSession(slots=slots)
+        backend = {
+            'JOB_IDS_SESSION_ANY': LocalSession.JOB_IDS_SESSION_ANY,
+            'PARAMETRIC_INDEX': LocalJobTemplate.PARAMETRIC_INDEX,
+            'TERMINATE': 'terminate',
+            'ExitTimeoutException': ExitTimeoutException,
+            'InvalidJobException': InvalidJobException,
+            'DeniedByDrmException': DeniedByDrmException,
+        }
+
+    # Die if backend is unknown
+    else:
+        sys.stderr.write('[ERROR] Unknown backend "{name}"!\n[ERROR] Execution aborted.\n'.format(name=name))
+        sys.exit(1)
+
+    # Return session and backend
+    return(session, backend)
+
+
+###########################
+#<--- ARRAY JOB TASKS --->#
+###########################
+
+#<-- Run a single task of an array job -->#
+def runTask(batchFile, index):
+### Executed on the compute node: looks up the command of task 'index' in 'batchFile', redirects
+### STDOUT/STDERR to the files requested by the submitting component and replaces the current
+### process with the command.
+
+    # Load task description
+    with open(batchFile, 'r') as batch_handle:
+        task = json.load(batch_handle)[int(index) - 1]
+
+    # Redirect STDOUT/STDERR (through a single file descriptor if both go to the same file, so that
+    # they share the file offset and do not overwrite each other)
+    targets = [(task['stdout'], [1]), (task['stderr'], [2])]
+    if task['stdout'] == task['stderr']:
+        targets = [(task['stdout'], [1, 2])]
+    for path, fds in targets:
+        handle = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        for fd in fds:
+            os.dup2(handle, fd)
+        os.close(handle)
+
+    # Execute command
+    os.execvp(task['command'][0], task['command'])
+
+
+#####################
+#<--- SCHEDULER --->#
+#####################
+
+#<-- Job status tracker -->#
+class JobStatusTracker(object):
+### Tracks the status of all jobs of a session until they start running. A single loop checks all
+### jobs that are due in each tick; every job is re-checked with exponential backoff (starting at
+### 'interval_min', multiplied by 'backoff' up to 'interval_max' seconds) and random jitter, and its
+### interval is reset whenever its status changes. Records per-job queue wait (time from submission
+### until the job was observed running) and start latency (maximum delay with which the start was
+### observed, i.e. the time since the previous check). Jobs that stay in an inactive state (any state
+### other than 'queued_active', e.g. held, suspended or in error state) continuously for more than
+### 'max_inactive' seconds are terminated and reported with an 'inactive' event.
+
+    def __init__(self, session, backend, interval_min=0.5, interval_max=60, backoff=2.0, jitter=0.1, tick=0.25, max_inactive=3600):
+        self.session = session
+        self.backend = backend
+        self.max_inactive = max_inactive
+        self.interval_min = interval_min
+        self.interval_max = interval_max
+        self.backoff = backoff
+        self.jitter = jitter
+        self.tick = tick
+        self.watched = {}
+        self.lock = threading.Lock()
+
+    #<-- Start watching job -->#
+    def watch(self, job):
+        now = time.time()
+        job.status = None
+        job.submitted_at = now
+        job.checked_at = now
+        job.interval = self.interval_min
+        job.next_check = now + self.interval_min
+        job.inactive_since = None
+        with self.lock:
+            self.watched[job.job_id] = job
+
+    #<-- Stop watching job -->#
+    def unwatch(self, job):
+        with self.lock:
+            self.watched.pop(job.job_id, None)
+
+    #<-- Check all due jobs -->#
+    def check(self):
+        now = time.time()
+        with self.lock:
+            due = [job for job in self.watched.values() if job.next_check <= now]
+        for job in due:
+
+            # Get status
+            try:
+                status = self.session.jobStatus(job.job_id)
+            except self.backend['InvalidJobException']:
+                self.unwatch(job)
+                continue
+            now = time.time()
+
+            # Reset interval if status changed
+            if status != job.status:
+                job.status = status
+                job.interval = self.interval_min
+
+            # Report jobs that started running (or already ended)
+            if status in ['running', 'done', 'failed']:
+                self.unwatch(job)
+                job.running = True
+                job.observed_start = now
+                job.queue_wait = now - job.submitted_at
+                job.start_latency = now - job.checked_at
+                job.events.put({'event': 'running', 'job_id': job.job_id, 'time': now, 'status': status, 'queue_wait': job.queue_wait, 'start_latency': job.start_latency})
+                continue
+
+            # Reset inactivity if job is in active queue; terminate and report job if inactive state persists
+            if status == 'queued_active':
+                job.inactive_since = None
+            elif job.inactive_since is None:
+                job.inactive_since = now
+            elif now - job.inactive_since > self.max_inactive:
+                self.unwatch(job)
+                try:
+                    self.session.control(job.job_id, self.backend['TERMINATE'])
+                except Exception as errorCode:
+                    sys.stderr.write('[WARNING] Job "{job_id}" could not be terminated: {errorCode}\n'.format(job_id=job.job_id, errorCode=errorCode))
+                job.events.put({'event': 'inactive', 'job_id': job.job_id, 'time': now, 'status': status})
+                continue
+
+            # Schedule next check
+            job.checked_at = now
+            job.next_check = now + job.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            job.interval = min(job.interval * self.backoff, self.interval_max)
+
+    #<-- Check loop -->#
+    def run(self, stopped):
+        while not stopped.is_set():
+            self.check()
+            time.sleep(self.tick)
+
+
+#<-- Submitted job -->#
+class Job(object):
+
+    def __init__(self, description):
+        self.description = description
+        self.events = queue.Queue()
+        self.job_id = None
+        self.running = False
+        self.observed_start = None
+        self.queue_wait = None
+        self.start_latency = None
+
+#<-- Get name of array job -->#
+def getBatchJobName(names):
+### Returns the common prefix of the instance names of the tasks of an array job (without trailing
+### separators) or, if they have none, the name of the first task.
+
+    # Get common prefix
+    prefix = os.path.commonprefix(names).rstrip("_-.")
+
+    # Return name
+    return(prefix or names[0])
+
+#<-- Scheduler holding the DRMAA session -->#
+class Scheduler(object):
+
+    def __init__(self, session, backend, batchDir, batch_interval=0.5, wait_timeout=1, metricsFile=None, max_inactive=3600):
+        self.session = session
+        self.backend = backend
+        self.batchDir = batchDir
+        self.batch_interval = batch_interval
+        self.wait_timeout = wait_timeout
+        self.metricsFile = metricsFile
+        self.tracker = JobStatusTracker(session, backend, max_inactive=max_inactive)
+        self.pending = queue.Queue()
+        self.jobs = {}
+        self.orphans = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.batch_counter = 0
+
+    #<-- Start submission and monitoring threads -->#
+    def start(self):
+        self.session.initialize()
+        for target, args in [(self.submitLoop, ()), (self.waitLoop, ()), (self.tracker.run, (self.stopped,))]:
+            thread = threading.Thread(target=target, args=args)
+            thread.daemon = True
+            thread.start()
+
+    #<-- Stop scheduler -->#
+    def stop(self):
+        self.stopped.set()
+        self.session.exit()
+
+    #<-- Queue job for submission -->#
+    def submit(self, description):
+        job = Job(description)
+        self.pending.put(job)
+        return(job)
+
+    #<-- Terminate job -->#
+    def terminate(self, job):
+        if job.job_id is not None:
+            try:
+                self.session.control(job.job_id, self.backend['TERMINATE'])
+            except Exception as errorCode:
+                sys.stderr.write('[WARNING] Job "{job_id}" could not be terminated: {errorCode}\n'.format(job_id=job.job_id, errorCode=errorCode))
+
+    #<-- Submission loop: drain pending jobs and submit them in batches -->#
+    def submitLoop(self):
+        while not self.stopped.is_set():
+            time.sleep(self.batch_interval)
+            batch = []
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+
+            # Group jobs by resource request
+            groups = {}
+            for job in batch:
+                groups.setdefault(job.description['nativeSpecification'], []).append(job)
+
+            # Submit groups
+            for nativeSpecification, jobs in groups.items():
+                try:
+                    if len(jobs) == 1:
+                        self.submitSingle(jobs[0])
+                    else:
+                        self.submitBulk(jobs, nativeSpecification)
+                except self.backend['DeniedByDrmException'] as errorCode:
+                    for job in jobs:
+                        job.events.put({'event': 'denied', 'error': str(errorCode)})
+
+    #<-- Submit single job -->#
+    def submitSingle(self, job):
+        description = job.description
+        job_template = self.session.createJobTemplate()
+        job_template.jobName = description['jobName']
+        job_template.outputPath = ":" + description['stdout']
+        job_template.errorPath = ":" + description['stderr']
+        job_template.remoteCommand = description['command'][0]
+        job_template.args = description['command'][1:]
+        job_template.nativeSpecification = description['nativeSpecification']
+        job_id = self.session.runJob(job_template)
+        self.session.deleteJobTemplate(job_template)
+        self.registerJob(job, job_id)
+
+    #<-- Submit several jobs with identical resource requests as one array job -->#
+    def submitBulk(self, jobs, nativeSpecification):
+
+        # Write batch file describing the individual tasks
+        self.batch_counter += 1
+        batchFile = os.path.join(self.batchDir, "batch.{pid}.{count}.json".format(pid=os.getpid(), count=self.batch_counter))
+        with open(batchFile, 'w') as batch_handle:
+            json.dump([job.description for job in jobs], batch_handle)
+
+        # Render array job template
+        job_template = self.session.createJobTemplate()
+        job_template.jobName = getBatchJobName([job.description['jobName'] for job in jobs])
+        job_template.outputPath = ":" + os.devnull
+        job_template.errorPath = ":" + os.devnull
+        job_template.remoteCommand = sys.executable
+        job_template.args = [os.path.abspath(__file__), "--run-task", batchFile, self.backend['PARAMETRIC_INDEX']]
+        job_template.nativeSpecification = nativeSpecification
+
+        # Submit array job
+        job_ids = self.session.runBulkJobs(job_template, 1, len(jobs), 1)
+        self.session.deleteJobTemplate(job_template)
+        for job, job_id in zip(jobs, job_ids):
+            self.registerJob(job, job_id)
+
+    #<-- Register submitted job -->#
+    def registerJob(self, job, job_id):
+        job.job_id = job_id
+        job.events.put({'event': 'submitted', 'job_id': job_id, 'time': time.time()})
+        self.tracker.watch(job)
+        with self.lock:
+            self.jobs[job_id] = job
+            job_info = self.orphans.pop(job_id, None)
+        if job_info is not None:
+            self.finishJob(job_info)
+
+    #<-- Wait loop: collect finished jobs of the whole session -->#
+    def waitLoop(self):
+        while not self.stopped.is_set():
+            try:
+                job_info = self.session.wait(self.backend['JOB_IDS_SESSION_ANY'], self.wait_timeout)
+            except (self.backend['ExitTimeoutException'], self.backend['InvalidJobException']):
+                time.sleep(self.wait_timeout if not self.jobs else 0)
+                continue
+            self.finishJob(job_info)
+
+    #<-- Report finished job -->#
+    def finishJob(self, job_info):
+
+        # Keep job info of jobs that finished before they were registered
+        with self.lock:
+            job = self.jobs.pop(job_info.jobId, None)
+            if job is None:
+                self.orphans[job_info.jobId] = job_info
+                return
+        self.tracker.unwatch(job)
+
+        # Calculate exact queue wait and start latency if the DRM application reports start times
+        resourceUsage = dict(job_info.resourceUsage)
+        try:
+            submission_time = float(resourceUsage['submission_time'])
+            start_time = float(resourceUsage['start_time'])
+            if start_time > 1e11:
+                submission_time, start_time = submission_time / 1000, start_time / 1000
+            job.queue_wait = start_time - submission_time
+            if job.observed_start is not None:
+                job.start_latency = max(job.observed_start - start_time, 0)
+        except (KeyError, ValueError):
+            pass
+
+        # Write metrics
+        self.writeMetrics(job, job_info)
+
+        # Send event
+        job.events.put({
+            'event': 'finished',
+            'job_id': job_info.jobId,
+            'time': time.time(),
+            'exitStatus': job_info.exitStatus,
+            'hasExited': job_info.hasExited,
+            'hasSignal': job_info.hasSignal,
+            'terminatedSignal': job_info.terminatedSignal,
+            'wasAborted': job_info.wasAborted,
+            'resourceUsage': resourceUsage,
+            'queue_wait': job.queue_wait,
+            'start_latency': job.start_latency,
+        })
+
+    #<-- Append per-job metrics to metrics file -->#
+    def writeMetrics(self, job, job_info):
+        if self.metricsFile is None:
+            return
+        format_metric = lambda value: "NA" if value is None else "{0:.3f}".format(value)
+        with self.lock:
+            writeHeader = not os.path.exists(self.metricsFile)
+            with open(self.metricsFile, 'a') as metrics_handle:
+                if writeHeader:
+                    metrics_handle.write("job_id\tjob_name\texit_status\tqueue_wait\tstart_latency\n")
+                metrics_handle.write("{0}\t{1}\t{2}\t{3}\t{4}\n".format(job.job_id, job.description['jobName'], job_info.exitStatus, format_metric(job.queue_wait), format_metric(job.start_latency)))
+
+
+##################
+#<--- SERVER --->#
+##################
+
+#<-- Request handler: one connection per job -->#
+class RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+
+        # Read job description
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        if request.get('action') != 'submit':
+            self.send({'event': 'error', 'error': 'unknown action'})
+            return
+
+        # Queue job
+        job = self.server.scheduler.submit(request['job'])
+
+        # Forward events until job is finished; handle termination requests and lost clients
+        while True:
+            try:
+                event = job.events.get(timeout=1)
+            except queue.Empty:
+                readable, _, _ = select.select([self.connection], [], [], 0)
+                if readable:
+                    message = self.rfile.readline()
+                    if not message or json.loads(message).get('action') == 'terminate':
+                        self.server.scheduler.terminate(job)
+                        if not message:
+                            return
+                continue
+            try:
+                self.send(event)
+            except socket.error:
+                self.server.scheduler.terminate(job)
+                return
+            if event['event'] in ['finished', 'denied', 'inactive']:
+                return
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode('utf-8'))
+        self.wfile.flush()
+
+#<-- Threaded UNIX socket server -->#
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, socketPath, scheduler):
+        self.scheduler = scheduler
+        socketserver.UnixStreamServer.__init__(self, socketPath, RequestHandler)
+
+
+################
+#<--- MAIN --->#
+################
+def main():
+
+    # Import modules
+    import argparse
+    import tempfile
+    import shutil
+
+    # Parse CLI arguments
+    parser = argparse.ArgumentParser(description="Persistent DRMAA submission daemon for Anduril components.")
+    parser.add_argument("--socket", help="Path to UNIX socket the daemon listens on.")
+    parser.add_argument("--backend", default="drmaa", choices=["drmaa", "local"], help="DRMAA backend. 'local' runs jobs as local subprocesses (for testing).")
+    parser.add_argument("--local-slots", type=int, default=4, help="Number of concurrently running jobs for the 'local' backend.")
+    parser.add_argument("--batch-interval", type=float, default=0.5, help="Interval (in seconds) at which pending jobs are submitted.")
+    parser.add_argument("--batch-dir", default=None, help="Directory for array job task descriptions (must be accessible from the compute nodes; default: temporary directory next to the socket, removed on shutdown).")
+    parser.add_argument("--max-inactive", type=float, default=3600, help="Terminate jobs that stay in an inactive state (e.g. held or suspended) for more than this number of seconds (default: 3600).")
+    parser.add_argument("--metrics", default=None, help="Append per-job queue wait and start latency (in seconds) to this TSV file.")
+    parser.add_argument("--run-task", nargs=2, metavar=("BATCH_FILE", "INDEX"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Run single array job task (executed on compute node)
+    if args.run_task:
+        runTask(*args.run_task)
+
+    # Die if socket path is missing
+    if args.socket is None:
+        parser.error("argument --socket is required")
+
+    # Get backend and start scheduler
+    session, backend = getBackend(args.backend, slots=args.local_slots)
+    batchDir = args.batch_dir or tempfile.mkdtemp(prefix="drmaa_batches.", dir=os.path.dirname(os.path.abspath(args.socket)))
+    scheduler = Scheduler(session, backend, batchDir, batch_interval=args.batch_interval, metricsFile=args.metrics, max_inactive=args.max_inactive)
+    scheduler.start()
+
+    # Remove stale socket
+    if os.path.exists(args.socket):
+        os.remove(args.socket)
+
+    # Serve until interrupted or terminated
+    server = Server(args.socket, scheduler)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    sys.stderr.write("DRMAA submission daemon ({backend}) listening on '{socket}'...\n".format(backend=args.backend, socket=args.socket))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scheduler.stop()
+        os.remove(args.socket)
+        if args.batch_dir is None:
+            shutil.rmtree(batchDir, ignore_errors=True)
+        sys.stderr.write("Done.\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+## Alexander Kanitz, Biozentrum, University of Basel (alexander.kanitz@unibas.ch)
+## Generates the wrappers ('component.py') of Anduril components from 'component.json'.
+##
+## All wrappers are identical: they pass the component instance to the shared launcher 'launch' in
+## 'anduril_custom_functions.py', which builds the command template from 'component.json' at
+## runtime. Adding a tool thus only requires 'component.json' (and 'component.xml' for Anduril).
+##
+## Usage:
+##   generate_component_launchers.py [--check] [--print-template] [COMPONENT_DIR ...]
+##
+## Without component directories, all components of the bundle are processed.
+
+##########################
+#<--- GLOBAL MODULES --->#
+##########################
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import anduril_custom_functions
+
+
+##########################
+#<--- WRAPPER SOURCE --->#
+##########################
+LAUNCHER = """#!/usr/bin/env python
+
+# Import modules
+import os
+import sys
+import anduril_custom_functions
+from anduril.args import component, tempdir
+
+# Execute command (template is built from 'component.json')
+exit_status = anduril_custom_functions.launch(component, tempdir, os.path.dirname(os.path.abspath(__file__)))
+
+# Return exit status
+sys.exit(exit_status)
+"""
+
+
+################
+#<--- MAIN --->#
+################
+def main():
+
+    # Import argparse module
+    import argparse
+
+    # Parse CLI arguments
+    defaultDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bundle", "components")
+    parser = argparse.ArgumentParser(description="Generate the wrappers ('component.py') of Anduril components from 'component.json'.")
+    parser.add_argument("componentDirs", nargs="*", metavar="COMPONENT_DIR", help="Component directories (default: all components in '{dir}').".format(dir=defaultDir))
+    parser.add_argument("--check", action="store_true", help="Do not write wrappers; exit with status 1 if any wrapper is outdated.")
+    parser.add_argument("--print-template", action="store_true", help="Print the command template of each component.")
+    args = parser.parse_args()
+
+    # Get component directories
+    componentDirs = args.componentDirs
+    if not componentDirs:
+        componentDirs = sorted([os.path.join(defaultDir, name) for name in os.listdir(defaultDir) if os.path.isfile(os.path.join(defaultDir, name, "component.json"))])
+
+    # Iterate over components
+    outdated = []
+    for componentDir in componentDirs:
+
+        # Die if component description is missing
+        jsonFile = os.path.join(componentDir, "component.json")
+        if not os.path.isfile(jsonFile):
+            sys.stderr.write("[ERROR] Component description '{file}' not found!\n[ERROR] Execution aborted.\n".format(file=jsonFile))
+            sys.exit(1)
+
+        # Build template (validates component description)
+        with open(jsonFile, 'r') as json_handle:
+            template = anduril_custom_functions.buildCommandTemplate(json.load(json_handle))
+        if args.print_template:
+            sys.stdout.write("{dir}\t{template}\n".format(dir=componentDir, template=template))
+
+        # Compare wrapper
+        wrapperFile = os.path.join(componentDir, "component.py")
+        current = None
+        if os.path.isfile(wrapperFile):
+            with open(wrapperFile, 'r') as wrapper_handle:
+                current = wrapper_handle.read()
+        if current == LAUNCHER:
+            continue
+        outdated.append(wrapperFile)
+
+        # Write wrapper
+        if not args.check:
+            with open(wrapperFile, 'w') as wrapper_handle:
+                wrapper_handle.write(LAUNCHER)
+            sys.stderr.write("Wrote '{file}'.\n".format(file=wrapperFile))
+
+    # Report outdated wrappers
+    if args.check and outdated:
+        for wrapperFile in outdated:
+            sys.stderr.write("[WARNING] Wrapper '{file}' is outdated.\n".format(file=wrapperFile))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
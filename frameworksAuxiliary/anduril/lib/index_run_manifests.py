@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+
+## Alexander Kanitz, Biozentrum, University of Basel (alexander.kanitz@unibas.ch)
+## Merges the run manifests of Anduril component instances into a single table.
+##
+## Each execution of a component instance appends one JSON line to '<instance>.manifest.jsonl' in
+## its execution directory (see 'startManifest' in 'anduril_custom_functions.py'). This script
+## collects the manifests below one or more directories (e.g. Anduril execution directories) and
+## writes one row per execution. Nested sections are flattened ('times.queue_s' becomes column
+## 'times_queue_s'); input/output ports and parameters are stored as JSON strings.
+##
+## Usage:
+##   index_run_manifests.py --output FILE [--table NAME] DIR [DIR ...]
+##
+## The output format is chosen by the extension of FILE: '.sqlite'/'.db' (SQLite), '.parquet' and
+## '.feather' (require the Python module 'pyarrow') or '.tsv'. Example query (SQLite):
+##   SELECT component, COUNT(*), SUM(times_run_s), AVG(times_queue_s), MAX(resources_maxrss_kb)
+##   FROM runs GROUP BY component ORDER BY SUM(times_run_s) DESC;
+
+##########################
+#<--- GLOBAL MODULES --->#
+##########################
+import sys
+import os
+import json
+
+
+##########################
+#<--- READ MANIFESTS --->#
+##########################
+
+#<-- Find manifest files -->#
+def findManifests(directories, suffix=".manifest.jsonl"):
+
+    # Walk directory trees
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(suffix):
+                    yield(os.path.join(root, name))
+
+#<-- Flatten manifest into row -->#
+def flattenManifest(manifest, jsonColumns=("inputs", "outputs", "parameters")):
+### Returns a dictionary of column names and scalar values: nested sections are flattened with '_'
+### as separator, the columns in 'jsonColumns' are serialized as JSON strings.
+
+    # Flatten values
+    row = {}
+    for key, value in manifest.items():
+        if key in jsonColumns:
+            row[key] = json.dumps(value, sort_keys=True)
+        elif isinstance(value, dict):
+            for subkey, subvalue in value.items():
+                row["{key}_{subkey}".format(key=key, subkey=subkey)] = subvalue
+        else:
+            row[key] = value
+
+    # Return row
+    return(row)
+
+#<-- Read rows from manifest files -->#
+def readRows(directories):
+
+    # Iterate over manifest files
+    rows = []
+    for filename in findManifests(directories):
+        with open(filename, 'r') as manifest_handle:
+            for attempt, line in enumerate(manifest_handle):
+
+                # Skip empty and truncated lines (e.g. of instances killed while writing)
+                if not line.strip():
+                    continue
+                try:
+                    manifest = json.loads(line)
+                except ValueError:
+                    sys.stderr.write("[WARNING] Skipping malformed line {line} in '{file}'.\n".format(line=attempt + 1, file=filename))
+                    continue
+
+                # Add row
+                row = flattenManifest(manifest)
+                row['manifest_file'] = filename
+                row['attempt'] = attempt + 1
+                rows.append(row)
+
+    # Return rows
+    return(rows)
+
+#<-- Get column names and types -->#
+def getColumns(rows):
+### Returns a list of (name, type) tuples, where type is one of 'INTEGER', 'REAL' or 'TEXT'.
+
+    # Get types of values per column
+    types = {}
+    for row in rows:
+        for key, value in row.items():
+            if value is None:
+                types.setdefault(key, set())
+            elif isinstance(value, bool) or isinstance(value, int):
+                types.setdefault(key, set()).add('INTEGER')
+            elif isinstance(value, float):
+                types.setdefault(key, set()).add('REAL')
+            else:
+                types.setdefault(key, set()).add('TEXT')
+
+    # Resolve column types
+    columns = []
+    for key in sorted(types):
+        if 'TEXT' in types[key] or not types[key]:
+            columns.append((key, 'TEXT'))
+        elif 'REAL' in types[key]:
+            columns.append((key, 'REAL'))
+        else:
+            columns.append((key, 'INTEGER'))
+
+    # Return columns
+    return(columns)
+
+
+#######################
+#<--- WRITE TABLE --->#
+#######################
+
+#<-- Write SQLite database -->#
+def writeSQLite(rows, columns, filename, table):
+
+    # Import sqlite3 module
+    import sqlite3
+
+    # Create table (replacing previous index)
+    connection = sqlite3.connect(filename)
+    connection.execute('DROP TABLE IF EXISTS "{table}"'.format(table=table))
+    connection.execute('CREATE TABLE "{table}" ({columns})'.format(table=table, columns=", ".join(['"{name}" {type}'.format(name=name, type=type) for name, type in columns])))
+
+    # Insert rows
+    names = [name for name, type in columns]
+    connection.executemany('INSERT INTO "{table}" VALUES ({values})'.format(table=table, values=", ".join(["?"] * len(names))), [[row.get(name) for name in names] for row in rows])
+
+    # Create indices on columns used for grouping
+    for name in ["component", "instance", "host"]:
+        if name in names:
+            connection.execute('CREATE INDEX "{table}_{name}" ON "{table}" ("{name}")'.format(table=table, name=name))
+
+    # Close database
+    connection.commit()
+    connection.close()
+
+#<-- Write Parquet/Feather file -->#
+def writeArrow(rows, columns, filename):
+
+    # Import pyarrow modules
+    try:
+        import pyarrow
+    except ImportError:
+        sys.stderr.write("[ERROR] Writing '{file}' requires the Python module 'pyarrow'!\n[ERROR] Execution aborted.\n".format(file=filename))
+        sys.exit(1)
+
+    # Build table
+    types = {'INTEGER': pyarrow.int64(), 'REAL': pyarrow.float64(), 'TEXT': pyarrow.string()}
+    arrays = []
+    for name, type in columns:
+        values = [row.get(name) for row in rows]
+        if type == 'TEXT':
+            values = [None if value is None else str(value) for value in values]
+        elif type == 'INTEGER':
+            values = [None if value is None else int(value) for value in values]
+        arrays.append(pyarrow.array(values, type=types[type]))
+    table = pyarrow.Table.from_arrays(arrays, names=[name for name, type in columns])
+
+    # Write table
+    if filename.endswith(".parquet"):
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(table, filename)
+    else:
+        import pyarrow.feather
+        pyarrow.feather.write_feather(table, filename)
+
+#<-- Write TSV file -->#
+def writeTSV(rows, columns, filename):
+
+    # Write header and rows
+    names = [name for name, type in columns]
+    with open(filename, 'w') as tsv_handle:
+        tsv_handle.write("\t".join(names) + "\n")
+        for row in rows:
+            tsv_handle.write("\t".join(["NA" if row.get(name) is None else str(row.get(name)) for name in names]) + "\n")
+
+
+################
+#<--- MAIN --->#
+################
+def main():
+
+    # Import argparse module
+    import argparse
+
+    # Parse CLI arguments
+    parser = argparse.ArgumentParser(description="Merge the run manifests of Anduril component instances into a single table.")
+    parser.add_argument("directories", nargs="+", metavar="DIR", help="Directories that are searched recursively for '*.manifest.jsonl' files.")
+    parser.add_argument("--output", required=True, help="Output file; format according to extension: '.sqlite'/'.db', '.parquet', '.feather' or '.tsv'.")
+    parser.add_argument("--table", default="runs", help="Name of the SQLite table (default: 'runs').")
+    args = parser.parse_args()
+
+    # Read manifests
+    rows = readRows(args.directories)
+    if not rows:
+        sys.stderr.write("[ERROR] No run manifests found in: {directories}\n[ERROR] Execution aborted.\n".format(directories=", ".join(args.directories)))
+        sys.exit(1)
+    columns = getColumns(rows)
+
+    # Write table
+    if args.output.endswith((".sqlite", ".db")):
+        writeSQLite(rows, columns, args.output, args.table)
+    elif args.output.endswith((".parquet", ".feather")):
+        writeArrow(rows, columns, args.output)
+    elif args.output.endswith(".tsv"):
+        writeTSV(rows, columns, args.output)
+    else:
+        sys.stderr.write("[ERROR] Unknown output format of '{file}'!\n[ERROR] Execution aborted.\n".format(file=args.output))
+        sys.exit(1)
+
+    # Report
+    sys.stderr.write("Indexed {rows} executions ({columns} columns) in '{file}'.\n".format(rows=len(rows), columns=len(columns), file=args.output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+
+## Alexander Kanitz, Biozentrum, University of Basel (alexander.kanitz@unibas.ch)
+## Executes Anduril workflows (e.g. one per sample table chunk) under a global concurrency limit.
+##
+## Workflows are dispatched from a single queue: at most '--max-workflows' 'anduril run' instances
+## run at any time, and the next workflow is started as soon as any running workflow finishes, so
+## that no slot sits idle while slow workflows finish. Workflows are queued in order of decreasing
+## estimated cost (longest processing time first), so that large workflows do not start last. The
+## cost of a workflow is estimated from its sample table: the total size of the read files listed
+## in column 'path' (or the number of samples if no read file is accessible).
+##
+## Components executed locally share a single resource budget through the node-local resource
+## broker of 'anduril_custom_functions.py' ('--broker-dir'); components of costlier workflows are
+## admitted first.
+##
+## Usage:
+##   schedule_workflows.py --workflow-dir DIR --table-dir DIR --bundle DIR --execution-root DIR
+##                         --log-root DIR [--max-workflows N] [--threads N] [--broker-dir DIR]
+##                         [--commands FILE] [--dry-run] [--summary FILE]
+
+##########################
+#<--- GLOBAL MODULES --->#
+##########################
+import sys
+import os
+import csv
+import glob
+import time
+import signal
+import subprocess
+
+
+##########################
+#<--- WORKFLOW QUEUE --->#
+##########################
+
+#<-- Find workflows -->#
+def findWorkflows(workflowDir, prefix, suffix):
+### Returns a list of (ID, path) tuples of the workflow files '<prefix><ID><suffix>' in 'workflowDir'.
+
+    # Find workflow files
+    workflows = []
+    for path in sorted(glob.glob(os.path.join(workflowDir, prefix + "*" + suffix))):
+        workflows.append((os.path.basename(path)[len(prefix):len(os.path.basename(path)) - len(suffix)], path))
+
+    # Return workflows
+    return(workflows)
+
+#<-- Estimate cost of workflow -->#
+def estimateCost(tablePath, pathColumn="path"):
+### Returns a tuple of the total size (in bytes) of the read files listed in the sample table and
+### the number of samples. The size is 'None' if no read file is accessible.
+
+    # Return if sample table does not exist
+    if not os.path.isfile(tablePath):
+        return(None, 0)
+
+    # Sum sizes of read files
+    size = None
+    samples = 0
+    with open(tablePath, 'r') as table_handle:
+        for row in csv.DictReader(table_handle, delimiter="\t"):
+            samples += 1
+            try:
+                size = (size or 0) + os.path.getsize(row.get(pathColumn) or "")
+            except OSError:
+                pass
+
+    # Return cost
+    return(size, samples)
+
+#<-- Order workflows -->#
+def orderWorkflows(workflows, costs):
+### Orders workflows by decreasing cost (longest processing time first). Sizes are compared if
+### available for all workflows, numbers of samples otherwise.
+
+    # Choose cost measure
+    useSize = all([costs[workflowId][0] is not None for workflowId, path in workflows])
+
+    # Return ordered workflows
+    return(sorted(workflows, key=lambda workflow: -(costs[workflow[0]][0] if useSize else costs[workflow[0]][1])))
+
+#<-- Build Anduril command -->#
+def getCommand(workflowId, path, args):
+
+    # Return command
+    return([
+        args.anduril, "run", path,
+        "--bundle", args.bundle,
+        "--execution-dir", os.path.join(args.execution_root, workflowId),
+        "--log", os.path.join(args.log_root, workflowId),
+        "--threads", str(args.threads),
+    ])
+
+#<-- Write commands -->#
+def writeCommands(filename, queue, args):
+### Writes the commands of all queued workflows in order of execution, each to be run in the
+### background with 'nohup' (all at once, i.e. without concurrency limit).
+
+    # Write commands
+    with open(filename, 'w') as commands_handle:
+        for workflowId, path in queue:
+            command = getCommand(workflowId, path, args)
+            commands_handle.write('# Workflow ID: {workflowId}\nnohup {anduril} run "{path}" \\\n'.format(workflowId=workflowId, anduril=command[0], path=path))
+            for option, value in zip(command[3::2], command[4::2]):
+                commands_handle.write('    {option} {value} \\\n'.format(option=option, value=value if option == "--threads" else '"{}"'.format(value)))
+            commands_handle.write('    &> /dev/null &\n\n')
+
+
+##############################
+#<--- WORKFLOW EXECUTION --->#
+##############################
+
+#<-- Start workflow -->#
+def startWorkflow(workflowId, path, priority, args):
+### Starts 'anduril run' in its own process group (so that it can be terminated with all its
+### components); output is appended to '<log-root>/<ID>.scheduler.log'.
+
+    # Set environment: resource broker and priority of locally executed components
+    environment = dict(os.environ)
+    if args.broker_dir is not None:
+        environment['ANDURIL_LOCAL_BROKER'] = args.broker_dir
+        environment['ANDURIL_LOCAL_PRIORITY'] = str(priority)
+
+    # Start process
+    if not os.path.isdir(args.log_root):
+        os.makedirs(args.log_root)
+    with open(os.path.join(args.log_root, workflowId + ".scheduler.log"), 'a') as log_handle:
+        process = subprocess.Popen(getCommand(workflowId, path, args), stdout=log_handle, stderr=subprocess.STDOUT, env=environment, preexec_fn=os.setsid)
+
+    # Return process
+    return(process)
+
+#<-- Execute workflows -->#
+def executeWorkflows(queue, costs, args):
+### Executes the queued workflows with at most 'args.max_workflows' running at a time. Returns a
+### list of (ID, start time, end time, exit status) tuples in order of completion.
+
+    # Initialize running workflows and results
+    running = {}
+    results = []
+    pending = list(queue)
+
+    # Terminate running workflows on SIGTERM/SIGINT
+    def terminate(signum, frame):
+        for pid in running:
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        sys.stderr.write("[ERROR] Terminated by signal {signum}; {running} workflows were terminated.\n[ERROR] Execution aborted.\n".format(signum=signum, running=len(running)))
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, terminate)
+
+    # Keep dispatching if the controlling terminal is closed (cf. 'nohup')
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    # Dispatch workflows until all finished
+    while pending or running:
+
+        # Fill free slots
+        while pending and len(running) < args.max_workflows:
+            workflowId, path = pending.pop(0)
+            process = startWorkflow(workflowId, path, len(pending), args)
+            running[process.pid] = (workflowId, process, time.time())
+            sys.stderr.write("Started workflow '{workflowId}' ({running} running, {pending} pending).\n".format(workflowId=workflowId, running=len(running), pending=len(pending)))
+
+        # Wait for any workflow to finish
+        pid, status = os.wait()
+        if pid not in running:
+            continue
+        workflowId, process, start = running.pop(pid)
+        process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        results.append((workflowId, start, time.time(), process.returncode))
+        sys.stderr.write("Finished workflow '{workflowId}' (exit status: {status}; {seconds:.0f} s).\n".format(workflowId=workflowId, status=process.returncode, seconds=time.time() - start))
+
+    # Return results
+    return(results)
+
+#<-- Write summary -->#
+def writeSummary(filename, results, costs):
+
+    # Write one row per workflow
+    with open(filename, 'w') as summary_handle:
+        summary_handle.write("workflow\tsamples\tbytes\tstart\tend\tseconds\texit_status\n")
+        for workflowId, start, end, status in results:
+            size, samples = costs[workflowId]
+            summary_handle.write("{workflowId}\t{samples}\t{size}\t{start}\t{end}\t{seconds:.0f}\t{status}\n".format(workflowId=workflowId, samples=samples, size="NA" if size is None else size, start=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start)), end=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(end)), seconds=end - start, status=status))
+
+
+################
+#<--- MAIN --->#
+################
+def main():
+
+    # Import argparse module
+    import argparse
+
+    # Parse CLI arguments
+    parser = argparse.ArgumentParser(description="Execute Anduril workflows under a global concurrency limit, longest first.")
+    parser.add_argument("--workflow-dir", required=True, help="Directory containing the workflow files.")
+    parser.add_argument("--workflow-prefix", default="workflow.", help="Prefix of workflow files (default: 'workflow.').")
+    parser.add_argument("--workflow-suffix", default=".and", help="Suffix of workflow files (default: '.and').")
+    parser.add_argument("--table-dir", required=True, help="Directory containing the sample table of each workflow ('<table-prefix><ID><table-suffix>').")
+    parser.add_argument("--table-prefix", default="table.", help="Prefix of sample tables (default: 'table.').")
+    parser.add_argument("--table-suffix", default=".tsv", help="Suffix of sample tables (default: '.tsv').")
+    parser.add_argument("--bundle", required=True, help="Anduril bundle directory.")
+    parser.add_argument("--execution-root", required=True, help="Root of the execution directories ('<execution-root>/<ID>').")
+    parser.add_argument("--log-root", required=True, help="Root of the log directories ('<log-root>/<ID>').")
+    parser.add_argument("--threads", type=int, default=2, help="Number of threads of each Anduril instance (default: 2).")
+    parser.add_argument("--max-workflows", type=int, default=4, help="Maximum number of concurrently running workflows (default: 4).")
+    parser.add_argument("--broker-dir", default=None, help="Directory of the node-local resource broker shared by locally executed components of all workflows (default: broker disabled).")
+    parser.add_argument("--anduril", default="anduril", help="Anduril executable (default: 'anduril').")
+    parser.add_argument("--commands", default=None, help="Write the Anduril commands of all workflows (in order of execution) to this file.")
+    parser.add_argument("--dry-run", action="store_true", help="Do not execute workflows.")
+    parser.add_argument("--summary", default=None, help="Write a table of workflow costs, run times and exit statuses to this file.")
+    args = parser.parse_args()
+
+    # Check arguments
+    if args.max_workflows < 1:
+        sys.stderr.write("[ERROR] '--max-workflows' must be at least 1!\n[ERROR] Execution aborted.\n")
+        sys.exit(1)
+
+    # Find workflows and estimate costs
+    workflows = findWorkflows(args.workflow_dir, args.workflow_prefix, args.workflow_suffix)
+    costs = dict([(workflowId, estimateCost(os.path.join(args.table_dir, args.table_prefix + workflowId + args.table_suffix))) for workflowId, path in workflows])
+    queue = orderWorkflows(workflows, costs)
+    sys.stderr.write("Found {workflows} workflows ({samples} samples).\n".format(workflows=len(queue), samples=sum([costs[workflowId][1] for workflowId, path in queue])))
+
+    # Write commands
+    if args.commands is not None:
+        writeCommands(args.commands, queue, args)
+
+    # Execute workflows
+    if args.dry_run:
+        return
+    results = executeWorkflows(queue, costs, args)
+
+    # Write summary
+    if args.summary is not None:
+        writeSummary(args.summary, results, costs)
+
+    # Die if any workflow failed
+    failed = [workflowId for workflowId, start, end, status in results if status != 0]
+    if failed:
+        sys.stderr.write("[ERROR] {failed} workflows failed: {workflows}\n[ERROR] Execution aborted.\n".format(failed=len(failed), workflows=", ".join(failed)))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+
+## Alexander Kanitz, Biozentrum, University of Basel (alexander.kanitz@unibas.ch)
+## Executes a STAR mapping command against a genome index held in shared memory of the node.
+##
+## The first STAR job of a node that maps against a given genome directory loads the index into
+## shared memory ('--genomeLoad LoadAndExit'); this and all concurrent and subsequent jobs map with
+## '--genomeLoad LoadAndKeep' and thus attach to the loaded index instead of reading it from disk.
+## Jobs holding the index are registered (by process ID) in a state file per genome directory in
+## '--lock-dir' (node-local, e.g. '/dev/shm'); access is serialized through a lock file. The last
+## job to finish waits for an idle grace period ('--grace', default: 60 seconds) and removes the index
+## from shared memory ('--genomeLoad Remove') only if no other job attached to it in the meantime, so
+## that jobs that run back to back do not reload the index; with '--keep', the index is never
+## removed. Holders that died without deregistering are removed from the state file.
+##
+## Commands that are incompatible with a shared genome (other run modes, on-the-fly insertion of
+## splice junctions, e.g. through '--twopassMode Basic' or '--sjdbGTFfile', and coordinate-sorted
+## BAM output without '--limitBAMsortRAM') are executed unchanged.
+##
+## Usage:
+##   star_shared_genome.py [--lock-dir DIR] [--keep | --grace SECONDS] -- STAR [STAR options]
+##
+## The exit status is that of the STAR mapping command.
+
+##########################
+#<--- GLOBAL MODULES --->#
+##########################
+import sys
+import os
+import json
+import time
+import fcntl
+import shutil
+import signal
+import hashlib
+import tempfile
+import subprocess
+
+
+########################
+#<--- STAR OPTIONS --->#
+########################
+
+#<-- Parse STAR options -->#
+def getOptions(command):
+### Returns a dictionary of the options of a STAR command (option name -> list of values).
+
+    # Collect values following each option
+    options = {}
+    values = None
+    for item in command[1:]:
+        if item.startswith("--"):
+            values = options.setdefault(item[2:], [])
+        elif values is not None:
+            values.append(item)
+
+    # Return options
+    return(options)
+
+#<-- Check compatibility with shared genome -->#
+def getIncompatibility(options):
+### Returns the reason why a STAR command cannot use a shared genome or 'None' if it can.
+
+    # Check run mode
+    if options.get('runMode', ['alignReads'])[0] != "alignReads":
+        return("run mode '{mode}'".format(mode=options['runMode'][0]))
+
+    # Check on-the-fly insertion of splice junctions
+    if options.get('twopassMode', ['None'])[0] != "None":
+        return("two-pass mode '{mode}'".format(mode=options['twopassMode'][0]))
+    for option in ['sjdbGTFfile', 'sjdbFileChrStartEnd']:
+        if options.get(option, ['-'])[0] != "-":
+            return("splice junction insertion through '--{option}'".format(option=option))
+
+    # Check sorted BAM output
+    if "SortedByCoordinate" in options.get('outSAMtype', []) and options.get('limitBAMsortRAM', ['0'])[0] == "0":
+        return("coordinate-sorted BAM output without '--limitBAMsortRAM'")
+
+    # Return compatible
+    return(None)
+
+#<-- Set genome load option -->#
+def setGenomeLoad(command, mode):
+### Returns a copy of the STAR command with option '--genomeLoad' set to 'mode'.
+
+    # Remove existing option
+    command = list(command)
+    if "--genomeLoad" in command:
+        index = command.index("--genomeLoad")
+        del command[index:index + 2]
+
+    # Return command with option
+    return(command[:1] + ["--genomeLoad", mode] + command[1:])
+
+
+##################################
+#<--- SHARED GENOME REGISTRY --->#
+##################################
+
+#<-- Update state of genome -->#
+def updateState(lockDir, genomeDir, update):
+### Applies 'update' to the state of 'genomeDir' ('holders': process IDs of jobs using the genome,
+### 'loaded': whether the genome is loaded) under an exclusive lock; dead holders are removed first.
+### Returns the return value of 'update'.
+
+    # Get lock and state files
+    key = hashlib.sha1(os.path.realpath(genomeDir).encode("utf-8")).hexdigest()
+    lockFile = os.path.join(lockDir, key + ".lock")
+    stateFile = os.path.join(lockDir, key + ".json")
+
+    # Update state under lock
+    with open(lockFile, 'a') as lock_handle:
+        fcntl.flock(lock_handle, fcntl.LOCK_EX)
+        try:
+            try:
+                with open(stateFile, 'r') as state_handle:
+                    state = json.load(state_handle)
+            except (IOError, ValueError):
+                state = {'genome_dir': os.path.realpath(genomeDir), 'holders': [], 'loaded': False, 'idle_since': None}
+            state['holders'] = [pid for pid in state['holders'] if isAlive(pid)]
+            result = update(state)
+            with open(stateFile + ".tmp", 'w') as state_handle:
+                json.dump(state, state_handle)
+            os.rename(stateFile + ".tmp", stateFile)
+        finally:
+            fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    # Return result
+    return(result)
+
+#<-- Check whether process is alive -->#
+def isAlive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as error:
+        return(error.errno == 1)
+    return(True)
+
+#<-- Load/remove genome -->#
+def runGenomeLoad(executable, genomeDir, mode):
+### Runs STAR with '--genomeLoad mode' ('LoadAndExit' or 'Remove'); logs are written to a temporary
+### directory that is removed afterwards. Returns the exit status.
+
+    # Run STAR
+    tempDir = tempfile.mkdtemp(prefix="star_shared_genome.")
+    try:
+        sys.stderr.write("[star_shared_genome] Running '--genomeLoad {mode}' for '{genomeDir}'...\n".format(mode=mode, genomeDir=genomeDir))
+        exit_status = subprocess.call([executable, "--genomeDir", genomeDir, "--genomeLoad", mode, "--outFileNamePrefix", tempDir + os.sep], stdout=sys.stderr)
+    finally:
+        shutil.rmtree(tempDir, ignore_errors=True)
+
+    # Return exit status
+    return(exit_status)
+
+#<-- Register job as holder of genome -->#
+def acquireGenome(lockDir, genomeDir, executable):
+### Registers the current process as holder of the genome and loads the genome if it is not loaded.
+### Returns 'True' if the genome is loaded.
+
+    def acquire(state):
+        state['idle_since'] = None
+        if not state['loaded']:
+            state['loaded'] = runGenomeLoad(executable, genomeDir, "LoadAndExit") == 0
+        if state['loaded']:
+            state['holders'].append(os.getpid())
+        return(state['loaded'])
+
+    # Return whether genome is loaded
+    return(updateState(lockDir, genomeDir, acquire))
+
+#<-- Deregister job as holder of genome -->#
+def releaseGenome(lockDir, genomeDir, executable, keep=False, grace=60, poll=1):
+### Deregisters the current process as holder of the genome. If no holders are left (and 'keep' is not
+### set), waits for 'grace' seconds and removes the genome from shared memory unless another job
+### attached to it in the meantime (that job is then responsible for removing it).
+
+    def release(state):
+        state['holders'] = [pid for pid in state['holders'] if pid != os.getpid()]
+        if state['holders'] or not state['loaded'] or keep:
+            return(None)
+        state['idle_since'] = time.time()
+        return(state['idle_since'])
+
+    def remove(state):
+        if state.get('idle_since') != idle_since or not state['loaded']:
+            return(True)
+        if time.time() < idle_since + grace:
+            return(False)
+        runGenomeLoad(executable, genomeDir, "Remove")
+        state['loaded'] = False
+        state['idle_since'] = None
+        return(True)
+
+    # Deregister
+    idle_since = updateState(lockDir, genomeDir, release)
+    if idle_since is None:
+        return
+
+    # Remove genome after grace period (unless the genome was attached to or removed by another job)
+    while not updateState(lockDir, genomeDir, remove):
+        time.sleep(max(min(poll, idle_since + grace - time.time()), 0))
+
+
+#<-- Get exit status -->#
+def getExitStatus(returnCode):
+### Returns the exit status for a subprocess return code (processes killed by signal N: 128 + N).
+
+    # Return exit status
+    return(returnCode if returnCode >= 0 else 128 - returnCode)
+
+
+################
+#<--- MAIN --->#
+################
+def main():
+
+    # Import argparse module
+    import argparse
+
+    # Parse CLI arguments
+    parser = argparse.ArgumentParser(description="Execute a STAR mapping command against a genome index in shared memory.")
+    parser.add_argument("--lock-dir", default="/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), help="Node-local directory for lock and state files (default: '/dev/shm').")
+    parser.add_argument("--keep", action="store_true", help="Keep genome in shared memory after the last job finished.")
+    parser.add_argument("--grace", type=float, default=60, help="Seconds to wait after the last job finished before the genome is removed from shared memory; the genome is kept if another job attaches to it in the meantime (default: 60).")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="STAR command (preceded by '--').")
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no STAR command given")
+
+    # Execute command unchanged if incompatible with shared genome
+    options = getOptions(command)
+    genomeDir = (options.get('genomeDir') or [None])[0]
+    reason = "no genome directory" if genomeDir is None else getIncompatibility(options)
+    if reason is not None:
+        sys.stderr.write("[star_shared_genome] Shared genome not supported ({reason}); genome is loaded by the job.\n".format(reason=reason))
+        sys.exit(getExitStatus(subprocess.call(command)))
+
+    # Load genome (or attach to loaded genome); execute command unchanged if loading failed
+    lockDir = os.path.join(args.lock_dir, "star_shared_genome")
+    if not os.path.isdir(lockDir):
+        try:
+            os.makedirs(lockDir)
+        except OSError:
+            pass
+    if not acquireGenome(lockDir, genomeDir, command[0]):
+        sys.stderr.write("[star_shared_genome] Loading genome into shared memory failed; genome is loaded by the job.\n")
+        sys.exit(getExitStatus(subprocess.call(setGenomeLoad(command, "NoSharedMemory"))))
+
+    # Execute command; forward termination signals and deregister in any case
+    process = None
+    def terminate(signum, frame):
+        if process is not None and process.poll() is None:
+            process.send_signal(signum)
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, terminate)
+    try:
+        process = subprocess.Popen(setGenomeLoad(command, "LoadAndKeep"))
+        exit_status = process.wait()
+    finally:
+        releaseGenome(lockDir, genomeDir, command[0], keep=args.keep, grace=args.grace)
+
+    # Return exit status of command
+    sys.exit(getExitStatus(exit_status))
+
+if __name__ == "__main__":
+    main()
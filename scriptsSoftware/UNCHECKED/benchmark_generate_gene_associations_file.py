@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+__author__    = "Alexander Kanitz"
+__copyright__ = "Copyright 2016, Biozentrum, University of Basel"
+__license__   = "MIT"
+__version__   = "1.0"
+__email__     = "alexander.kanitz@alumni.ethz.ch"
+
+'''Compares the run time of the batched, column plan-based GAF conversion in "generate_gene_associations_file_from_table.py" with the previous per-line conversion on a synthetic annotation table. Both conversions must produce identical output.'''
+
+# Import modules
+import os
+import sys
+import time
+import random
+import argparse
+
+# Import GAF generator
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import generate_gene_associations_file_from_table as gaf
+
+
+def generate_table(rows, seed=1):
+    '''Returns lines of a synthetic annotation table (id, GO term, evidence code, aspect, symbol, qualifier, name), including some illegal values.'''
+    random.seed(seed)
+    codes = ['EXP', 'IDA', 'IPI', 'IMP', 'IEA', 'IEA', 'IEA', 'ISS', 'IC', 'TAS', 'XXX']
+    aspects = ['biological_process', 'molecular_function', 'cellular_component', 'unknown']
+    qualifiers = ['', '', '', '', '', 'NOT', 'contributes_to', 'NOT|colocalizes_with', 'illegal']
+    lines = []
+    for row in range(rows):
+        lines.append("\t".join([
+            "ENSG{number:011d}".format(number=random.randint(0, rows // 5 + 1)),
+            "GO:{number:07d}".format(number=random.randint(0, 45000)),
+            random.choice(codes),
+            random.choice(aspects),
+            random.choice(['', 'SYMBOL{number}'.format(number=row)]),
+            random.choice(qualifiers),
+            "gene {number}".format(number=row),
+        ]) + "\n")
+    return lines
+
+
+def convert_lines_per_line(lines, args):
+    '''Converts input lines to GAF lines one at a time, resolving field sources for every line (previous implementation).'''
+    gaf_lines = []
+    warnings = []
+    for line in lines:
+        fields = line.strip().split("\t")
+        db        = fields[args.db        - 1] if isinstance(args.db,        int) else args.db
+        id        = fields[args.id        - 1]
+        symbol    = fields[args.symbol    - 1] if isinstance(args.symbol,    int) else id
+        qualifier = fields[args.qualifier - 1] if isinstance(args.qualifier, int) else args.qualifier
+        go        = fields[args.go        - 1]
+        reference = fields[args.reference - 1] if isinstance(args.reference, int) else "{db}:{id}".format(db=db, id=id)
+        evidence  = fields[args.evidence  - 1]
+        with_from = fields[args.with_from - 1] if isinstance(args.with_from, int) else ""
+        aspect    = fields[args.aspect    - 1]
+        name      = fields[args.name      - 1] if isinstance(args.name,      int) else ""
+        synonym   = fields[args.synonym   - 1] if isinstance(args.synonym,   int) else ""
+        type      = fields[args.type      - 1] if isinstance(args.type,      int) else args.type
+        taxon     = fields[args.taxon     - 1] if isinstance(args.taxon,     int) else args.taxon
+        date      = fields[args.date      - 1] if isinstance(args.date,      int) else args.date
+        ass_by    = fields[args.ass_by    - 1] if isinstance(args.ass_by,    int) else db
+        anno_ext  = fields[args.anno_ext  - 1] if isinstance(args.anno_ext,  int) else ""
+        prod_id   = fields[args.prod_id   - 1] if isinstance(args.prod_id,   int) else ""
+        if qualifier and not set(qualifier.split("|")).issubset(set(gaf.allowed_qualifiers)):
+            warnings.append(('qualifier', qualifier))
+            continue
+        aspect_proc = aspect.upper().replace(" ", "_")
+        if aspect_proc in gaf.allowed_aspects:
+            aspect = gaf.allowed_aspects[aspect_proc]
+        else:
+            warnings.append(('aspect', aspect))
+            continue
+        if evidence == "IC":
+            with_from = go
+        elif evidence not in gaf.allowed_codes:
+            warnings.append(('evidence', evidence))
+            continue
+        if not symbol:
+            symbol = id
+        gaf_lines.append("\t".join([db, id, symbol, qualifier, go, reference, evidence, with_from, aspect, name, synonym, type, taxon, date, ass_by, anno_ext, prod_id]) + "\n")
+    return gaf_lines, warnings
+
+
+def main():
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', action='store', default=1000000, type=int, help='Number of rows of the synthetic table. Default: 1000000.', metavar='INT')
+    parser.add_argument('--repeats', action='store', default=3, type=int, help='Number of timed runs per implementation (the fastest is reported). Default: 3.', metavar='INT')
+    args = parser.parse_args()
+
+    # Generate input
+    lines = generate_table(args.rows)
+    gaf_args = gaf.parse_arguments(['--symbol', '5', '--qualifier', '#6', '--name', '7'])
+
+    # Time implementations
+    timings = {}
+    outputs = {}
+    for label in ['per-line', 'column plan']:
+        timings[label] = []
+        for repeat in range(args.repeats):
+            start = time.time()
+            if label == 'per-line':
+                outputs[label] = convert_lines_per_line(lines, gaf_args)
+            else:
+                plan = gaf.build_column_plan(gaf_args)
+                gaf_lines = []
+                warnings = []
+                for offset in range(0, len(lines), gaf_args.batch_size):
+                    batch_lines, batch_warnings, error_line = gaf.convert_lines(lines[offset:offset + gaf_args.batch_size], plan)
+                    gaf_lines.extend(batch_lines)
+                    warnings.extend(batch_warnings)
+                outputs[label] = (gaf_lines, warnings)
+            timings[label].append(time.time() - start)
+
+    # Assert that outputs are identical
+    if outputs['per-line'] != outputs['column plan']:
+        sys.stderr.write("[ERROR] Outputs of implementations differ!\n")
+        sys.exit(1)
+
+    # Report timings
+    sys.stdout.write("implementation\trows\tseconds\trows_per_second\n")
+    for label in ['per-line', 'column plan']:
+        seconds = min(timings[label])
+        sys.stdout.write("{label}\t{rows}\t{seconds:.3f}\t{rate:.0f}\n".format(label=label, rows=args.rows, seconds=seconds, rate=args.rows / seconds))
+    sys.stdout.write("speedup\t\t{speedup:.2f}\n".format(speedup=min(timings['per-line']) / min(timings['column plan'])))
+
+
+if __name__ == '__main__':
+    main()
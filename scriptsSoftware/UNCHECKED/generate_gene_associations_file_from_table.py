@@ -2,7 +2,7 @@
 __author__    = "Alexander Kanitz"
 __copyright__ = "Copyright 2016, Biozentrum, University of Basel"
 __license__   = "MIT"
-__version__   = "1.0"
+__version__   = "1.1"
 __email__     = "alexander.kanitz@alumni.ethz.ch"
 
 '''Generates a gene associations format (GAF) 2.0 or 2.1 file from a table containing (at least) object identifiers, associated GO terms, domains and evidence codes. Refer to the following link for GAF specifications: "http://www.geneontology.org/page/go-annotation-file-formats".'''
@@ -11,298 +11,759 @@ __email__     = "alexander.kanitz@alumni.ethz.ch"
 import sys
 import argparse
 import re
+import os
+import copy
+import heapq
+import shutil
+import tempfile
+import multiprocessing
+from itertools import islice
 
 # Set defaults
 header_prefix = "!gaf-version: "
-field_regex = re.compile('^\#\d+')
+field_regex = re.compile(r'^\#\d+')
 allowed_aspects = {'C': 'C', 'F': 'F', 'P': 'P', 'COMPONENT': 'C', 'FUNCTION': 'F', 'PROCESS': 'P', 'CELLULAR_COMPONENT': 'C', 'MOLECULAR_FUNCTION': 'F', 'BIOLOGICAL_PROCESS': 'P'}
-allowed_codes = ['EXP', 'IDA', 'IPI', 'IMP', 'IGI', 'IEP', 'ISS', 'ISO', 'ISA', 'ISM', 'IGC', 'IBA', 'IBD', 'IKR', 'IRD', 'RCA', 'TAS', 'NAS', 'IC', 'ND', 'IEA']
-allowed_qualifiers = ['NOT', 'contributes_to', 'colocalizes_with']
-
-# Initialize parser object
-parser = argparse.ArgumentParser(
-    description='Generates a gene associations format (GAF) 2.0 or 2.1 file from a table containing (at least) object identifiers, associated GO terms, domains and evidence codes. Refer to the following link for GAF specifications: "http://www.geneontology.org/page/go-annotation-file-formats".',
-    epilog='NOTE: Values for "--db", "--with-from", "--type" and "--assigned-by" are not validated!',
-    usage='%(prog)s [--infile PATH] [--id FIELD] [--go FIELD] [--evidence FIELD] [--aspect FIELD] [OPTIONS]',
-    add_help=False
-)
-
-# Add arguments
-parser.add_argument(
-    '--infile',
-    action='store',
-    default=None,
-    help='Input filename. If not supplied, reads from STDIN.',
-    metavar='PATH|STDIN',
-)
-parser.add_argument(
-    '--id',
-    action='store',
-    default=1,
-    type=int,
-    help='Specifiy the field of the input file that contains the ("--db"-derived) identifiers for the GO-associated objects (e.g. genes), e.g. "1" for the first column.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--go',
-    action='store',
-    default=2,
-    type=int,
-    help='Specifiy the field of the input file that contains the GO terms associated with the "--db"-derived objects, e.g. "2" for the second column.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--evidence',
-    action='store',
-    default=3,
-    type=int,
-    help='Specifiy the field of the input file that contains the evidence code for a given object:GO term pair, e.g. "3" for the third column.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--aspect',
-    action='store',
-    default=4,
-    type=int,
-    help='Specifiy the field of the input file that contains the domain/namespace/ontology of a given GO term in a object:GO pair. Must be one of "C", "F", "P", "component", "function", "process", "cellular component", "molecular function" or "biological process" (capitalization ignored, underscores allowed).',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--db',
-    action='store',
-    default='Ensembl',
-    help='Database from which the object identifiers are derived. Must be included in this reference: "http://amigo.geneontology.org/xrefs". Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, the default value is used for all pairs.',
-    metavar='DB|#FIELD'
-)
-parser.add_argument(
-    '--symbol',
-    action='store',
-    default=None,
-    type=int,
-    help='Official symbol associated with the object identifier. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the values of "--id" are reused.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--qualifier',
-    action='store',
-    default='',
-    help='Flag modifying the interpretation of an annotation. If not empty, must be one or more of "NOT", "contributes_to", "colocalizes_with", separated by a pipe. Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, the field is left empty for all pairs.',
-    metavar='QUALIFIER|#FIELD'
-)
-parser.add_argument(
-    '--reference',
-    action='store',
-    default=None,
-    type=int,
-    help='One or more unique identifiers for a single source cited as an authority for the association of object and ontology term. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, values for all pairs are derived from "--db" and "--id" like this: "<DB>:<ID>".',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--with-from',
-    action='store',
-    default=None,
-    type=int,
-    help='Additional identifier for annotations using certain evidence codes (IC, IEA, IGI, IPI, ISS). Must be one of "<DB>:<gene_symbol>", "<DB>:<gene_symbol[allele_symbol]>", "<DB>:<gene_id>", "<DB>:<protein_name>", "<DB>:<sequence_id>", "<GO>:<GO_id>", "<CHEBI>:<CHEBI_id>". Specifiy a field of the input file (e.g. "#3") that contains this information for each object:GO term pair. If not specified, the values in "--go" will be used for object:GO term pairs with evidence code "IC". In all other cases, the field will be left empty. Note that missing/wrong information in this field is a likely source of errors in downstream applications!',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--name',
-    action='store',
-    default=None,
-    type=int,
-    help='Official name/description associated with the object identifier. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--synonym',
-    action='store',
-    default=None,
-    type=int,
-    help='Synonym(s) for the object referenced by the object identifier. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--type',
-    action='store',
-    default='gene_product',
-    help='Description of the type of gene product being annotated. Must be one of "protein_complex", "protein", "transcript", "ncRNA", "rRNA", "tRNA", "snRNA", "snoRNA", any subtype of ncRNA in the Sequence Ontology, or "gene_product" (if precise product type is unknown). Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, "gene_product" is used for all pairs.',
-    metavar='TYPE|#FIELD'
-)
-parser.add_argument(
-    '--taxon',
-    action='store',
-    default='taxon:9606',
-    help='Taxon identifier of the form "taxon:<ID>". Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. By default, "taxon:9606" (Homo sapiens) is used for all pairs.',
-    metavar='TAXON_ID|#FIELD'
-)
-parser.add_argument(
-    '--date',
-    action='store',
-    default='20000101',
-    help='Date on which annotation was made/recorded. Format YYYYMMDD. Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, "20000101" is used for every pair.',
-    metavar='DATE|#FIELD'
-)
-parser.add_argument(
-    '--assigned-by',
-    dest='ass_by',
-    action='store',
-    default=None,
-    help='Database that made/recorded the annotation. Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. By default, the value/s of "--db" is/are reused.',
-    metavar='DB|#FIELD'
-)
-parser.add_argument(
-    '--annotation-extension',
-    dest='anno_ext',
-    action='store',
-    default=None,
-    type=int,
-    help='Cross references to other ontologies that can be used to qualify or enhance the annotation. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--product-id',
-    dest='prod_id',
-    action='store',
-    default=None,
-    type=int,
-    help='Allows the annotation of specific variants of the object (e.g. different gene products of a single gene). Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
-    metavar='FIELD'
-)
-parser.add_argument(
-    '--gaf-version',
-    action='store',
-    default='2.0',
-    choices=['2.0', '2.1'],
-    help='Specify the GAF version to be generated. Must be one of "2.0" or "2.1".',
-    metavar='VERSION'
-)
-parser.add_argument(
-    '--has-header',
-    action='store_true',
-    help='Specify if the input file contains a header line.'
-)
-parser.add_argument(
-    '--verbose',
-    action='store_true',
-    help='Write log messages.'
-)
-parser.add_argument(
-    '--version',
-    action='version',
-    version='%(prog)s 1.0',
-    help='Show version and exit.'
-)
-parser.add_argument(
-    '--help',
-    action='help',
-    help='Show this help message and exit.'
-)
-
-# Parse arguments
-args = parser.parse_args()
-
-# Process arguments
-if args.db        is not None and field_regex.match(args.db):
-    args.db        = int(args.db[1:])
-if args.qualifier is not None and field_regex.match(args.qualifier):
-    args.qualifier = int(args.qualifier[1:])
-if args.type      is not None and field_regex.match(args.type):
-    args.type      = int(args.type[1:])
-if args.taxon     is not None and field_regex.match(args.taxon):
-    args.taxon     = int(args.taxon[1:])
-if args.date      is not None and field_regex.match(args.date):
-    args.date      = int(args.date[1:])
-if args.ass_by    is not None and field_regex.match(args.ass_by):
-    args.ass_by    = int(args.ass_by[1:])
-   
-# Get minimal number of required fields
-ints = []
-for arg in vars(args):
-    val = getattr(args, arg)
-    if isinstance(val, int) and not isinstance(val, bool):
-        ints.append(val)
-min_fields = max(ints)
-
-# Build header
-header = "{prefix}{version}\n".format(prefix=header_prefix, version=args.gaf_version)
-
-# Open input file for reading
-import sys
-# parse command line
-if args.infile is None:
-    f = sys.stdin
-else:
-    f = open(args.infile)
-    
-# Write header
-sys.stdout.write(header)
-
-# Log status
-if args.verbose:
-    sys.stderr.write("Processing input file...\n")
-
-# Iterate over input file
-for line in f:
+allowed_codes = frozenset(['EXP', 'IDA', 'IPI', 'IMP', 'IGI', 'IEP', 'ISS', 'ISO', 'ISA', 'ISM', 'IGC', 'IBA', 'IBD', 'IKR', 'IRD', 'RCA', 'TAS', 'NAS', 'IC', 'ND', 'IEA'])
+allowed_qualifiers = frozenset(['NOT', 'contributes_to', 'colocalizes_with'])
+batch_size = 100000
+shard_size = 67108864
+dedup_memory = 10000000
+dedup_buckets = 64
+
+# GAF fields (in output order) and the CLI arguments they are read from
+gaf_fields = ['db', 'id', 'symbol', 'qualifier', 'go', 'reference', 'evidence', 'with_from', 'aspect', 'name', 'synonym', 'type', 'taxon', 'date', 'ass_by', 'anno_ext', 'prod_id']
+
+
+def parse_arguments(argv=None):
+    '''Parses and processes CLI arguments: field values prefixed by '#' are converted to field numbers.'''
+
+    # Initialize parser object
+    parser = argparse.ArgumentParser(
+        description='Generates a gene associations format (GAF) 2.0 or 2.1 file from a table containing (at least) object identifiers, associated GO terms, domains and evidence codes. Refer to the following link for GAF specifications: "http://www.geneontology.org/page/go-annotation-file-formats".',
+        epilog='NOTE: Values for "--db", "--with-from", "--type" and "--assigned-by" are not validated!',
+        usage='%(prog)s [--infile PATH] [--id FIELD] [--go FIELD] [--evidence FIELD] [--aspect FIELD] [OPTIONS]',
+        add_help=False
+    )
+
+    # Add arguments
+    parser.add_argument(
+        '--infile',
+        action='store',
+        default=None,
+        help='Input filename. If not supplied, reads from STDIN.',
+        metavar='PATH|STDIN',
+    )
+    parser.add_argument(
+        '--id',
+        action='store',
+        default=1,
+        type=int,
+        help='Specifiy the field of the input file that contains the ("--db"-derived) identifiers for the GO-associated objects (e.g. genes), e.g. "1" for the first column.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--go',
+        action='store',
+        default=2,
+        type=int,
+        help='Specifiy the field of the input file that contains the GO terms associated with the "--db"-derived objects, e.g. "2" for the second column.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--evidence',
+        action='store',
+        default=3,
+        type=int,
+        help='Specifiy the field of the input file that contains the evidence code for a given object:GO term pair, e.g. "3" for the third column.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--aspect',
+        action='store',
+        default=4,
+        type=int,
+        help='Specifiy the field of the input file that contains the domain/namespace/ontology of a given GO term in a object:GO pair. Must be one of "C", "F", "P", "component", "function", "process", "cellular component", "molecular function" or "biological process" (capitalization ignored, underscores allowed).',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--db',
+        action='store',
+        default='Ensembl',
+        help='Database from which the object identifiers are derived. Must be included in this reference: "http://amigo.geneontology.org/xrefs". Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, the default value is used for all pairs.',
+        metavar='DB|#FIELD'
+    )
+    parser.add_argument(
+        '--symbol',
+        action='store',
+        default=None,
+        type=int,
+        help='Official symbol associated with the object identifier. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the values of "--id" are reused.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--qualifier',
+        action='store',
+        default='',
+        help='Flag modifying the interpretation of an annotation. If not empty, must be one or more of "NOT", "contributes_to", "colocalizes_with", separated by a pipe. Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, the field is left empty for all pairs.',
+        metavar='QUALIFIER|#FIELD'
+    )
+    parser.add_argument(
+        '--reference',
+        action='store',
+        default=None,
+        type=int,
+        help='One or more unique identifiers for a single source cited as an authority for the association of object and ontology term. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, values for all pairs are derived from "--db" and "--id" like this: "<DB>:<ID>".',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--with-from',
+        action='store',
+        default=None,
+        type=int,
+        help='Additional identifier for annotations using certain evidence codes (IC, IEA, IGI, IPI, ISS). Must be one of "<DB>:<gene_symbol>", "<DB>:<gene_symbol[allele_symbol]>", "<DB>:<gene_id>", "<DB>:<protein_name>", "<DB>:<sequence_id>", "<GO>:<GO_id>", "<CHEBI>:<CHEBI_id>". Specifiy a field of the input file (e.g. "#3") that contains this information for each object:GO term pair. If not specified, the values in "--go" will be used for object:GO term pairs with evidence code "IC". In all other cases, the field will be left empty. Note that missing/wrong information in this field is a likely source of errors in downstream applications!',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--name',
+        action='store',
+        default=None,
+        type=int,
+        help='Official name/description associated with the object identifier. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--synonym',
+        action='store',
+        default=None,
+        type=int,
+        help='Synonym(s) for the object referenced by the object identifier. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--type',
+        action='store',
+        default='gene_product',
+        help='Description of the type of gene product being annotated. Must be one of "protein_complex", "protein", "transcript", "ncRNA", "rRNA", "tRNA", "snRNA", "snoRNA", any subtype of ncRNA in the Sequence Ontology, or "gene_product" (if precise product type is unknown). Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, "gene_product" is used for all pairs.',
+        metavar='TYPE|#FIELD'
+    )
+    parser.add_argument(
+        '--taxon',
+        action='store',
+        default='taxon:9606',
+        help='Taxon identifier of the form "taxon:<ID>". Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. By default, "taxon:9606" (Homo sapiens) is used for all pairs.',
+        metavar='TAXON_ID|#FIELD'
+    )
+    parser.add_argument(
+        '--date',
+        action='store',
+        default='20000101',
+        help='Date on which annotation was made/recorded. Format YYYYMMDD. Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. If not supplied, "20000101" is used for every pair.',
+        metavar='DATE|#FIELD'
+    )
+    parser.add_argument(
+        '--assigned-by',
+        dest='ass_by',
+        action='store',
+        default=None,
+        help='Database that made/recorded the annotation. Specifiy a field of the input file (prefixed by an exclamation mark, e.g. "#3") that contains this information for each object:GO term pair *OR* a constant value used for all pairs. By default, the value/s of "--db" is/are reused.',
+        metavar='DB|#FIELD'
+    )
+    parser.add_argument(
+        '--annotation-extension',
+        dest='anno_ext',
+        action='store',
+        default=None,
+        type=int,
+        help='Cross references to other ontologies that can be used to qualify or enhance the annotation. Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--product-id',
+        dest='prod_id',
+        action='store',
+        default=None,
+        type=int,
+        help='Allows the annotation of specific variants of the object (e.g. different gene products of a single gene). Specifiy a field of the input file (e.g. "5") that contains this information for each object:GO term pair. If not supplied, the field is left empty for all pairs.',
+        metavar='FIELD'
+    )
+    parser.add_argument(
+        '--gaf-version',
+        action='store',
+        default='2.0',
+        choices=['2.0', '2.1'],
+        help='Specify the GAF version to be generated. Must be one of "2.0" or "2.1".',
+        metavar='VERSION'
+    )
+    parser.add_argument(
+        '--has-header',
+        action='store_true',
+        help='Specify if the input file contains a header line.'
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Write log messages.'
+    )
+    parser.add_argument(
+        '--batch-size',
+        action='store',
+        default=batch_size,
+        type=int,
+        help='Number of input lines processed at once. Default: {size}.'.format(size=batch_size),
+        metavar='INT'
+    )
+
+    parser.add_argument(
+        '--batch',
+        action='append',
+        nargs=2,
+        default=None,
+        help='Input file and taxon identifier of one of several input tables that are processed in batch mode (taxon identifier as for "--taxon"; other options apply to all tables). Can be specified multiple times; the GAF records of all tables are written in the given order after a single header. Replaces "--infile" and "--taxon".',
+        metavar=('PATH', 'TAXON_ID|#FIELD')
+    )
+    parser.add_argument(
+        '--processes',
+        action='store',
+        default=1,
+        type=int,
+        help='Number of worker processes. Input files are split into shards of "--shard-size" bytes that are processed in parallel. Input from STDIN is always processed in a single process. Default: 1.',
+        metavar='INT'
+    )
+    parser.add_argument(
+        '--shard-size',
+        action='store',
+        default=shard_size,
+        type=int,
+        help='Size of input file shards processed by worker processes, in bytes. Default: {size}.'.format(size=shard_size),
+        metavar='BYTES'
+    )
+    parser.add_argument(
+        '--summarize-warnings',
+        action='store_true',
+        help='Write a summary of skipped lines per illegal value instead of a warning per line. Always set in batch mode and with more than one worker process.'
+    )
+    parser.add_argument(
+        '--outfile',
+        action='store',
+        default=None,
+        help='Output filename. If not supplied, writes to STDOUT.',
+        metavar='PATH|STDOUT'
+    )
+    parser.add_argument(
+        '--deduplicate',
+        action='store_true',
+        help='Write only the first of several records with identical values for db, object identifier, GO term, evidence code and qualifier.'
+    )
+    parser.add_argument(
+        '--dedup-memory',
+        action='store',
+        default=dedup_memory,
+        type=int,
+        help='Maximum number of records kept in memory for "--deduplicate". If more unique records are encountered, further records are spilled to temporary files in "--tmp-dir" and deduplicated per hash bucket. Default: {records}.'.format(records=dedup_memory),
+        metavar='INT'
+    )
+    parser.add_argument(
+        '--tmp-dir',
+        action='store',
+        default=None,
+        help='Directory for temporary files of "--deduplicate". If not supplied, the system default is used.',
+        metavar='PATH'
+    )
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Write index files next to "--outfile": "<outfile>.genes.tsv" (object identifier, symbol and byte offsets of records in the uncompressed output file) and "<outfile>.go_terms.tsv" (GO term and associated object identifiers).'
+    )
+    parser.add_argument(
+        '--version',
+        action='version',
+        version='%(prog)s 1.1',
+        help='Show version and exit.'
+    )
+    parser.add_argument(
+        '--help',
+        action='help',
+        help='Show this help message and exit.'
+    )
+
+    # Parse arguments
+    args = parser.parse_args(argv)
+
+    # Process arguments
+    if args.db        is not None and field_regex.match(args.db):
+        args.db        = int(args.db[1:])
+    if args.qualifier is not None and field_regex.match(args.qualifier):
+        args.qualifier = int(args.qualifier[1:])
+    if args.type      is not None and field_regex.match(args.type):
+        args.type      = int(args.type[1:])
+    if args.taxon     is not None and field_regex.match(args.taxon):
+        args.taxon     = int(args.taxon[1:])
+    if args.date      is not None and field_regex.match(args.date):
+        args.date      = int(args.date[1:])
+    if args.ass_by    is not None and field_regex.match(args.ass_by):
+        args.ass_by    = int(args.ass_by[1:])
+    if args.batch     is not None:
+        if args.infile is not None:
+            parser.error('Options "--infile" and "--batch" are mutually exclusive.')
+        args.batch     = [(path, int(taxon[1:]) if field_regex.match(taxon) else taxon) for path, taxon in args.batch]
+    if args.processes < 1 or args.shard_size < 1 or args.dedup_memory < 1:
+        parser.error('Values of "--processes", "--shard-size" and "--dedup-memory" must be positive.')
+    if args.index and args.outfile is None:
+        parser.error('Option "--index" requires "--outfile".')
+
+    # Return arguments
+    return args
+
+
+# Source of row converters: conversion loop specialized for a column plan (see 'build_column_plan')
+converter_source = '''
+def convert(lines, allowed_codes, allowed_qualifiers, allowed_aspects):
+    gaf_lines = []
+    warnings = []
+    append = gaf_lines.append
+    qualifier_lookup = {{}}
+    aspect_lookup = {{}}
+    for line in lines:
+        fields = line.strip().split("\\t")
+        if len(fields) < {min_fields}:
+            return gaf_lines, warnings, line
+        db = {db}
+        id = {id}
+        qualifier = {qualifier}
+        if qualifier:
+            if qualifier not in qualifier_lookup:
+                qualifier_lookup[qualifier] = allowed_qualifiers.issuperset(qualifier.split("|"))
+            if not qualifier_lookup[qualifier]:
+                warnings.append(("qualifier", qualifier))
+                continue
+        aspect = {aspect}
+        if aspect not in aspect_lookup:
+            aspect_lookup[aspect] = allowed_aspects.get(aspect.upper().replace(" ", "_"))
+        if aspect_lookup[aspect] is None:
+            warnings.append(("aspect", aspect))
+            continue
+        evidence = {evidence}
+        if evidence != "IC" and evidence not in allowed_codes:
+            warnings.append(("evidence", evidence))
+            continue
+        go = {go}
+        append("\\t".join(({row})) + "\\n")
+    return gaf_lines, warnings, None
+'''
+
+
+def build_column_plan(args):
+    '''Resolves once which GAF field is read from which input column and which is set to a constant value.
+
+    Returns a dictionary with the source of each GAF field (a Python expression: input field, constant or value derived from other fields), the minimal number of fields that input lines must have and a row converter compiled from these sources, so that no field source needs to be resolved per line.'''
+
+    # Get field sources
+    sources = {}
+    indices = []
+    for field in gaf_fields:
+        value = getattr(args, field)
+        if isinstance(value, int) and not isinstance(value, bool):
+            sources[field] = "fields[{index}]".format(index=value - 1)
+            indices.append(value - 1)
+        elif value is None:
+            sources[field] = None
+        else:
+            sources[field] = repr(value)
+
+    # Set derived and default values
+    sources['symbol'] = "id" if sources['symbol'] is None else "{symbol} or id".format(symbol=sources['symbol'])
+    sources['reference'] = 'db + ":" + id' if sources['reference'] is None else sources['reference']
+    sources['with_from'] = 'go if evidence == "IC" else {with_from}'.format(with_from='""' if sources['with_from'] is None else sources['with_from'])
+    sources['ass_by'] = "db" if sources['ass_by'] is None else sources['ass_by']
+    for field in ['name', 'synonym', 'anno_ext', 'prod_id']:
+        if sources[field] is None:
+            sources[field] = '""'
+
+    # Build output row from fields that are validated before
+    row = []
+    for field in gaf_fields:
+        if field in ['db', 'id', 'qualifier', 'go', 'evidence']:
+            row.append(field)
+        elif field == 'aspect':
+            row.append("aspect_lookup[aspect]")
+        else:
+            row.append(sources[field])
+
+    # Compile row converter
+    min_fields = max(indices) + 1
+    source = converter_source.format(min_fields=min_fields, db=sources['db'], id=sources['id'], qualifier=sources['qualifier'], aspect=sources['aspect'], evidence=sources['evidence'], go=sources['go'], row=", ".join(row))
+    namespace = {}
+    exec(compile(source, "<column plan>", "exec"), namespace)
+
+    # Return plan
+    return {
+        'sources': sources,
+        'min_fields': min_fields,
+        'convert': namespace['convert'],
+    }
+
+
+def convert_lines(lines, plan):
+    '''Converts input lines to GAF lines according to a column plan.
+
+    Returns the GAF lines, a list of (field, value) tuples for lines that were skipped because of illegal values and the first line that does not have enough fields (None if all lines were processed).'''
+    return plan['convert'](lines, allowed_codes, allowed_qualifiers, allowed_aspects)
+
+
+def convert_stream(f, plan, args, write, warning_counts=None):
+    '''Converts lines of an open input file in batches and passes GAF lines to function 'write'; returns the first line that does not have enough fields (None if all lines were processed).
+
+    Warnings are counted in dictionary 'warning_counts' if supplied, otherwise written per line.'''
 
     # Skip header
     if args.has_header:
-        args.has_header = False
-        continue
+        next(f, None)
 
-    # Split line into fields
-    fields = line.strip().split("\t")
+    # Iterate over batches of input lines
+    while True:
+        lines = list(islice(f, args.batch_size))
+        if not lines:
+            return None
+
+        # Convert lines & write output
+        gaf_lines, warnings, error_line = convert_lines(lines, plan)
+        write(gaf_lines)
+        if warning_counts is None:
+            for field, value in warnings:
+                sys.stderr.write("[WARNING] Illegal value in field '{field}': {value}\n".format(field=field, value=value))
+        else:
+            count_warnings(warnings, warning_counts)
+
+        # Stop if a line does not have enough fields
+        if error_line is not None:
+            return error_line
+
+
+def count_warnings(warnings, warning_counts):
+    '''Adds (field, value) tuples of illegal values to a dictionary of counts.'''
+    for warning in warnings:
+        warning_counts[warning] = warning_counts.get(warning, 0) + 1
+
+
+def get_shards(path, size):
+    '''Returns (start, end) byte ranges of a file; each shard contains the lines starting within its range.'''
+    file_size = os.path.getsize(path)
+    return [(start, min(start + size, file_size)) for start in range(0, file_size, size)]
+
+
+def read_shard(path, start, end, skip_header):
+    '''Returns the lines of a file that start within a byte range.'''
+    lines = []
+    with open(path, 'rb') as handle:
+
+        # Move to first line starting within range
+        if start > 0:
+            handle.seek(start - 1)
+            position = start - 1 + len(handle.readline())
+        elif skip_header:
+            position = len(handle.readline())
+        else:
+            position = 0
+
+        # Read lines
+        while position < end:
+            line = handle.readline()
+            if not line:
+                break
+            position += len(line)
+            lines.append(line)
+
+    # Return lines (decoded in Python 3)
+    if not isinstance(b"", str):
+        lines = [line.decode('utf-8') for line in lines]
+    return lines
+
+
+# Column plans of worker processes, by taxon identifier
+plans = {}
+
+
+def convert_shard(task):
+    '''Worker: converts the lines of a file shard; returns GAF records (as single string), counts of illegal values and the first line that does not have enough fields.'''
+    args, path, start, end = task
+    if args.taxon not in plans:
+        plans[args.taxon] = build_column_plan(args)
+    gaf_lines, warnings, error_line = convert_lines(read_shard(path, start, end, args.has_header), plans[args.taxon])
+    warning_counts = {}
+    count_warnings(warnings, warning_counts)
+    return "".join(gaf_lines), warning_counts, error_line
+
+
+def write_warning_summary(warning_counts):
+    '''Writes the number of lines skipped per illegal value, most frequent first.'''
+    for (field, value), count in sorted(warning_counts.items(), key=lambda item: (-item[1], item[0])):
+        sys.stderr.write("[WARNING] Illegal value in field '{field}': {value} ({count} lines skipped)\n".format(field=field, value=value, count=count))
+    if warning_counts:
+        sys.stderr.write("[WARNING] {count} lines skipped in total.\n".format(count=sum(warning_counts.values())))
+
+
+def get_record_key(line):
+    '''Returns the values of db, object identifier, GO term, evidence code and qualifier of a GAF record.'''
+    fields = line.split("\t", 7)
+    return "\t".join((fields[0], fields[1], fields[4], fields[6], fields[3]))
+
+
+def new_deduplicator(max_records, tmp_dir=None, buckets=dedup_buckets):
+    '''Returns the state of a deduplication of GAF records.
+
+    Keys of unique records are kept in memory up to 'max_records'. Beyond that, the keys are spilled to hash bucket files (as markers of records that were already written) and all further records are appended to the bucket files together with their sequence number.'''
+    return {'seen': set(), 'max_records': max_records, 'tmp_dir': tmp_dir, 'buckets': buckets, 'directory': None, 'handles': None, 'sequence': 0, 'duplicates': 0}
 
-    # Assert that line has enough fields
-    if len(fields) < min_fields:
-        sys.stderr.write("[ERROR] The following line does not have enough fields:\n{value}".format(value=line))
-        sys.exit(1)
 
-    # Set field values
-    db        = fields[args.db        - 1] if isinstance(args.db,        int) else args.db
-    id        = fields[args.id        - 1]
-    symbol    = fields[args.symbol    - 1] if isinstance(args.symbol,    int) else id
-    qualifier = fields[args.qualifier - 1] if isinstance(args.qualifier, int) else args.qualifier
-    go        = fields[args.go        - 1]
-    reference = fields[args.reference - 1] if isinstance(args.reference, int) else "{db}:{id}".format(db=db, id=id)
-    evidence  = fields[args.evidence  - 1]
-    with_from = fields[args.with_from - 1] if isinstance(args.with_from, int) else ""
-    aspect    = fields[args.aspect    - 1]
-    name      = fields[args.name      - 1] if isinstance(args.name,      int) else ""
-    synonym   = fields[args.synonym   - 1] if isinstance(args.synonym,   int) else ""
-    type      = fields[args.type      - 1] if isinstance(args.type,      int) else args.type
-    taxon     = fields[args.taxon     - 1] if isinstance(args.taxon,     int) else args.taxon
-    date      = fields[args.date      - 1] if isinstance(args.date,      int) else args.date
-    ass_by    = fields[args.ass_by    - 1] if isinstance(args.ass_by,    int) else db
-    anno_ext  = fields[args.anno_ext  - 1] if isinstance(args.anno_ext,  int) else ""
-    prod_id   = fields[args.prod_id   - 1] if isinstance(args.prod_id,   int) else ""
-
-    # Validate field values & handle exceptions
-    if qualifier and not set(qualifier.split("|")).issubset(set(allowed_qualifiers)):
-        sys.stderr.write("[WARNING] Illegal value in field 'qualifier': {value}\n".format(value=qualifier))
-        continue
-    aspect_proc = aspect.upper().replace(" ", "_")
-    if aspect_proc in allowed_aspects:
-        aspect = allowed_aspects[aspect_proc]
+def spill_records(dedup):
+    '''Writes the keys of records kept in memory to hash bucket files.'''
+    dedup['directory'] = tempfile.mkdtemp(prefix='gaf_dedup_', dir=dedup['tmp_dir'])
+    dedup['handles'] = [open(os.path.join(dedup['directory'], str(bucket)), 'w') for bucket in range(dedup['buckets'])]
+    for key in dedup['seen']:
+        dedup['handles'][hash(key) % dedup['buckets']].write("M\t" + key + "\n")
+    dedup['seen'] = set()
+
+
+def deduplicate_lines(lines, dedup):
+    '''Returns the GAF lines that can be written now: new records while keys are kept in memory, none after spilling.'''
+
+    # Append records to bucket files after spilling
+    if dedup['handles'] is not None:
+        handles = dedup['handles']
+        buckets = dedup['buckets']
+        sequence = dedup['sequence']
+        for line in lines:
+            handles[hash(get_record_key(line)) % buckets].write("{sequence}\t{line}".format(sequence=sequence, line=line))
+            sequence += 1
+        dedup['sequence'] = sequence
+        return []
+
+    # Filter records in memory
+    seen = dedup['seen']
+    unique_lines = []
+    for line in lines:
+        key = get_record_key(line)
+        if key in seen:
+            dedup['duplicates'] += 1
+            continue
+        seen.add(key)
+        unique_lines.append(line)
+
+    # Spill keys if memory limit is exceeded
+    if len(seen) > dedup['max_records']:
+        spill_records(dedup)
+
+    # Return new records
+    return unique_lines
+
+
+def read_bucket(path, dedup):
+    '''Yields the (sequence number, line) tuples of the first occurrences of records in a bucket file that were not written before spilling, ordered by sequence number.'''
+
+    # Filter records of bucket
+    seen = set()
+    records = []
+    with open(path) as handle:
+        for entry in handle:
+            if entry.startswith("M\t"):
+                seen.add(entry[2:-1])
+                continue
+            sequence, line = entry.split("\t", 1)
+            key = get_record_key(line)
+            if key in seen:
+                dedup['duplicates'] += 1
+                continue
+            seen.add(key)
+            records.append((int(sequence), line))
+    seen = None
+
+    # Write filtered records ordered by sequence number
+    records.sort()
+    with open(path, 'w') as handle:
+        handle.writelines(["{sequence}\t{line}".format(sequence=sequence, line=line) for sequence, line in records])
+    records = None
+
+    # Yield records
+    with open(path) as handle:
+        for entry in handle:
+            sequence, line = entry.split("\t", 1)
+            yield int(sequence), line
+
+
+def finish_deduplication(dedup, write, batch_size=batch_size):
+    '''Passes the records of bucket files to function 'write' in their original order (if records were spilled).'''
+    if dedup['handles'] is None:
+        return
+    try:
+
+        # Close bucket files
+        for handle in dedup['handles']:
+            handle.close()
+
+        # Filter buckets one at a time & merge records by sequence number
+        buckets = []
+        for bucket in range(dedup['buckets']):
+            buckets.append(read_bucket(os.path.join(dedup['directory'], str(bucket)), dedup))
+        lines = []
+        for sequence, line in heapq.merge(*buckets):
+            lines.append(line)
+            if len(lines) >= batch_size:
+                write(lines)
+                lines = []
+        write(lines)
+
+    # Remove bucket files
+    finally:
+        shutil.rmtree(dedup['directory'])
+
+
+def new_index(offset):
+    '''Returns the state of a side index of GAF records; 'offset' is the byte offset of the first record.'''
+    return {'offset': offset, 'genes': {}, 'go_terms': {}}
+
+
+def index_lines(lines, index):
+    '''Adds the byte offsets, object identifiers, symbols and GO terms of GAF lines to a side index.'''
+    offset = index['offset']
+    genes = index['genes']
+    go_terms = index['go_terms']
+    encode = not isinstance(b"", str)
+    for line in lines:
+        fields = line.split("\t", 5)
+        if fields[1] not in genes:
+            genes[fields[1]] = (fields[2], [])
+        genes[fields[1]][1].append(offset)
+        go_terms.setdefault(fields[4], set()).add(fields[1])
+        offset += len(line.encode('utf-8')) if encode else len(line)
+    index['offset'] = offset
+
+
+def write_index(index, outfile):
+    '''Writes side index files: object identifiers with symbols and byte offsets of records, and GO terms with object identifiers.'''
+    with open(outfile + ".genes.tsv", 'w') as handle:
+        for gene in sorted(index['genes']):
+            symbol, offsets = index['genes'][gene]
+            handle.write("{gene}\t{symbol}\t{offsets}\n".format(gene=gene, symbol=symbol, offsets=",".join([str(offset) for offset in offsets])))
+    with open(outfile + ".go_terms.tsv", 'w') as handle:
+        for go_term in sorted(index['go_terms']):
+            handle.write("{go_term}\t{genes}\n".format(go_term=go_term, genes=",".join(sorted(index['go_terms'][go_term]))))
+
+
+def main(argv=None):
+
+    # Parse arguments
+    args = parse_arguments(argv)
+
+    # Get input files and taxon identifiers
+    if args.batch is None:
+        inputs = [(args.infile, args.taxon)]
+    else:
+        inputs = args.batch
+    warning_counts = None
+    if args.summarize_warnings or args.batch is not None or args.processes > 1:
+        warning_counts = {}
+
+    # Build header
+    header = "{prefix}{version}\n".format(prefix=header_prefix, version=args.gaf_version)
+
+    # Open output file for writing
+    if args.outfile is None:
+        out = sys.stdout
+    else:
+        out = open(args.outfile, 'w')
+
+    # Write header
+    out.write(header)
+
+    # Set up deduplication & index
+    dedup = new_deduplicator(args.dedup_memory, args.tmp_dir) if args.deduplicate else None
+    index = new_index(len(header)) if args.index else None
+
+    # Define output functions (records are deduplicated before they are indexed and written)
+    def write_lines(lines):
+        if index is not None:
+            index_lines(lines, index)
+        out.write("".join(lines))
+
+    def write(lines):
+        if dedup is not None:
+            lines = deduplicate_lines(lines, dedup)
+        write_lines(lines)
+
+    # Process shards of input files in worker processes
+    error_line = None
+    if args.processes > 1 and all([path is not None for path, taxon in inputs]):
+        tasks = []
+        for path, taxon in inputs:
+            input_args = copy.copy(args)
+            input_args.taxon = taxon
+            tasks.extend([(input_args, path, start, end) for start, end in get_shards(path, args.shard_size)])
+        if args.verbose:
+            sys.stderr.write("Processing {files} input file(s) in {shards} shard(s)...\n".format(files=len(inputs), shards=len(tasks)))
+        pool = multiprocessing.Pool(args.processes)
+        for gaf_text, shard_warning_counts, error_line in pool.imap(convert_shard, tasks):
+            write(gaf_text.splitlines(True))
+            for warning, count in shard_warning_counts.items():
+                warning_counts[warning] = warning_counts.get(warning, 0) + count
+            if error_line is not None:
+                pool.terminate()
+                break
+        else:
+            pool.close()
+        pool.join()
+
+    # Process input files one after another
     else:
-        sys.stderr.write("[WARNING] Illegal value in field 'aspect': {value}\n".format(value=aspect))
-        continue
-    if evidence == "IC":
-        with_from = go
-    elif evidence not in allowed_codes:
-        sys.stderr.write("[WARNING] Illegal value in field 'evidence': {value}\n".format(value=evidence))
-        continue
-    if not symbol:
-        symbol = id
-
-    # Assemble output line
-    line = "\t".join([db, id, symbol, qualifier, go, reference, evidence, with_from, aspect, name, synonym, type, taxon, date, ass_by, anno_ext, prod_id])
-
-    # Write line
-    sys.stdout.write(line + "\n")
-
-# Log status
-if args.verbose:
-    sys.stderr.write("Done.\n")
-
-# Return zero exit code
-sys.exit(0)
+        for path, taxon in inputs:
+
+            # Resolve field sources
+            input_args = copy.copy(args)
+            input_args.taxon = taxon
+            plan = build_column_plan(input_args)
+
+            # Open input file for reading
+            if path is None:
+                f = sys.stdin
+            else:
+                f = open(path)
+
+            # Log status
+            if args.verbose:
+                sys.stderr.write("Processing input file...\n" if args.batch is None else "Processing input file '{path}'...\n".format(path=path))
+
+            # Convert lines
+            error_line = convert_stream(f, plan, input_args, write, warning_counts)
+            if error_line is not None:
+                break
+
+    # Write remaining records
+    if dedup is not None:
+        finish_deduplication(dedup, write_lines, args.batch_size)
+        if args.verbose:
+            sys.stderr.write("Skipped {count} duplicate records.\n".format(count=dedup['duplicates']))
+    if out is not sys.stdout:
+        out.close()
+
+    # Write index
+    if index is not None:
+        write_index(index, args.outfile)
+
+    # Summarize warnings
+    if warning_counts is not None:
+        write_warning_summary(warning_counts)
+
+    # Abort if a line does not have enough fields
+    if error_line is not None:
+        sys.stderr.write("[ERROR] The following line does not have enough fields:\n{value}".format(value=error_line))
+        sys.exit(1)
+
+    # Log status
+    if args.verbose:
+        sys.stderr.write("Done.\n")
+
+    # Return zero exit code
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
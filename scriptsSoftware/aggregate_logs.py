@@ -0,0 +1,650 @@
+#!/usr/bin/env python
+
+"""Writes a table listing the self-reported statistics of multiple tool runs.
+
+One row is written per log file. Log files are parsed concurrently by a pool of worker processes
+and rows are written to STDOUT as soon as they are available. Supported log formats:
+- 'star':     STAR alignment statistics ('Log.final.out')
+- 'cutadapt': cutadapt reports
+- 'kallisto': kallisto run information ('run_info.json')
+- 'suppa':    SUPPA PSI tables (SUPPA does not write a statistics report; the number of samples and
+              events is summarized instead)
+
+Log files are either searched in a directory ('--input-dir'; all files ending in '--suffix') or
+read from a file listing one path per line ('--files-from'; '-' for STDIN). The row identifier is
+the basename of the log file minus '--prefix' and '--suffix'.
+
+The header is the union of the keys of all log files (in order of first appearance); missing
+values are written as 'NA'. Values are written exactly as reported by the tools and are also
+stored in typed columns (integers, decimals, percentages or text), which can be written in Feather
+format for fast loading in R or Python ('--feather'; requires the Python module 'pyarrow'). With '--stream', rows are written as soon as they are
+available instead, with the header taken from the first log file.
+
+With '--output', an existing output table is updated instead: a sidecar index ('<output>.index')
+records path, size, modification time and content hash of each ingested log file, so that only
+new and changed files are parsed. Rows of files that disappeared are removed, and rows are always
+written in input order. Output table and index are replaced atomically.
+"""
+
+__author__ = "Alexander Kanitz"
+__copyright__ = "Copyright 2016, Biozentrum, University of Basel"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Alexander Kanitz"
+__email__ = "alexander.kanitz@alumni.ethz.ch"
+
+# Import packages
+import os
+import sys
+import glob
+import re
+import json
+import hashlib
+import argparse
+import multiprocessing
+from collections import OrderedDict
+
+
+#####################
+###  LOG PARSERS  ###
+#####################
+
+# Each parser takes the path to a log file and returns a list of (key, value) tuples
+
+def parse_star_log(path):
+    """Parses 'key | value' lines of STAR's 'Log.final.out'."""
+
+    # Initialize records list
+    records = list()
+
+    # Iterate over lines
+    with open(path) as handle:
+        for line in handle:
+            # Split lines by separator
+            line_list = line.split("|")
+            # If line contains key and value, add to records
+            if len(line_list) == 2:
+                records.append((line_list[0].strip(), line_list[1].strip()))
+
+    # Return records
+    return records
+
+
+# Value types of cutadapt report lines
+COUNT = "count"
+TEXT = "text"
+
+# Summary lines of cutadapt reports: prefix (text before first colon) -> (records, per-mate key)
+# Records are (key, value) tuples, where value is a constant or a value type; per-mate keys are
+# set for totals that are followed by 'Read 1:' and 'Read 2:' lines in paired-end reports
+CUTADAPT_PREFIXES = {
+    "Command line parameters": ([("Command", TEXT)], None),
+    "Total reads processed": ([("Library type", "SINGLE"), ("Read/read pairs processed", COUNT)], None),
+    "Total read pairs processed": ([("Library type", "PAIRED"), ("Read/read pairs processed", COUNT)], None),
+    "Reads with adapters": ([("Reads/mates 1 with adapters", COUNT), ("Mates 2 with adapters", "NA")], None),
+    "Read 1 with adapter": ([("Reads/mates 1 with adapters", COUNT)], None),
+    "Read 2 with adapter": ([("Mates 2 with adapters", COUNT)], None),
+    "Reads that were too short": ([("Too short reads/pairs", COUNT)], None),
+    "Pairs that were too short": ([("Too short reads/pairs", COUNT)], None),
+    "Reads with too many N": ([("Reads/pairs with too many Ns", COUNT)], None),
+    "Pairs with too many N": ([("Reads/pairs with too many Ns", COUNT)], None),
+    "Reads written (passing filters)": ([("Reads/pairs that passed filters", COUNT)], None),
+    "Pairs written (passing filters)": ([("Reads/pairs that passed filters", COUNT)], None),
+    "Total basepairs processed": ([("Bases processed", COUNT)], "bases processed"),
+    "Total written (filtered)": ([("Bases written", COUNT)], "bases written"),
+}
+
+# Parser states
+SUMMARY = 0
+MATE_1 = 1
+MATE_2 = 2
+
+
+def parse_cutadapt_value(value, value_type):
+    """Returns the value of a cutadapt report line (text after the first colon) as string."""
+    if value_type == COUNT:
+        return value.strip().split(" ")[0].replace(",", "")
+    if value_type == TEXT:
+        return value.strip()
+    return value_type
+
+
+def parse_cutadapt_log(path):
+    """Parses the summary section of a cutadapt report.
+
+    The report is read once as a stream: each line is dispatched on its prefix (text before the
+    first colon) in 'CUTADAPT_PREFIXES'. Totals of paired-end reports are followed by per-mate
+    values, for which the parser switches state; missing per-mate values are set to 'NA'. Reading
+    stops at the first adapter section, so trimmed length histograms are not read at all.
+    """
+
+    # Initialize records list and state
+    records = list()
+    state = SUMMARY
+    mate_key = None
+
+    # Iterate over lines
+    with open(path) as handle:
+        for line in handle:
+
+            # Stop at adapter sections ('=== Adapter 1 ===', '=== First read: Adapter 1 ===')
+            if line.startswith("===") and "Adapter" in line:
+                break
+
+            # Split line into prefix and value
+            prefix, colon, value = line.partition(":")
+            prefix = prefix.strip()
+
+            # Expect per-mate values
+            if state == MATE_1:
+                if prefix == "Read 1":
+                    records.append(("Mate 1 {}".format(mate_key), parse_cutadapt_value(value, COUNT)))
+                    state = MATE_2
+                    continue
+                records.append(("Mate 1 {}".format(mate_key), "NA"))
+                records.append(("Mate 2 {}".format(mate_key), "NA"))
+                state = SUMMARY
+            elif state == MATE_2:
+                records.append(("Mate 2 {}".format(mate_key), parse_cutadapt_value(value, COUNT) if prefix == "Read 2" else "NA"))
+                state = SUMMARY
+                if prefix == "Read 2":
+                    continue
+
+            # Skip lines without known prefix
+            if not colon or prefix not in CUTADAPT_PREFIXES:
+                continue
+
+            # Add records
+            fields, mate_key = CUTADAPT_PREFIXES[prefix]
+            for key, value_type in fields:
+                records.append((key, parse_cutadapt_value(value, value_type)))
+            if mate_key is not None:
+                state = MATE_1
+
+    # Add missing per-mate values if report ended after a total
+    if state == MATE_1:
+        records.append(("Mate 1 {}".format(mate_key), "NA"))
+    if state in (MATE_1, MATE_2):
+        records.append(("Mate 2 {}".format(mate_key), "NA"))
+
+    # Return records
+    return records
+
+
+def parse_kallisto_log(path):
+    """Parses kallisto's 'run_info.json'."""
+
+    # Load JSON object (keeping order of keys)
+    with open(path) as handle:
+        run_info = json.load(handle, object_pairs_hook=OrderedDict)
+
+    # Return records
+    return [(key, str(value)) for key, value in run_info.items()]
+
+
+def parse_suppa_log(path):
+    """Summarizes a SUPPA PSI table (header with sample names, one row per event)."""
+
+    # Initialize counters
+    samples = 0
+    events = 0
+    events_missing = 0
+
+    # Iterate over lines
+    with open(path) as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            # Header line holds sample names only
+            if not samples:
+                samples = len(fields)
+                continue
+            events += 1
+            if "nan" in fields or "NA" in fields:
+                events_missing += 1
+
+    # Return records
+    return [
+        ("Samples", str(samples)),
+        ("Events", str(events)),
+        ("Events with missing values", str(events_missing)),
+        ("Events quantified in all samples", str(events - events_missing)),
+    ]
+
+
+# Register parsers
+PARSERS = OrderedDict([
+    ("star", parse_star_log),
+    ("cutadapt", parse_cutadapt_log),
+    ("kallisto", parse_kallisto_log),
+    ("suppa", parse_suppa_log),
+])
+
+
+###################
+###  FUNCTIONS  ###
+###################
+
+def get_identifier(path, prefix, suffix):
+    """Returns the basename of a log file minus prefix and suffix."""
+    identifier = os.path.basename(path)
+    if prefix and identifier.startswith(prefix):
+        identifier = identifier[len(prefix):]
+    if suffix and identifier.endswith(suffix):
+        identifier = identifier[:-len(suffix)]
+    return identifier
+
+
+def hash_file(path, block_size=1048576):
+    """Returns the SHA1 hex digest of a file's content."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_log_file(task):
+    """Worker: parses a single log file; returns path, identifier, records, error message and hash.
+
+    The last element of a task is the known content hash of the file: if None, the file is not
+    hashed; otherwise, the file is hashed and only parsed if its hash differs (records are None
+    for unchanged files).
+    """
+    log_format, path, prefix, suffix, known_hash = task
+    identifier = get_identifier(path, prefix, suffix)
+    digest = None
+    try:
+        if known_hash is not None:
+            digest = hash_file(path)
+            if digest == known_hash:
+                return path, identifier, None, None, digest
+        records = PARSERS[log_format](path)
+    except (IOError, OSError, ValueError) as error:
+        return path, identifier, None, str(error), digest
+    return path, identifier, records, None, digest
+
+
+def parse_log_files(tasks, processes=1, unordered=False, chunksize=4):
+    """Yields the results of 'parse_log_file' for tasks; dies if a file could not be parsed."""
+
+    # Parse files in worker processes (or in this process)
+    pool = None
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        if unordered:
+            results = pool.imap_unordered(parse_log_file, tasks, chunksize)
+        else:
+            results = pool.imap(parse_log_file, tasks, chunksize)
+    else:
+        results = (parse_log_file(task) for task in tasks)
+
+    # Yield results as they become available
+    try:
+        for result in results:
+
+            # Die if file could not be parsed
+            if result[3] is not None:
+                sys.stderr.write("[ERROR] Could not parse file '{0}': {1}\n[ERROR] Execution aborted.\n".format(result[0], result[3]))
+                if pool is not None:
+                    pool.terminate()
+                sys.exit(1)
+
+            # Write log
+            if result[2] is not None:
+                sys.stderr.write("Processing file '{}'...\n".format(os.path.basename(result[0])))
+            yield result
+
+    # Shut down worker processes
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def find_log_files(indir, suffix):
+    """Returns the sorted paths of log files in a directory."""
+    return sorted(glob.glob("{0}/*{1}".format(indir, suffix)))
+
+
+def read_log_files(handle):
+    """Yields paths from a file listing one path per line."""
+    for line in handle:
+        path = line.strip()
+        if path:
+            yield path
+
+
+def aggregate(tasks, processes=1, unordered=False, out=sys.stdout, stream=False, feather=None):
+    """Parses log files and writes one row per file to 'out'; returns the number of rows.
+
+    By default, rows are collected in a columnar table that is written once all files are parsed,
+    so that the header is the union of the keys of all files. With 'stream', rows are written as
+    soon as they are available instead, and the header is taken from the first file.
+    """
+
+    # Collect rows in columnar table
+    if not stream:
+        table = new_table()
+        for path, identifier, records, error, digest in parse_log_files(tasks, processes, unordered):
+            add_row(table, identifier, records)
+        out.writelines(format_table(table))
+        if feather is not None:
+            write_feather(table, feather)
+        return len(table["identifiers"])
+
+    # Write rows as they become available
+    rows = 0
+    header = list()
+    for path, identifier, records, error, digest in parse_log_files(tasks, processes, unordered):
+
+        # Write header (keys of first file)
+        if not rows:
+            header = [key for key, value in records]
+            out.write("\t".join(["Identifier"] + header) + "\n")
+
+        # Write row (missing values as 'NA')
+        values = dict(records)
+        unknown = [key for key, value in records if key not in header]
+        if unknown:
+            sys.stderr.write("[WARNING] Dropping values of file '{0}' for keys missing in the header: {1}\n".format(path, ", ".join(unknown)))
+        out.write("\t".join([identifier] + [values.get(key, "NA") for key in header]) + "\n")
+        rows += 1
+
+    # Return number of rows
+    return rows
+
+
+########################
+###  COLUMNAR TABLE  ###
+########################
+
+# Patterns of typed values; other values are kept as text
+VALUE_TYPES = [
+    ("INTEGER", re.compile(r"^-?\d+$")),
+    ("REAL", re.compile(r"^-?\d+\.\d+$")),
+    ("PERCENT", re.compile(r"^-?\d+(\.\d+)?%$")),
+]
+
+# Missing values
+MISSING = ["NA", ""]
+
+
+def parse_value(text):
+    """Returns type and typed value of a value (None if missing)."""
+    if text in MISSING:
+        return None, None
+    for value_type, pattern in VALUE_TYPES:
+        if pattern.match(text):
+            number = text.rstrip("%")
+            if value_type == "INTEGER":
+                return value_type, int(number)
+            return value_type, float(number)
+    return "TEXT", text
+
+
+def new_table():
+    """Returns an empty columnar table.
+
+    Columns are lists of typed values (None if missing), indexed by key in order of first
+    appearance; each column has a type ('INTEGER', 'REAL', 'PERCENT' or 'TEXT', None while all
+    values are missing). The original values are kept alongside ('texts'), so that values are
+    written to TSV exactly as reported by the tools.
+    """
+    return {"identifiers": list(), "columns": OrderedDict(), "texts": OrderedDict(), "types": dict()}
+
+
+def set_column_type(table, key, value_type):
+    """Sets the type of a column, converting its values if types are incompatible."""
+    current = table["types"].get(key)
+    if current == value_type or value_type is None:
+        return
+    if current is None:
+        table["types"][key] = value_type
+    elif set([current, value_type]) == set(["INTEGER", "REAL"]):
+        table["types"][key] = "REAL"
+    elif current != "TEXT":
+        table["columns"][key] = list(table["texts"][key])
+        table["types"][key] = "TEXT"
+
+
+def add_row(table, identifier, records):
+    """Adds a row of (key, value) tuples to a columnar table; missing keys are set to None."""
+    rows = len(table["identifiers"])
+    for key, text in records:
+
+        # Add column for new key
+        column = table["columns"].get(key)
+        if column is None:
+            column = table["columns"][key] = [None] * rows
+            table["texts"][key] = [None] * rows
+            table["types"][key] = None
+
+        # Skip duplicate keys
+        if len(column) > rows:
+            continue
+
+        # Add typed and original value
+        value_type, value = parse_value(text)
+        set_column_type(table, key, value_type)
+        if table["types"][key] == "TEXT" and value_type not in ("TEXT", None):
+            value = text
+        table["columns"][key].append(value)
+        table["texts"][key].append(None if value_type is None else text)
+
+    # Add missing values
+    for key, column in table["columns"].items():
+        if len(column) == rows:
+            column.append(None)
+            table["texts"][key].append(None)
+    table["identifiers"].append(identifier)
+
+
+def format_table(table):
+    """Yields the lines of a columnar table in TSV format (original values; 'NA' if missing)."""
+    keys = list(table["columns"])
+    yield "\t".join(["Identifier"] + keys) + "\n"
+    for row, identifier in enumerate(table["identifiers"]):
+        yield "\t".join([identifier] + ["NA" if table["texts"][key][row] is None else table["texts"][key][row] for key in keys]) + "\n"
+
+
+def write_feather(table, filename):
+    """Writes a columnar table in Feather format (requires the Python module 'pyarrow')."""
+
+    # Import pyarrow modules
+    import pyarrow
+    import pyarrow.feather
+
+    # Build table
+    types = {None: pyarrow.string(), "TEXT": pyarrow.string(), "INTEGER": pyarrow.int64(), "REAL": pyarrow.float64(), "PERCENT": pyarrow.float64()}
+    names = ["Identifier"] + list(table["columns"])
+    arrays = [pyarrow.array(table["identifiers"], type=pyarrow.string())]
+    for key, column in table["columns"].items():
+        arrays.append(pyarrow.array(column, type=types[table["types"][key]]))
+
+    # Write table
+    tmp = "{0}.tmp.{1}".format(filename, os.getpid())
+    pyarrow.feather.write_feather(pyarrow.Table.from_arrays(arrays, names=names), tmp)
+    os.rename(tmp, filename)
+
+
+##########################
+###  INCREMENTAL MODE  ###
+##########################
+
+# Fields of sidecar index files
+INDEX_FIELDS = ["path", "size", "mtime", "sha1", "identifier"]
+
+
+def read_index(filename):
+    """Returns the entries of a sidecar index file as dictionary of paths and field dictionaries."""
+    index = OrderedDict()
+    if not os.path.isfile(filename):
+        return index
+    with open(filename) as handle:
+        header = handle.readline().rstrip("\n").split("\t")
+        if header != INDEX_FIELDS:
+            sys.stderr.write("[WARNING] Ignoring index file '{}' with unknown format.\n".format(filename))
+            return index
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) == len(INDEX_FIELDS):
+                index[fields[0]] = dict(zip(INDEX_FIELDS, fields))
+    return index
+
+
+def read_table(filename):
+    """Returns the header and a dictionary of identifiers and values of a previous output table."""
+    header = list()
+    rows = dict()
+    if not os.path.isfile(filename):
+        return header, rows
+    with open(filename) as handle:
+        header = handle.readline().rstrip("\n").split("\t")
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            rows[fields[0]] = fields[1:]
+    return header, rows
+
+
+def write_atomically(filename, lines):
+    """Writes lines to a temporary file that then replaces 'filename'."""
+    tmp = "{0}.tmp.{1}".format(filename, os.getpid())
+    with open(tmp, "w") as handle:
+        handle.writelines(lines)
+    os.rename(tmp, filename)
+
+
+def aggregate_incremental(log_format, paths, prefix, suffix, output, index_file, processes=1, checksum=False, feather=None):
+    """Updates the output table with the rows of new and changed log files; returns counts.
+
+    Log files are looked up by absolute path in the sidecar index. Files with unchanged size and
+    modification time (and, if 'checksum' is set, content hash) are not parsed again; their rows
+    are copied from the previous output table. Rows of files that are no longer among the input
+    files are removed. Rows are written in the order of the input files.
+    """
+
+    # Load index and previous output
+    index = read_index(index_file)
+    header, rows = read_table(output)
+
+    # Get status of log files
+    entries = list()
+    tasks = list()
+    reused = 0
+    for path in paths:
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError as error:
+            sys.stderr.write("[ERROR] Could not access file '{0}': {1}\n[ERROR] Execution aborted.\n".format(path, error))
+            sys.exit(1)
+        entry = {"path": path, "size": str(stat.st_size), "mtime": repr(stat.st_mtime), "sha1": None, "identifier": get_identifier(path, prefix, suffix)}
+        entries.append(entry)
+
+        # Check whether row can be reused
+        previous = index.get(path)
+        if previous is not None and previous["identifier"] == entry["identifier"] and entry["identifier"] in rows:
+            if not checksum and previous["size"] == entry["size"] and previous["mtime"] == entry["mtime"]:
+                entry["sha1"] = previous["sha1"]
+                reused += 1
+                continue
+            tasks.append((log_format, path, prefix, suffix, previous["sha1"]))
+        else:
+            tasks.append((log_format, path, prefix, suffix, ""))
+
+    # Parse new and changed files
+    entries_by_path = dict([(entry["path"], entry) for entry in entries])
+    records_by_path = dict()
+    for path, identifier, records, error, digest in parse_log_files(tasks, processes, unordered=True):
+        records_by_path[path] = records
+        entries_by_path[path]["sha1"] = digest
+    parsed = len([records for records in records_by_path.values() if records is not None])
+    reused += len(records_by_path) - parsed
+
+    # Count rows of files that are no longer included
+    removed = len(set(index) - set([entry["path"] for entry in entries]))
+
+    # Skip writing if neither rows nor index entries changed
+    if not parsed and os.path.isfile(output) and list(index.values()) == entries and (feather is None or os.path.isfile(feather)):
+        return parsed, reused, removed
+
+    # Build columnar table
+    table = new_table()
+    for entry in entries:
+        records = records_by_path.get(entry["path"])
+        if records is None:
+            records = list(zip(header[1:], rows[entry["identifier"]]))
+        add_row(table, entry["identifier"], records)
+
+    # Write output and index
+    write_atomically(output, format_table(table))
+    if feather is not None:
+        write_feather(table, feather)
+    write_atomically(index_file, ["\t".join(INDEX_FIELDS) + "\n"] + ["\t".join([entry[field] for field in INDEX_FIELDS]) + "\n" for entry in entries])
+
+    # Return counts
+    return parsed, reused, removed
+
+
+##############
+###  MAIN  ###
+##############
+
+def main(argv=None):
+
+    # Parse CLI arguments
+    parser = argparse.ArgumentParser(description="Writes a table listing the self-reported statistics of multiple tool runs.")
+    parser.add_argument("--format", required=True, choices=list(PARSERS), help="Log file format.")
+    parser.add_argument("--input-dir", default=None, metavar="DIR", help="Directory containing the log files (all files ending in '--suffix').")
+    parser.add_argument("--files-from", default=None, metavar="FILE", help="File listing one log file per line ('-' for STDIN); replaces '--input-dir'.")
+    parser.add_argument("--prefix", default="", help="Prefix removed from log file basenames to obtain identifiers.")
+    parser.add_argument("--suffix", default="", help="Suffix removed from log file basenames to obtain identifiers.")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count(), metavar="INT", help="Number of worker processes (default: number of CPUs).")
+    parser.add_argument("--unordered", action="store_true", help="Write rows in order of completion instead of input order.")
+    parser.add_argument("--output", default=None, metavar="FILE", help="Update output table 'FILE' incrementally instead of writing to STDOUT: only new and changed log files are parsed (see '--index').")
+    parser.add_argument("--index", default=None, metavar="FILE", help="Sidecar index of log files included in '--output' (default: '<output>.index').")
+    parser.add_argument("--checksum", action="store_true", help="With '--output', compare content hashes of log files with unchanged size and modification time, too.")
+    parser.add_argument("--feather", default=None, metavar="FILE", help="Write table in Feather format to 'FILE', too (requires the Python module 'pyarrow').")
+    parser.add_argument("--stream", action="store_true", help="Write rows to STDOUT as soon as they are available; the header is taken from the first file instead of the union of all files (ignored with '--output').")
+    args = parser.parse_args(argv)
+
+    # Die if no or both input options were supplied
+    if (args.input_dir is None) == (args.files_from is None):
+        parser.error("Exactly one of '--input-dir' and '--files-from' is required.")
+
+    # Skip Feather output if 'pyarrow' is not available
+    if args.feather is not None:
+        try:
+            import pyarrow
+        except ImportError:
+            sys.stderr.write("[WARNING] Python module 'pyarrow' not available; '{}' will not be written.\n".format(args.feather))
+            args.feather = None
+
+    # Get log files
+    if args.input_dir is not None:
+        sys.stderr.write("Compiling statistics table from files in directory '{}'...\n".format(args.input_dir))
+        paths = find_log_files(args.input_dir, args.suffix)
+    elif args.files_from == "-":
+        sys.stderr.write("Compiling statistics table from files listed in STDIN...\n")
+        paths = read_log_files(sys.stdin)
+    else:
+        sys.stderr.write("Compiling statistics table from files listed in '{}'...\n".format(args.files_from))
+        paths = read_log_files(open(args.files_from))
+
+    # Update output table
+    if args.output is not None:
+        index_file = args.index if args.index is not None else "{}.index".format(args.output)
+        parsed, reused, removed = aggregate_incremental(args.format, paths, args.prefix, args.suffix, args.output, index_file, processes=args.processes, checksum=args.checksum, feather=args.feather)
+        sys.stderr.write("Updated '{0}': {1} rows parsed, {2} rows unchanged, {3} rows removed.\nDone.\n".format(args.output, parsed, reused, removed))
+        return
+
+    # Parse files and write output
+    tasks = ((args.format, path, args.prefix, args.suffix, None) for path in paths)
+    rows = aggregate(tasks, processes=args.processes, unordered=args.unordered, stream=args.stream, feather=args.feather)
+
+    # Write log
+    sys.stderr.write("Wrote {} rows to STDOUT.\nDone.\n".format(rows))
+
+
+if __name__ == "__main__":
+    main()
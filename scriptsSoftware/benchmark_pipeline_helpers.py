@@ -0,0 +1,520 @@
+#!/usr/bin/env python
+
+"""Benchmarks the Python helpers of the pipeline on synthetic inputs.
+
+The following cases are run at each scale ('--scales'; number of items):
+- 'render_command': renders the command of a component with many '_ADD_<n>' input ports
+                    ('renderCommand' of the Anduril library; items: renderings; requires Python 2,
+                    like the Anduril library itself)
+- 'star_logs':      aggregates STAR 'Log.final.out' files ('aggregate_logs.py'; items: log files)
+- 'cutadapt_se':    aggregates single-end cutadapt reports ('aggregate_logs.py'; items: reports)
+- 'cutadapt_pe':    aggregates paired-end cutadapt reports ('aggregate_logs.py'; items: reports)
+- 'gaf':            converts an annotation table to GAF format
+                    ('generate_gene_associations_file_from_table.py'; items: table rows)
+
+Inputs are generated once per case and scale in a working directory ('--work-dir'). Each
+measurement is then run in a separate Python process, so that the peak resident set size of the
+child process (as reported by the kernel) reflects the benchmarked helper only. Only the call of the helper is timed; the
+fastest of '--repeats' runs and the highest peak memory are reported.
+
+One JSON object per case and scale is appended to the results file ('--results'), including the
+current git commit and the Python version, so that results can be compared across commits. The
+throughput of each case is compared to the most recent result of a different commit in the results
+file (same case, scale and Python version).
+"""
+
+__author__ = "Alexander Kanitz"
+__copyright__ = "Copyright 2016, Biozentrum, University of Basel"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Alexander Kanitz"
+__email__ = "alexander.kanitz@alumni.ethz.ch"
+
+# Import packages
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import OrderedDict
+
+# Locations of benchmarked modules
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ANDURIL_LIB_DIR = os.path.join(SCRIPT_DIR, os.pardir, "frameworksAuxiliary", "anduril", "lib")
+UNCHECKED_DIR = os.path.join(SCRIPT_DIR, "UNCHECKED")
+
+
+###  INPUT GENERATORS  ###
+
+STAR_LOG = """                                 Started job on |\tNov 10 12:00:00
+                             Started mapping on |\tNov 10 12:01:00
+                                    Finished on |\tNov 10 12:{minutes:02d}:00
+       Mapping speed, Million of reads per hour |\t{speed:.2f}
+
+                          Number of input reads |\t{reads}
+                      Average input read length |\t{length}
+                                    UNIQUE READS:
+                   Uniquely mapped reads number |\t{unique}
+                        Uniquely mapped reads % |\t{unique_percent:.2f}%
+                          Average mapped length |\t{mapped_length:.2f}
+                       Number of splices: Total |\t{splices}
+            Number of splices: Annotated (sjdb) |\t{splices_annotated}
+                       Number of splices: GT/AG |\t{splices_gtag}
+                       Number of splices: GC/AG |\t{splices_gcag}
+                       Number of splices: AT/AC |\t{splices_atac}
+               Number of splices: Non-canonical |\t{splices_other}
+                      Mismatch rate per base, % |\t{mismatches:.2f}%
+                         Deletion rate per base |\t0.01%
+                        Deletion average length |\t1.73
+                        Insertion rate per base |\t0.01%
+                       Insertion average length |\t1.35
+                             MULTI-MAPPING READS:
+        Number of reads mapped to multiple loci |\t{multi}
+             % of reads mapped to multiple loci |\t{multi_percent:.2f}%
+        Number of reads mapped to too many loci |\t{too_many}
+             % of reads mapped to too many loci |\t{too_many_percent:.2f}%
+                                  UNMAPPED READS:
+       % of reads unmapped: too many mismatches |\t0.00%
+                 % of reads unmapped: too short |\t{too_short_percent:.2f}%
+                     % of reads unmapped: other |\t0.11%
+"""
+
+CUTADAPT_HEADER = """This is cutadapt 1.9.1 with Python 2.7.11
+Command line parameters: {parameters}
+Trimming 1 adapter(s) with at most 10% errors in {mode} mode ...
+Finished in {seconds:.2f} s (10 us/read; 6.00 M reads/minute).
+
+=== Summary ===
+
+"""
+
+CUTADAPT_SUMMARY_SE = """Total reads processed:               {reads:,}
+Reads with adapters:                 {adapters_1:,} ({adapters_1_percent:.1f}%)
+Reads that were too short:           {too_short:,} ({too_short_percent:.1f}%)
+Reads written (passing filters):     {written:,} ({written_percent:.1f}%)
+
+Total basepairs processed:   {bases:,} bp
+Total written (filtered):    {bases_written:,} bp ({bases_written_percent:.1f}%)
+
+"""
+
+CUTADAPT_SUMMARY_PE = """Total read pairs processed:          {reads:,}
+  Read 1 with adapter:               {adapters_1:,} ({adapters_1_percent:.1f}%)
+  Read 2 with adapter:               {adapters_2:,} ({adapters_2_percent:.1f}%)
+Pairs that were too short:           {too_short:,} ({too_short_percent:.1f}%)
+Pairs written (passing filters):     {written:,} ({written_percent:.1f}%)
+
+Total basepairs processed:   {bases:,} bp
+  Read 1:   {bases_1:,} bp
+  Read 2:   {bases_2:,} bp
+Total written (filtered):    {bases_written:,} bp ({bases_written_percent:.1f}%)
+  Read 1:   {bases_written_1:,} bp
+  Read 2:   {bases_written_2:,} bp
+
+"""
+
+CUTADAPT_ADAPTER = """=== {mate}Adapter 1 ===
+
+Sequence: AGATCGGAAGAGC; Type: regular 3'; Length: 13; Trimmed: {trimmed} times.
+
+No. of allowed errors:
+0-9 bp: 0; 10-13 bp: 1
+
+Bases preceding removed adapters:
+  A: 22.1%
+  C: 27.9%
+  G: 24.5%
+  T: 25.5%
+  none/other: 0.0%
+
+Overview of removed sequences
+length\tcount\texpect\tmax.err\terror counts
+"""
+
+
+def write_star_logs(directory, count, seed=1):
+    """Writes 'count' STAR 'Log.final.out' files with random statistics to 'directory'."""
+    random.seed(seed)
+    os.makedirs(directory)
+    for number in range(count):
+        reads = random.randint(1000000, 50000000)
+        unique = int(reads * random.uniform(0.6, 0.95))
+        multi = int(reads * random.uniform(0.01, 0.2))
+        too_many = int(reads * random.uniform(0, 0.01))
+        splices = int(unique * random.uniform(0.05, 0.2))
+        with open(os.path.join(directory, "SRR{number:07d}.alignments.stats".format(number=number)), "w") as handle:
+            handle.write(STAR_LOG.format(
+                minutes=random.randint(2, 59),
+                speed=random.uniform(50, 500),
+                reads=reads,
+                length=random.choice([50, 76, 100, 150]),
+                unique=unique,
+                unique_percent=100.0 * unique / reads,
+                mapped_length=random.uniform(45, 150),
+                splices=splices,
+                splices_annotated=int(splices * 0.98),
+                splices_gtag=int(splices * 0.99),
+                splices_gcag=int(splices * 0.008),
+                splices_atac=int(splices * 0.001),
+                splices_other=int(splices * 0.001),
+                mismatches=random.uniform(0.1, 1),
+                multi=multi,
+                multi_percent=100.0 * multi / reads,
+                too_many=too_many,
+                too_many_percent=100.0 * too_many / reads,
+                too_short_percent=random.uniform(0, 10),
+            ))
+
+
+def write_cutadapt_reports(directory, count, paired=False, seed=1):
+    """Writes 'count' single- or paired-end cutadapt reports, including trimmed length histograms, to 'directory'."""
+    random.seed(seed)
+    os.makedirs(directory)
+    for number in range(count):
+        reads = random.randint(1000000, 50000000)
+        length = random.choice([50, 76, 100])
+        values = {
+            "reads": reads,
+            "adapters_1": int(reads * random.uniform(0.05, 0.5)),
+            "adapters_2": int(reads * random.uniform(0.05, 0.5)),
+            "too_short": int(reads * random.uniform(0, 0.05)),
+            "bases_1": reads * length,
+            "bases_2": reads * length,
+            "bases_written_1": int(reads * length * random.uniform(0.8, 0.99)),
+            "bases_written_2": int(reads * length * random.uniform(0.8, 0.99)),
+        }
+        values["written"] = reads - values["too_short"]
+        values["bases"] = values["bases_1"] + values["bases_2"] if paired else values["bases_1"]
+        values["bases_written"] = values["bases_written_1"] + values["bases_written_2"] if paired else values["bases_written_1"]
+        for key in ["adapters_1", "adapters_2", "too_short", "written"]:
+            values[key + "_percent"] = 100.0 * values[key] / reads
+        values["bases_written_percent"] = 100.0 * values["bases_written"] / values["bases"]
+        with open(os.path.join(directory, "SRR{number:07d}.processing.adapter_removal.stats".format(number=number)), "w") as handle:
+            handle.write(CUTADAPT_HEADER.format(
+                parameters="-a AGATCGGAAGAGC {mate_2}-m 20 -o out_1.fq {mate_2_out}in_1.fq{mate_2_in}".format(
+                    mate_2="-A AGATCGGAAGAGC " if paired else "",
+                    mate_2_out="-p out_2.fq " if paired else "",
+                    mate_2_in=" in_2.fq" if paired else "",
+                ),
+                mode="paired-end legacy" if paired else "single-end",
+                seconds=reads / 100000.0,
+            ))
+            handle.write((CUTADAPT_SUMMARY_PE if paired else CUTADAPT_SUMMARY_SE).format(**values))
+            for mate in (["First read: ", "Second read: "] if paired else [""]):
+                handle.write(CUTADAPT_ADAPTER.format(mate=mate, trimmed=values["adapters_1"]))
+                for trimmed_length in range(3, length + 1):
+                    handle.write("{length}\t{count}\t{expect:.1f}\t{errors}\t{count}\n".format(
+                        length=trimmed_length,
+                        count=random.randint(0, 100000),
+                        expect=reads / 4.0 ** trimmed_length,
+                        errors=min(trimmed_length // 10, 1),
+                    ))
+                handle.write("\n")
+
+
+def write_gaf_table(filename, rows, seed=1):
+    """Writes an annotation table (id, GO term, evidence code, aspect, symbol, qualifier, name) with 'rows' rows, including some illegal values."""
+    random.seed(seed)
+    codes = ["EXP", "IDA", "IPI", "IMP", "IEA", "IEA", "IEA", "ISS", "IC", "TAS", "XXX"]
+    aspects = ["biological_process", "molecular_function", "cellular_component", "unknown"]
+    qualifiers = ["", "", "", "", "", "NOT", "contributes_to", "NOT|colocalizes_with", "illegal"]
+    with open(filename, "w") as handle:
+        for row in range(rows):
+            handle.write("\t".join([
+                "ENSG{number:011d}".format(number=random.randint(0, rows // 5 + 1)),
+                "GO:{number:07d}".format(number=random.randint(0, 45000)),
+                random.choice(codes),
+                random.choice(aspects),
+                random.choice(["", "SYMBOL{number}".format(number=row)]),
+                random.choice(qualifiers),
+                "gene {number}".format(number=row),
+            ]) + "\n")
+
+
+def write_component(directory, ports):
+    """Writes the description ('component.json') of a component with one input port that has 'ports' '_ADD_<n>' ports, positional and redirected ports, and a set of parameters to 'directory'."""
+
+    # Define ports and parameters
+    def port(tag, name, option, positional="false", redirect=None):
+        attributes = {"name": name, "optionName": option, "fileClass": "file", "positional": positional, "optional": "true", "array": "false", "type": "Text"}
+        if redirect is not None:
+            attributes["redirect"] = redirect
+        return {"tagName": tag, "tagValue": "n/a", "tagAttributes": attributes}
+    inputs = [port("input", "INFILE_reads", "--reads"), port("input", "INFILE_index", "--index"), port("input", "INFILE_input", "input", positional="1")]
+    inputs += [port("input", "INFILE_reads_ADD_{number}".format(number=number), "--reads_ADD_{number}".format(number=number)) for number in range(1, ports + 1)]
+    outputs = [port("output", "OUTFILE_out", "--out", redirect="false"), port("output", "OUTFILE_report", "--report", positional="2", redirect=">")]
+    parameters = [{"tagName": "parameter", "tagValue": "n/a", "tagAttributes": {"name": "option{number}".format(number=number), "optionName": "--option{number}".format(number=number), "default": str(number), "positional": "false", "type": "string"}} for number in range(20)]
+
+    # Write description
+    os.makedirs(directory)
+    with open(os.path.join(directory, "component.json"), "w") as handle:
+        json.dump({"inputs": inputs, "outputs": outputs, "parameters": parameters}, handle, indent=1)
+
+
+###  BENCHMARK CASES  ###
+
+class Namespace(object):
+    """Stand-in for the port and parameter objects of the Anduril component API."""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+def prepare_render_command(directory, scale, args):
+    """Writes the description of a component with '--ports' '_ADD_<n>' ports."""
+    write_component(os.path.join(directory, "component"), args.ports)
+
+
+def run_render_command(directory, scale, args):
+    """Renders the command of the component 'scale' times; returns the number of renderings."""
+
+    # Import Anduril library; keep template cache within working directory
+    os.environ["ANDURIL_TEMPLATE_CACHE"] = os.path.join(directory, "template_cache")
+    sys.path.insert(0, ANDURIL_LIB_DIR)
+    import anduril_custom_functions as acf
+
+    # Build component instance
+    component_dir = os.path.join(directory, "component")
+    exec_dir = os.path.join(directory, "instance")
+    with open(os.path.join(component_dir, "component.json")) as handle:
+        description = json.load(handle)
+    component = Namespace({})
+    component.input = Namespace(dict((item["tagAttributes"]["name"], os.path.join(directory, "inputs", item["tagAttributes"]["name"])) for item in description["inputs"]))
+    component.output = Namespace(dict((item["tagAttributes"]["name"], os.path.join(exec_dir, item["tagAttributes"]["name"])) for item in description["outputs"]))
+    parameters = dict((item["tagAttributes"]["name"], item["tagAttributes"]["default"]) for item in description["parameters"])
+    parameters.update({"_executable": "/usr/bin/true", "_execMode": "local", "_cores": "1", "_membycore": "1G", "_runtime": "0:10:00", "_OUTFILE_out": True})
+    component.param = Namespace(parameters)
+
+    # Time rendering (the template is built once, as the launchers do)
+    start = time.time()
+    template = acf.getComponentTemplate(component_dir)
+    for number in range(scale):
+        command = template.format(**parameters)
+        acf.renderCommand(component, command, os.path.join(exec_dir, "_tmp"), exec_dir)
+    return time.time() - start, scale
+
+
+def prepare_star_logs(directory, scale, args):
+    write_star_logs(os.path.join(directory, "logs"), scale)
+
+
+def prepare_cutadapt_se(directory, scale, args):
+    write_cutadapt_reports(os.path.join(directory, "logs"), scale, paired=False)
+
+
+def prepare_cutadapt_pe(directory, scale, args):
+    write_cutadapt_reports(os.path.join(directory, "logs"), scale, paired=True)
+
+
+def run_aggregate_logs(log_format, suffix):
+    """Returns a function that aggregates the log files of a case (in a single process); the function returns the number of log files."""
+
+    def run(directory, scale, args):
+
+        # Import log aggregator
+        sys.path.insert(0, SCRIPT_DIR)
+        import aggregate_logs
+
+        # Time aggregation
+        start = time.time()
+        paths = aggregate_logs.find_log_files(os.path.join(directory, "logs"), suffix)
+        tasks = [(log_format, path, "", suffix, None) for path in paths]
+        with open(os.devnull, "w") as out:
+            aggregate_logs.aggregate(tasks, processes=1, out=out)
+        return time.time() - start, len(tasks)
+
+    return run
+
+
+def prepare_gaf(directory, scale, args):
+    write_gaf_table(os.path.join(directory, "table.tsv"), scale)
+
+
+def run_gaf(directory, scale, args):
+    """Converts the annotation table to GAF format; returns the number of table rows."""
+
+    # Import GAF generator
+    sys.path.insert(0, UNCHECKED_DIR)
+    import generate_gene_associations_file_from_table as gaf
+
+    # Time conversion
+    start = time.time()
+    gaf_args = gaf.parse_arguments(["--symbol", "5", "--qualifier", "#6", "--name", "7"])
+    plan = gaf.build_column_plan(gaf_args)
+    with open(os.path.join(directory, "table.tsv")) as f, open(os.devnull, "w") as out:
+        gaf.convert_stream(f, plan, gaf_args, out.writelines, warning_counts={})
+    return time.time() - start, scale
+
+
+# Benchmark cases: name -> (input generator, benchmark function)
+CASES = OrderedDict([
+    ("render_command", (prepare_render_command, run_render_command)),
+    ("star_logs", (prepare_star_logs, run_aggregate_logs("star", ".alignments.stats"))),
+    ("cutadapt_se", (prepare_cutadapt_se, run_aggregate_logs("cutadapt", ".processing.adapter_removal.stats"))),
+    ("cutadapt_pe", (prepare_cutadapt_pe, run_aggregate_logs("cutadapt", ".processing.adapter_removal.stats"))),
+    ("gaf", (prepare_gaf, run_gaf)),
+])
+
+
+###  MEASUREMENT  ###
+
+def measure(case, directory, scale, args):
+    """Runs a benchmark case in a child process; returns seconds, number of items and peak resident set size (KiB) of the child, or None if the case failed."""
+
+    # Start child process (messages of the helpers are written to a log file in the case directory)
+    command = [sys.executable, os.path.abspath(__file__), "--run-case", case, "--case-dir", directory, "--scales", str(scale), "--ports", str(args.ports)]
+    with open(os.path.join(directory, "stderr.log"), "w") as log:
+        child = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=log)
+        output = child.stdout.read()
+        child.stdout.close()
+
+    # Wait for child, collecting its resource usage
+    pid, status, usage = os.wait4(child.pid, 0)
+    child.returncode = status
+    if not os.WIFEXITED(status) or os.WEXITSTATUS(status) != 0:
+        return None
+
+    # Return measurement
+    result = json.loads(output.decode("utf-8"))
+    return result["seconds"], result["items"], usage.ru_maxrss
+
+
+def get_commit():
+    """Returns the current git commit (suffixed with '-dirty' if there are uncommitted changes) or None outside of a git repository."""
+    try:
+        with open(os.devnull, "w") as devnull:
+            commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=SCRIPT_DIR, stderr=devnull).decode("utf-8").strip()
+            if subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=SCRIPT_DIR, stderr=devnull) != 0:
+                commit += "-dirty"
+        return commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_results(filename):
+    """Returns the records of a results file (empty list if it does not exist)."""
+    records = list()
+    if os.path.isfile(filename):
+        with open(filename) as handle:
+            for line in handle:
+                if line.strip():
+                    records.append(json.loads(line))
+    return records
+
+
+def get_previous(records, record):
+    """Returns the most recent record of a different commit for the same case, scale and Python version (None if there is none)."""
+    for previous in reversed(records):
+        if previous["commit"] != record["commit"] and all(previous[key] == record[key] for key in ["case", "scale", "python"]):
+            return previous
+    return None
+
+
+###  MAIN  ###
+
+def main():
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated list of benchmark cases. Default: all cases.", metavar="LIST")
+    parser.add_argument("--scales", default="10,1000,100000", help="Comma-separated list of numbers of items per case. Default: 10,1000,100000.", metavar="LIST")
+    parser.add_argument("--repeats", default=3, type=int, help="Number of runs per case and scale (the fastest run is reported). Default: 3.", metavar="INT")
+    parser.add_argument("--ports", default=100, type=int, help="Number of '_ADD_<n>' ports of the component of case 'render_command'. Default: 100.", metavar="INT")
+    parser.add_argument("--results", default="benchmark_pipeline_helpers.jsonl", help="File to which results are appended (JSON lines). Default: 'benchmark_pipeline_helpers.jsonl'.", metavar="FILE")
+    parser.add_argument("--work-dir", default=None, help="Directory in which inputs are generated; inputs are kept and reused by later runs. Default: temporary directory (removed after the benchmark).", metavar="DIR")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--case-dir", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    # Run single case in child process
+    if args.run_case is not None:
+        seconds, items = CASES[args.run_case][1](args.case_dir, scales[0], args)
+        sys.stdout.write(json.dumps({"seconds": seconds, "items": items}) + "\n")
+        return
+
+    # Check cases
+    cases = args.cases.split(",")
+    for case in cases:
+        if case not in CASES:
+            sys.stderr.write("[ERROR] Unknown benchmark case '{case}'!\n[ERROR] Execution aborted.\n".format(case=case))
+            sys.exit(1)
+
+    # Get run information
+    previous_records = read_results(args.results)
+    info = OrderedDict([
+        ("timestamp", time.strftime("%Y-%m-%dT%H:%M:%S")),
+        ("commit", get_commit()),
+        ("python", platform.python_version()),
+        ("host", socket.gethostname()),
+    ])
+
+    # Create working directory
+    work_dir = args.work_dir if args.work_dir is not None else tempfile.mkdtemp(prefix="benchmark_pipeline_helpers.")
+    if not os.path.isdir(work_dir):
+        os.makedirs(work_dir)
+
+    # Iterate over cases and scales
+    sys.stdout.write("case\tscale\tseconds\titems_per_second\tmaxrss_kb\tchange\n")
+    try:
+        with open(args.results, "a") as results:
+            for case in cases:
+                for scale in scales:
+
+                    # Generate inputs
+                    case_dir = os.path.join(work_dir, "{case}.{scale}".format(case=case, scale=scale))
+                    if not os.path.isdir(case_dir):
+                        os.makedirs(case_dir)
+                        CASES[case][0](case_dir, scale, args)
+
+                    # Run benchmark
+                    measurements = list()
+                    for repeat in range(args.repeats):
+                        measurements.append(measure(case, case_dir, scale, args))
+                        if measurements[-1] is None:
+                            break
+                    if measurements[-1] is None:
+                        sys.stderr.write("[WARNING] Benchmark case '{case}' failed at scale {scale} (see '{log}'); skipped.\n".format(case=case, scale=scale, log=os.path.join(case_dir, "stderr.log")))
+                        continue
+                    seconds = min([measurement[0] for measurement in measurements])
+                    items = measurements[0][1]
+
+                    # Write result
+                    record = OrderedDict(info)
+                    record.update([
+                        ("case", case),
+                        ("scale", scale),
+                        ("items", items),
+                        ("repeats", args.repeats),
+                        ("seconds", seconds),
+                        ("items_per_second", items / seconds if seconds > 0 else None),
+                        ("maxrss_kb", max([measurement[2] for measurement in measurements])),
+                    ])
+                    results.write(json.dumps(record) + "\n")
+                    results.flush()
+
+                    # Compare throughput with previous commit
+                    previous = get_previous(previous_records, record)
+                    change = "NA"
+                    if previous is not None and previous["items_per_second"] and record["items_per_second"]:
+                        change = "{change:+.1f}%".format(change=100.0 * (record["items_per_second"] / previous["items_per_second"] - 1))
+                    sys.stdout.write("{case}\t{scale}\t{seconds:.4f}\t{rate:.1f}\t{maxrss}\t{change}\n".format(case=case, scale=scale, seconds=seconds, rate=record["items_per_second"] or 0, maxrss=record["maxrss_kb"], change=change))
+                    sys.stdout.flush()
+
+    # Remove generated inputs
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+
+"""Downloads the run data (in SRA format) of the runs listed in a sample table.
+
+Runs are downloaded concurrently by a pool of worker threads ('--workers'). Data is written to
+'<out_dir>/<study>/<run>.sra.part' first; interrupted downloads are resumed from the end of the
+partial file (HTTP 'Range' or FTP 'REST' requests). A download is only renamed to
+'<out_dir>/<study>/<run>.sra' after its size matches the size reported by the server and, if
+checksums are supplied ('--checksums'; a tab-separated table with a header and columns 'run' and
+'md5'), its MD5 checksum matches. Partial files with mismatching checksums are removed. Existing
+'.sra' files are skipped.
+
+Requests to the same host are limited in number ('--max-connections-per-host') and, optionally,
+in bandwidth ('--max-rate-per-host', bytes per second, shared by all connections to the host).
+Failed transfers are retried with exponential backoff. Run data is located at
+'<sra_root>/<first three characters of run>/<first six characters of run>/<run>/<run>.sra'; any
+HTTP(S) or FTP server with this layout can be used as '--sra-root' (e.g. a local stand-in).
+
+Sample table requires a grouping ID (e.g. study ID) in the first and the SRA run ID (starting with
+DRR, ERR or SRR) in the second column of a tab-delimited file with a header line.
+"""
+
+__author__ = "Alexander Kanitz"
+__copyright__ = "Copyright 2016, Biozentrum, University of Basel"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Alexander Kanitz"
+__email__ = "alexander.kanitz@alumni.ethz.ch"
+
+# Import packages
+import os
+import sys
+import csv
+import time
+import random
+import ftplib
+import hashlib
+import argparse
+import threading
+
+try:
+    import Queue as queue
+    from urllib2 import Request, HTTPError, URLError, urlopen
+    from urlparse import urlparse
+except ImportError:
+    import queue
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError, URLError
+    from urllib.parse import urlparse
+
+
+#######################
+###  RATE LIMITING  ###
+#######################
+
+class HostLimiter(object):
+    """Limits the number of concurrent connections to and the bandwidth (bytes per second) shared by
+    all connections to a single host (token bucket with a capacity of one second of transfer)."""
+
+    def __init__(self, connections, rate=None):
+        self.connections = threading.BoundedSemaphore(connections)
+        self.rate = rate
+        self.tokens = float(rate or 0)
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def throttle(self, size):
+        """Blocks until 'size' bytes may be transferred."""
+
+        # Return immediately if bandwidth is not limited
+        if not self.rate:
+            return
+
+        # Wait until enough tokens are available
+        while True:
+            with self.lock:
+                now = time.time()
+                self.tokens = min(float(self.rate), self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= min(size, self.rate):
+                    self.tokens -= size
+                    return
+                wait = (min(size, self.rate) - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Limiters(object):
+    """Returns the 'HostLimiter' of a host, creating it on first use."""
+
+    def __init__(self, connections, rate=None):
+        self.connections = connections
+        self.rate = rate
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    def get(self, host):
+        with self.lock:
+            if host not in self.limiters:
+                self.limiters[host] = HostLimiter(self.connections, self.rate)
+            return self.limiters[host]
+
+
+###################
+###  TRANSFERS  ###
+###################
+
+class TransferError(Exception):
+    """Raised for transfers that should not be retried."""
+    pass
+
+
+def get_url(sra_root, run_id):
+    """Returns the URL of the SRA file of a run."""
+
+    return "/".join([sra_root.rstrip("/"), run_id[:3], run_id[:6], run_id, run_id + ".sra"])
+
+
+def copy_stream(source, handle, limiter, chunk_size=65536):
+    """Copies a stream (file-like object) to a file handle, throttled by the host limiter."""
+
+    while True:
+        limiter.throttle(chunk_size)
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        handle.write(chunk)
+
+
+def fetch_http(url, part_file, limiter, timeout):
+    """Appends the missing bytes of a file to 'part_file' (HTTP/HTTPS). Returns the size of the
+    complete file or 'None' if the server does not report it."""
+
+    # Request missing bytes
+    offset = os.path.getsize(part_file) if os.path.isfile(part_file) else 0
+    request = Request(url)
+    if offset:
+        request.add_header("Range", "bytes={offset}-".format(offset=offset))
+    try:
+        response = urlopen(request, timeout=timeout)
+    except HTTPError as error:
+        if error.code == 416:
+            return offset
+        if 400 <= error.code < 500:
+            raise TransferError("HTTP error {code}: {reason}".format(code=error.code, reason=error.reason))
+        raise
+
+    # Get size of complete file; restart if server ignored range request
+    try:
+        if response.getcode() == 206:
+            content_range = response.info().get("Content-Range", "")
+            size = int(content_range.rsplit("/", 1)[1]) if "/" in content_range and not content_range.endswith("*") else None
+            mode = "ab"
+        else:
+            size = int(response.info().get("Content-Length")) if response.info().get("Content-Length") else None
+            mode = "wb"
+
+        # Write data
+        with open(part_file, mode) as handle:
+            copy_stream(response, handle, limiter)
+    finally:
+        response.close()
+
+    # Return size of complete file
+    return size
+
+
+def fetch_ftp(url, part_file, limiter, timeout):
+    """Appends the missing bytes of a file to 'part_file' (FTP). Returns the size of the complete
+    file or 'None' if the server does not report it."""
+
+    # Connect
+    parsed = urlparse(url)
+    ftp = ftplib.FTP()
+    try:
+        try:
+            ftp.connect(parsed.hostname, parsed.port or 21, timeout=timeout)
+            ftp.login(parsed.username or "anonymous", parsed.password or "anonymous@")
+            ftp.voidcmd("TYPE I")
+        except ftplib.error_perm as error:
+            raise TransferError("FTP error: {error}".format(error=error))
+
+        # Get size of complete file
+        try:
+            size = ftp.size(parsed.path)
+        except ftplib.error_perm as error:
+            if str(error).startswith("550"):
+                raise TransferError("FTP error: {error}".format(error=error))
+            size = None
+
+        # Request missing bytes
+        offset = os.path.getsize(part_file) if os.path.isfile(part_file) else 0
+        if size is not None and offset >= size:
+            return size
+        connection = ftp.transfercmd("RETR " + parsed.path, rest=offset or None)
+
+        # Write data
+        with open(part_file, "ab" if offset else "wb") as handle:
+            source = connection.makefile("rb")
+            try:
+                copy_stream(source, handle, limiter)
+            finally:
+                source.close()
+                connection.close()
+        ftp.voidresp()
+    finally:
+        try:
+            ftp.quit()
+        except (ftplib.all_errors):
+            ftp.close()
+
+    # Return size of complete file
+    return size
+
+
+def get_md5(path, block_size=1048576):
+    """Returns the MD5 checksum of a file."""
+
+    md5 = hashlib.md5()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def download(task, args, limiters):
+    """Downloads the SRA file of a run with retries; returns a (run, status, message) tuple."""
+
+    # Unpack task
+    study_id, run_id, md5 = task
+    out_file = os.path.join(args.out_dir, study_id, run_id + ".sra")
+    part_file = out_file + ".part"
+
+    # Skip existing files
+    if os.path.exists(out_file):
+        return (run_id, "skipped", "file exists")
+
+    # Get URL and host limiter
+    url = get_url(args.sra_root, run_id)
+    parsed = urlparse(url)
+    limiter = limiters.get(parsed.netloc)
+    if parsed.scheme in ["http", "https"]:
+        fetch = fetch_http
+    elif parsed.scheme == "ftp":
+        fetch = fetch_ftp
+    else:
+        return (run_id, "failed", "unsupported URL scheme '{scheme}'".format(scheme=parsed.scheme))
+
+    # Create study directory
+    try:
+        os.makedirs(os.path.dirname(out_file))
+    except OSError:
+        if not os.path.isdir(os.path.dirname(out_file)):
+            raise
+
+    # Try to download file
+    message = None
+    for attempt in range(args.tries):
+
+        # Wait before retrying (exponential backoff with jitter)
+        if attempt:
+            time.sleep(min(args.backoff * 2 ** (attempt - 1), 60) * random.uniform(0.5, 1.5))
+
+        # Fetch missing bytes
+        try:
+            with limiter.connections:
+                size = fetch(url, part_file, limiter, args.timeout)
+        except TransferError as error:
+            return (run_id, "failed", str(error))
+        except (IOError, OSError, EOFError, ftplib.Error, URLError) as error:
+            message = "transfer error: {error}".format(error=error)
+            sys.stderr.write("[WARNING] Downloading run '{run}' failed (attempt {attempt} of {tries}): {error}\n".format(run=run_id, attempt=attempt + 1, tries=args.tries, error=error))
+            continue
+
+        # Check size; resume incomplete and restart oversized downloads
+        actual = os.path.getsize(part_file) if os.path.isfile(part_file) else 0
+        if size is not None and actual != size:
+            message = "size mismatch: {actual} of {size} bytes".format(actual=actual, size=size)
+            if actual > size:
+                os.remove(part_file)
+            continue
+
+        # Check MD5 checksum; restart on mismatch
+        if md5 is not None:
+            checksum = get_md5(part_file)
+            if checksum != md5:
+                message = "MD5 mismatch: {checksum} instead of {md5}".format(checksum=checksum, md5=md5)
+                os.remove(part_file)
+                continue
+
+        # Rename verified download
+        os.rename(part_file, out_file)
+        return (run_id, "downloaded", "{size} bytes{md5}".format(size=actual, md5=", MD5 verified" if md5 is not None else ""))
+
+    # Return failure
+    return (run_id, "failed", message)
+
+
+def worker(tasks, results, args, limiters):
+    """Downloads runs from the task queue until it is empty."""
+
+    while True:
+        try:
+            task = tasks.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            result = download(task, args, limiters)
+        except Exception as error:
+            result = (task[1], "failed", "unexpected error: {error}".format(error=error))
+        sys.stderr.write("Run '{run}': {status} ({message}).\n".format(run=result[0], status=result[1], message=result[2]))
+        results.append(result)
+
+
+#######################
+###  SAMPLE TABLES  ###
+#######################
+
+def read_tasks(sample_table, checksums=None):
+    """Returns a list of (study, run, MD5 checksum) tuples; checksums are 'None' if unknown."""
+
+    # Read checksums
+    md5s = {}
+    if checksums is not None:
+        with open(checksums) as handle:
+            for row in csv.DictReader(handle, delimiter="\t"):
+                md5s[row["run"]] = row["md5"].strip().lower()
+
+    # Read runs
+    tasks = []
+    with open(sample_table) as handle:
+        reader = csv.reader(handle, delimiter="\t")
+        next(reader)
+        for row in reader:
+            if len(row) >= 2:
+                tasks.append((row[0], row[1], md5s.get(row[1])))
+    return tasks
+
+
+##############
+###  MAIN  ###
+##############
+
+def main(argv=None):
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sample_table", help="Sample table (tab-separated, with header; study ID in column 1, run ID in column 2).")
+    parser.add_argument("out_dir", help="Output directory.")
+    parser.add_argument("--sra-root", default="ftp://ftp-trace.ncbi.nih.gov/sra/sra-instant/reads/ByRun/sra", help="Root URL of run data (default: NCBI SRA FTP server).")
+    parser.add_argument("--workers", type=int, default=4, help="Number of concurrent downloads (default: 4).")
+    parser.add_argument("--max-connections-per-host", type=int, default=4, help="Maximum number of concurrent connections per host (default: 4).")
+    parser.add_argument("--max-rate-per-host", type=int, default=None, help="Maximum bandwidth per host in bytes per second (default: unlimited).")
+    parser.add_argument("--checksums", default=None, help="Table of MD5 checksums (tab-separated, with header; columns 'run' and 'md5').")
+    parser.add_argument("--tries", type=int, default=30, help="Number of attempts per run (default: 30).")
+    parser.add_argument("--timeout", type=float, default=10, help="Connection timeout in seconds (default: 10).")
+    parser.add_argument("--backoff", type=float, default=1, help="Initial delay between attempts in seconds; doubled after each attempt, up to 60 seconds (default: 1).")
+    args = parser.parse_args(argv)
+    for option in ["workers", "max_connections_per_host", "tries"]:
+        if getattr(args, option) < 1:
+            parser.error("'--{option}' must be at least 1".format(option=option.replace("_", "-")))
+
+    # Build task queue
+    tasks = queue.Queue()
+    for task in read_tasks(args.sample_table, args.checksums):
+        tasks.put(task)
+    sys.stderr.write("Downloading {runs} runs to '{out_dir}' with {workers} workers...\n".format(runs=tasks.qsize(), out_dir=args.out_dir, workers=args.workers))
+
+    # Download runs
+    results = []
+    limiters = Limiters(args.max_connections_per_host, args.max_rate_per_host)
+    threads = [threading.Thread(target=worker, args=(tasks, results, args, limiters)) for thread in range(args.workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(1)
+
+    # Write summary
+    counts = dict([(status, len([result for result in results if result[1] == status])) for status in ["downloaded", "skipped", "failed"]])
+    sys.stderr.write("Downloaded: {downloaded}; skipped: {skipped}; failed: {failed}.\n".format(**counts))
+    if counts["failed"]:
+        sys.stderr.write("[ERROR] Failed runs: {runs}\n[ERROR] Execution aborted.\n".format(runs=", ".join(sorted([result[0] for result in results if result[1] == "failed"]))))
+        sys.exit(1)
+    sys.stderr.write("Done.\n")
+
+
+if __name__ == "__main__":
+    main()
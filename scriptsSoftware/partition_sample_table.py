@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+
+"""Splits a sample table into chunks of near-equal predicted processing cost.
+
+The cost of each sample is estimated from the size of its read file (column 'path'), multiplied by
+a factor for its sequencing strategy ('PAIRED' samples cost about twice as much as 'SINGLE'
+samples) and, optionally, for its organism. Samples whose read file is not accessible are assigned
+the median size of all accessible files. If a table of historical run times is supplied
+('--runtimes'; multiple rows per run, e.g. one per processing step, are summed), the measured run
+times are used instead for all runs listed there, and the size-based estimates of the remaining runs
+are scaled to seconds by the median ratio of measured to estimated cost. Run time tables can also be
+indexes of Anduril run manifests ('index_run_manifests.py'; one row per execution attempt of a
+component instance), e.g. with '--runtime-run-column instance --runtime-run-pattern "_([^_]+)$"
+--runtime-column times_run_s' for instances named '<name>_<study>_<run>'. If the table has the
+manifest columns 'status' and 'exit_status', only successful attempts ('finished', exit status 0)
+are used, and if it has an 'instance' column, only the latest of these (by columns 'created' and
+'attempt') per instance, so that failed and repeated attempts do not inflate the run times.
+
+Samples are assigned to chunks greedily in order of decreasing cost (longest processing time first):
+each sample goes to the chunk with the lowest predicted cost, unless a chunk that already contains
+samples of the same organism is within '--affinity-tolerance' (a fraction of the mean chunk cost)
+of it, in which case the least loaded of those is chosen, so that genome indices are shared by as
+many samples of a chunk as possible. Within each chunk, samples are grouped by organism and
+otherwise kept in input order.
+
+Chunks are named like those of 'split_table.sh' ('<prefix>000<suffix>', '<prefix>001<suffix>', ...);
+existing chunks of that name pattern in the output directory are removed first. A summary of the
+predicted cost and organisms of each chunk is written to STDERR.
+"""
+
+__author__ = "Alexander Kanitz"
+__copyright__ = "Copyright 2016, Biozentrum, University of Basel"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Alexander Kanitz"
+__email__ = "alexander.kanitz@alumni.ethz.ch"
+
+# Import packages
+import os
+import sys
+import csv
+import glob
+import argparse
+import re
+
+
+###################
+###  FUNCTIONS  ###
+###################
+
+def parse_arguments(argv=None):
+    """Parses command-line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("table", help="Sample table (tab-separated, with header).")
+    parser.add_argument("out_dir", help="Output directory.")
+    parser.add_argument("--prefix", default="table.", help="Prefix of chunk files (default: 'table.').")
+    parser.add_argument("--suffix", default=".tsv", help="Suffix of chunk files (default: '.tsv').")
+    chunks = parser.add_mutually_exclusive_group(required=True)
+    chunks.add_argument("--chunks", type=int, help="Number of chunks.")
+    chunks.add_argument("--chunk-size", type=int, help="Average number of samples per chunk (the number of chunks is the number of samples divided by this value, rounded up).")
+    parser.add_argument("--root", default=None, help="Replace placeholder '[[ROOT]]' in read file paths with this directory when looking up file sizes.")
+    parser.add_argument("--path-column", default="path", help="Column of read file paths (default: 'path').")
+    parser.add_argument("--strategy-column", default="strategy", help="Column of sequencing strategies (default: 'strategy').")
+    parser.add_argument("--organism-column", default="organism", help="Column of organisms (default: 'organism').")
+    parser.add_argument("--run-column", default="run", help="Column of run identifiers in the sample table (default: 'run').")
+    parser.add_argument("--paired-factor", type=float, default=2.0, help="Cost factor of paired-end samples (default: 2.0).")
+    parser.add_argument("--organism-factor", action="append", default=[], metavar="ORGANISM=FACTOR", help="Cost factor of samples of an organism, e.g. 'Homo sapiens=1.2' (default: 1.0; may be repeated).")
+    parser.add_argument("--runtimes", default=None, help="Table of historical run times (tab-separated, with header).")
+    parser.add_argument("--runtime-column", default="seconds", help="Column of run times in the run time table (default: 'seconds').")
+    parser.add_argument("--runtime-run-column", default=None, help="Column of run identifiers in the run time table (default: '--run-column').")
+    parser.add_argument("--runtime-run-pattern", default=None, help="Regular expression extracting the run identifier (first group) from the values of '--runtime-run-column'; rows that do not match are ignored (default: use values as is).")
+    parser.add_argument("--affinity-tolerance", type=float, default=0.1, help="Accept chunks with samples of the same organism whose predicted cost exceeds that of the least loaded chunk by at most this fraction of the mean chunk cost (default: 0.1; 0: no organism affinity).")
+    args = parser.parse_args(argv)
+
+    # Check arguments
+    if args.chunks is not None and args.chunks < 1:
+        parser.error("'--chunks' must be at least 1")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("'--chunk-size' must be at least 1")
+    if args.affinity_tolerance < 0:
+        parser.error("'--affinity-tolerance' must not be negative")
+    if args.runtime_run_column is None:
+        args.runtime_run_column = args.run_column
+    if args.runtime_run_pattern is not None:
+        try:
+            args.runtime_run_pattern = re.compile(args.runtime_run_pattern)
+        except re.error as error:
+            parser.error("illegal value for '--runtime-run-pattern': {}".format(error))
+    factors = {}
+    for item in args.organism_factor:
+        organism, separator, factor = item.rpartition("=")
+        try:
+            factors[organism] = float(factor)
+        except ValueError:
+            separator = ""
+        if not separator:
+            parser.error("illegal value for '--organism-factor': '{}'".format(item))
+    args.organism_factor = factors
+
+    return args
+
+
+def read_table(path):
+    """Returns the header and the rows (as lists of fields) of a tab-separated table."""
+
+    with open(path) as handle:
+        reader = csv.reader(handle, delimiter="\t")
+        header = next(reader)
+        rows = [row for row in reader if row]
+    return header, rows
+
+
+def get_attempt_order(row):
+    """Returns a sort key ordering the rows of a run manifest index by execution attempt."""
+
+    try:
+        attempt = int(row.get("attempt") or 0)
+    except ValueError:
+        attempt = 0
+    return (row.get("created") or "", attempt)
+
+
+def read_runtimes(path, run_column, runtime_column, run_pattern=None):
+    """Returns a dictionary of summed run times per run (identifiers extracted by 'run_pattern').
+
+    Rows of unsuccessful attempts and all but the latest successful attempt per instance are
+    ignored if the table has the respective columns of a run manifest index.
+    """
+
+    # Read rows of successful attempts with run times
+    rows = []
+    with open(path) as handle:
+        for row in csv.DictReader(handle, delimiter="\t"):
+            if "status" in row and row["status"] != "finished":
+                continue
+            if "exit_status" in row and row["exit_status"] not in ["0", "0.0"]:
+                continue
+            try:
+                row[runtime_column] = float(row[runtime_column])
+            except (KeyError, TypeError, ValueError):
+                continue
+            rows.append(row)
+
+    # Keep latest attempt per instance
+    if rows and "instance" in rows[0]:
+        latest = {}
+        for row in rows:
+            if row["instance"] not in latest or get_attempt_order(row) >= get_attempt_order(latest[row["instance"]]):
+                latest[row["instance"]] = row
+        rows = [row for row in rows if latest[row["instance"]] is row]
+
+    # Sum run times per run
+    runtimes = {}
+    for row in rows:
+        run = row.get(run_column)
+        if run is not None and run_pattern is not None:
+            match = run_pattern.search(run)
+            run = match.group(1) if match else None
+        if run is not None:
+            runtimes[run] = runtimes.get(run, 0.0) + row[runtime_column]
+    return runtimes
+
+
+def median(values):
+    """Returns the median of a non-empty list of numbers."""
+
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def estimate_costs(samples, args, runtimes=None):
+    """Returns a list of predicted costs, one per sample (a dictionary of column values)."""
+
+    # Get read file sizes
+    sizes = []
+    for sample in samples:
+        path = sample.get(args.path_column) or ""
+        if args.root is not None:
+            path = path.replace("[[ROOT]]", args.root)
+        try:
+            sizes.append(os.path.getsize(path))
+        except OSError:
+            sizes.append(None)
+
+    # Impute missing sizes (uniform cost if no size is known)
+    known = [size for size in sizes if size is not None]
+    default = median(known) if known else 1.0
+    if len(known) < len(sizes):
+        sys.stderr.write("[WARNING] Read file not accessible for {missing} of {total} samples; assuming median size.\n".format(missing=len(sizes) - len(known), total=len(sizes)))
+
+    # Estimate costs from sizes, strategies and organisms
+    costs = []
+    for sample, size in zip(samples, sizes):
+        cost = float(default if size is None else size)
+        if sample.get(args.strategy_column, "").upper() == "PAIRED":
+            cost *= args.paired_factor
+        cost *= args.organism_factor.get(sample.get(args.organism_column), 1.0)
+        costs.append(cost)
+
+    # Replace estimates by historical run times, if available
+    if runtimes:
+        measured = [runtimes.get(sample.get(args.run_column)) for sample in samples]
+        ratios = [seconds / cost for seconds, cost in zip(measured, costs) if seconds is not None and cost > 0]
+        scale = median(ratios) if ratios else 1.0
+        costs = [cost * scale if seconds is None else seconds for seconds, cost in zip(measured, costs)]
+        sys.stderr.write("Historical run times used for {known} of {total} samples.\n".format(known=len(ratios), total=len(samples)))
+
+    return costs
+
+
+def partition(costs, organisms, chunks, tolerance):
+    """Returns a list of sample indices per chunk (longest processing time first, with organism affinity)."""
+
+    # Initialize chunks
+    members = [[] for chunk in range(chunks)]
+    loads = [0.0] * chunks
+    contents = [set() for chunk in range(chunks)]
+    slack = tolerance * sum(costs) / chunks
+
+    # Assign samples in order of decreasing cost
+    for index in sorted(range(len(costs)), key=lambda index: (-costs[index], index)):
+        least = min(range(chunks), key=lambda chunk: (loads[chunk], chunk))
+        candidates = [chunk for chunk in range(chunks) if organisms[index] in contents[chunk] and loads[chunk] <= loads[least] + slack]
+        chunk = min(candidates, key=lambda chunk: (loads[chunk], chunk)) if candidates else least
+        members[chunk].append(index)
+        loads[chunk] += costs[index]
+        contents[chunk].add(organisms[index])
+
+    # Group samples by organism (in order of first appearance) and keep input order otherwise
+    rank = {}
+    for organism in organisms:
+        rank.setdefault(organism, len(rank))
+    return [sorted(indices, key=lambda index: (rank[organisms[index]], index)) for indices in members]
+
+
+##############
+###  MAIN  ###
+##############
+
+def main(argv=None):
+
+    # Parse arguments
+    args = parse_arguments(argv)
+
+    # Read sample table
+    header, rows = read_table(args.table)
+    samples = [dict(zip(header, row)) for row in rows]
+    if not samples:
+        sys.stderr.write("[ERROR] No samples in table '{}'!\n[ERROR] Execution aborted.\n".format(args.table))
+        sys.exit(1)
+
+    # Estimate costs
+    runtimes = read_runtimes(args.runtimes, args.runtime_run_column, args.runtime_column, args.runtime_run_pattern) if args.runtimes is not None else None
+    costs = estimate_costs(samples, args, runtimes)
+
+    # Partition samples (no empty chunks)
+    chunks = args.chunks if args.chunks is not None else -(-len(samples) // args.chunk_size)
+    chunks = min(chunks, len(samples))
+    organisms = [sample.get(args.organism_column, "") for sample in samples]
+    members = partition(costs, organisms, chunks, args.affinity_tolerance)
+
+    # Remove existing chunks
+    if not os.path.isdir(args.out_dir):
+        os.makedirs(args.out_dir)
+    for path in glob.glob(os.path.join(args.out_dir, args.prefix + "[0-9][0-9][0-9]" + args.suffix)):
+        os.remove(path)
+
+    # Write chunks
+    sys.stderr.write("Generating {chunks} table chunks in '{out_dir}'...\n".format(chunks=chunks, out_dir=args.out_dir))
+    for chunk, indices in enumerate(members):
+        with open(os.path.join(args.out_dir, "{prefix}{chunk:03d}{suffix}".format(prefix=args.prefix, chunk=chunk, suffix=args.suffix)), "w") as handle:
+            handle.write("\t".join(header) + "\n")
+            for index in indices:
+                handle.write("\t".join(rows[index]) + "\n")
+
+    # Write summary
+    total = sum(costs)
+    sys.stderr.write("chunk\tsamples\tcost_fraction\torganisms\n")
+    for chunk, indices in enumerate(members):
+        sys.stderr.write("{chunk:03d}\t{samples}\t{fraction:.4f}\t{organisms}\n".format(chunk=chunk, samples=len(indices), fraction=sum([costs[index] for index in indices]) / total if total else 0, organisms=",".join(sorted(set([organisms[index] for index in indices])))))
+    sys.stderr.write("Done.\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+
+"""Converts, trims, aligns and quantifies the reads of a single SRA run without intermediate FASTQ
+files on shared storage.
+
+Runs 'fastq-dump', 'cutadapt', 'STAR' and 'kallisto quant' concurrently and connects them through
+pipes and named pipes (FIFOs) in a node-local temporary directory ('--temp-dir'):
+
+    fastq-dump --> cutadapt --> tee --> kallisto quant
+                                    \\-> STAR
+
+Single-end reads are piped from 'fastq-dump --stdout' to 'cutadapt'; for paired-end runs
+('--paired'), 'fastq-dump --split-files' writes both mates to FIFOs. The trimmed reads (one stream
+per mate) are copied by in-process tee threads to 'kallisto quant' (through FIFOs) and to 'STAR'.
+STAR reads its input twice in two-pass mode ('--twopass-mode Basic') and can thus not read from a
+FIFO; the trimmed reads for STAR are then written to the temporary directory ('--star-reads file')
+or compressed on the fly ('--star-reads gzip'; read back through 'zcat'). STAR can read from FIFOs
+('--star-reads fifo') only in single-pass mode and for single-end reads (with two FIFO consumers
+of two mates, each consumer could wait for a mate that the other consumer holds back).
+
+Outputs are the same as those of the separate components: the cutadapt report (STDOUT of
+cutadapt; '--cutadapt-report'), the STAR output directory ('--star-out-dir') and the kallisto
+output directory ('--kallisto-out-dir'). If any tool fails, all tools are terminated; the exit
+status is that of the first failing tool. The temporary directory is removed in any case.
+
+Wrapped by the Anduril component 'StreamMapQuant', which replaces 'SRATools_FastqDump', 'Cutadapt',
+'STAR' and 'kallistoQuant' in 'documentation/align_and_quantify/02.generate_workflows.sh' if
+'streaming' is set to "true" there.
+"""
+
+__author__ = "Alexander Kanitz"
+__copyright__ = "Copyright 2016, Biozentrum, University of Basel"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Alexander Kanitz"
+__email__ = "alexander.kanitz@alumni.ethz.ch"
+
+# Import packages
+import os
+import sys
+import time
+import shlex
+import shutil
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+
+
+###################
+###  ARGUMENTS  ###
+###################
+
+def parse_arguments(argv=None):
+    """Parses command-line arguments."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    # Inputs and outputs
+    parser.add_argument("--sra", required=True, help="Run data in SRA format.")
+    parser.add_argument("--star-genome-dir", required=True, help="STAR genome index directory.")
+    parser.add_argument("--kallisto-index", required=True, help="kallisto index.")
+    parser.add_argument("--cutadapt-report", required=True, help="Output: cutadapt report.")
+    parser.add_argument("--star-out-dir", required=True, help="Output: STAR output directory (created if it does not exist).")
+    parser.add_argument("--kallisto-out-dir", required=True, help="Output: kallisto output directory.")
+    parser.add_argument("--paired", action="store_true", help="Paired-end library.")
+
+    # fastq-dump options
+    parser.add_argument("--offset", default="33", help="Quality score offset of FASTQ output (fastq-dump '--offset'; default: 33).")
+
+    # cutadapt options
+    parser.add_argument("--format", default=None, help="Input file format (cutadapt '--format').")
+    parser.add_argument("--minimum-length", default=None, help="Minimum read length after trimming (cutadapt '--minimum-length').")
+    parser.add_argument("--adapter", default=None, help="3' adapter of first mate (cutadapt '--adapter').")
+    parser.add_argument("--front", default=None, help="5' adapter of first mate (cutadapt '--front').")
+    parser.add_argument("--adapter-mate", default=None, help="3' adapter of second mate (cutadapt '-A').")
+    parser.add_argument("--front-mate", default=None, help="5' adapter of second mate (cutadapt '-G').")
+    parser.add_argument("--trim-n", action="store_true", help="Trim N's on ends of reads (cutadapt '--trim-n').")
+
+    # STAR options
+    parser.add_argument("--sjdb-overhang", default=None, help="STAR '--sjdbOverhang'.")
+    parser.add_argument("--twopass-mode", default="None", choices=["None", "Basic"], help="STAR '--twopassMode' (default: 'None').")
+    parser.add_argument("--twopass1-readsN", default=None, help="STAR '--twopass1readsN'.")
+    parser.add_argument("--star-threads", type=int, default=1, help="STAR '--runThreadN' (default: 1).")
+    parser.add_argument("--star-reads", default="auto", choices=["auto", "fifo", "file", "gzip"], help="How STAR reads trimmed reads: through a FIFO, from an uncompressed or from a compressed file in the temporary directory (default: 'auto'; 'fifo' if supported, 'file' otherwise).")
+
+    # kallisto options
+    parser.add_argument("--fragment-length", default=None, help="kallisto '--fragment-length' (single-end only).")
+    parser.add_argument("--sd", default=None, help="kallisto '--sd' (single-end only).")
+    parser.add_argument("--plaintext", action="store_true", help="kallisto '--plaintext'.")
+    parser.add_argument("--kallisto-threads", type=int, default=1, help="kallisto '--threads' (default: 1).")
+
+    # Executables and temporary directory
+    parser.add_argument("--fastq-dump", default="fastq-dump", help="fastq-dump executable (default: 'fastq-dump').")
+    parser.add_argument("--cutadapt", default="cutadapt", help="cutadapt executable (default: 'cutadapt').")
+    parser.add_argument("--star", default="STAR", help="STAR executable (default: 'STAR').")
+    parser.add_argument("--kallisto", default="kallisto", help="kallisto executable (default: 'kallisto').")
+    parser.add_argument("--temp-dir", default=None, help="Node-local directory for FIFOs and temporary files (default: $TMPDIR or '/tmp').")
+    args = parser.parse_args(argv)
+
+    # Choose how STAR reads trimmed reads
+    fifo_supported = args.twopass_mode == "None" and not args.paired
+    if args.star_reads == "auto":
+        args.star_reads = "fifo" if fifo_supported else "file"
+    elif args.star_reads == "fifo" and not fifo_supported:
+        parser.error("'--star-reads fifo' requires single-end reads and '--twopass-mode None'")
+
+    return args
+
+
+##################
+###  COMMANDS  ###
+##################
+
+def add_option(command, option, value):
+    """Appends an option and its value to a command unless the value is 'None'."""
+
+    if value is not None:
+        command.extend([option, str(value)])
+
+
+def get_commands(args, paths):
+    """Returns a dictionary of the commands (lists of arguments) of all tools; 'paths' is a
+    dictionary of FIFOs and files in the temporary directory."""
+
+    commands = {}
+    mates = [1, 2] if args.paired else [1]
+
+    # fastq-dump: single-end reads to STDOUT, paired-end reads to FIFOs
+    commands["fastq-dump"] = shlex.split(args.fastq_dump) + ["--offset", args.offset]
+    if args.paired:
+        commands["fastq-dump"] += ["--split-files", "--outdir", paths["dump_dir"], paths["sra"]]
+    else:
+        commands["fastq-dump"] += ["--stdout", paths["sra"]]
+
+    # cutadapt: report to STDOUT
+    command = shlex.split(args.cutadapt)
+    add_option(command, "--format", args.format)
+    add_option(command, "--minimum-length", args.minimum_length)
+    add_option(command, "--adapter", args.adapter)
+    add_option(command, "--front", args.front)
+    if args.paired:
+        add_option(command, "-A", args.adapter_mate)
+        add_option(command, "-G", args.front_mate)
+    if args.trim_n:
+        command.append("--trim-n")
+    command += ["--output", paths["trimmed_1"]]
+    if args.paired:
+        command += ["--paired-output", paths["trimmed_2"], paths["dumped_1"], paths["dumped_2"]]
+    else:
+        command += ["-"]
+    commands["cutadapt"] = command
+
+    # STAR
+    command = shlex.split(args.star) + ["--runMode", "alignReads", "--genomeDir", args.star_genome_dir, "--runThreadN", str(args.star_threads)]
+    command += ["--readFilesIn"] + [paths["star_{mate}".format(mate=mate)] for mate in mates]
+    if args.star_reads == "gzip":
+        command += ["--readFilesCommand", "zcat"]
+    add_option(command, "--sjdbOverhang", args.sjdb_overhang)
+    command += ["--twopassMode", args.twopass_mode]
+    add_option(command, "--twopass1readsN", args.twopass1_readsN)
+    command += ["--outFileNamePrefix", os.path.join(args.star_out_dir, "")]
+    commands["STAR"] = command
+
+    # kallisto
+    command = shlex.split(args.kallisto)
+    if len(command) == 1:
+        command.append("quant")
+    command += ["--index", args.kallisto_index, "--output-dir", args.kallisto_out_dir, "--threads", str(args.kallisto_threads)]
+    if not args.paired:
+        command.append("--single")
+        add_option(command, "--fragment-length", args.fragment_length)
+        add_option(command, "--sd", args.sd)
+    if args.plaintext:
+        command.append("--plaintext")
+    command += [paths["kallisto_{mate}".format(mate=mate)] for mate in mates]
+    commands["kallisto"] = command
+
+    return commands
+
+
+##################
+###  PIPELINE  ###
+##################
+
+class Tee(threading.Thread):
+    """Copies a FIFO to one or more targets (paths of FIFOs or files, or file-like objects)."""
+
+    def __init__(self, source, targets, chunk_size=1048576):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.source = source
+        self.targets = targets
+        self.chunk_size = chunk_size
+        self.error = None
+        self.bytes = 0
+
+    def run(self):
+        handles = []
+        try:
+            for target in self.targets:
+                handles.append(open(target, "wb") if isinstance(target, str) else target)
+            with open(self.source, "rb") as source:
+                for chunk in iter(lambda: source.read(self.chunk_size), b""):
+                    for handle in handles:
+                        handle.write(chunk)
+                    self.bytes += len(chunk)
+        except (IOError, OSError) as error:
+            self.error = error
+        finally:
+            for handle in handles:
+                try:
+                    handle.close()
+                except (IOError, OSError):
+                    pass
+
+
+def unblock_fifo(path):
+    """Opens and closes the ends of a FIFO without blocking, so that tools or tee threads waiting to
+    open it (e.g. because the tool at the other end has died) can proceed."""
+
+    for flags in [os.O_RDONLY | os.O_NONBLOCK, os.O_WRONLY | os.O_NONBLOCK]:
+        try:
+            os.close(os.open(path, flags))
+        except OSError:
+            pass
+
+
+def run_pipeline(args, work_dir):
+    """Runs all tools and tee threads; returns the exit status of the first failing tool or 0."""
+
+    # Create FIFOs and temporary paths
+    mates = [1, 2] if args.paired else [1]
+    accession = os.path.basename(args.sra)
+    accession = accession[:-len(".sra")] if accession.endswith(".sra") else accession
+    paths = {"sra": os.path.abspath(args.sra), "dump_dir": os.path.join(work_dir, "dump")}
+    os.mkdir(paths["dump_dir"])
+    fifos = []
+    for mate in mates:
+        paths["dumped_{mate}".format(mate=mate)] = os.path.join(paths["dump_dir"], "{accession}_{mate}.fastq".format(accession=accession, mate=mate))
+        paths["trimmed_{mate}".format(mate=mate)] = os.path.join(work_dir, "trimmed_{mate}.fastq".format(mate=mate))
+        paths["kallisto_{mate}".format(mate=mate)] = os.path.join(work_dir, "kallisto_{mate}.fastq".format(mate=mate))
+        paths["star_{mate}".format(mate=mate)] = os.path.join(work_dir, "star_{mate}.fastq".format(mate=mate)) + (".gz" if args.star_reads == "gzip" else "")
+        names = ["trimmed", "kallisto"] + (["dumped"] if args.paired else []) + (["star"] if args.star_reads == "fifo" else [])
+        fifos.extend([paths["{name}_{mate}".format(name=name, mate=mate)] for name in names])
+    for fifo in fifos:
+        os.mkfifo(fifo)
+
+    # Get commands
+    commands = get_commands(args, paths)
+    for name in ["fastq-dump", "cutadapt", "STAR", "kallisto"]:
+        sys.stderr.write("[{name}] {command}\n".format(name=name, command=" ".join(commands[name])))
+
+    # Prepare output directories
+    if not os.path.isdir(args.star_out_dir):
+        os.makedirs(args.star_out_dir)
+
+    # Start tools and tee threads; file handles of parents are closed after the children started
+    processes = []
+    tees = []
+    report = open(args.cutadapt_report, "w")
+    try:
+        # Consumers: kallisto and (single-pass) STAR open their FIFOs themselves
+        processes.append(("kallisto", subprocess.Popen(commands["kallisto"]), [paths["kallisto_{mate}".format(mate=mate)] for mate in mates]))
+        if args.star_reads == "fifo":
+            processes.append(("STAR", subprocess.Popen(commands["STAR"]), [paths["star_{mate}".format(mate=mate)] for mate in mates]))
+
+        # Tee threads: trimmed reads to kallisto and STAR (FIFO, file or compressor)
+        for mate in mates:
+            star_target = paths["star_{mate}".format(mate=mate)]
+            if args.star_reads == "gzip":
+                with open(star_target, "wb") as handle:
+                    compressor = subprocess.Popen(["gzip", "-c", "-1"], stdin=subprocess.PIPE, stdout=handle)
+                processes.append(("gzip", compressor, []))
+                star_target = compressor.stdin
+            tee = Tee(paths["trimmed_{mate}".format(mate=mate)], [paths["kallisto_{mate}".format(mate=mate)], star_target])
+            tee.start()
+            tees.append(tee)
+
+        # Producers: fastq-dump pipes single-end reads to cutadapt
+        if args.paired:
+            processes.append(("cutadapt", subprocess.Popen(commands["cutadapt"], stdout=report), [paths[name + "_" + str(mate)] for name in ["dumped", "trimmed"] for mate in mates]))
+            processes.append(("fastq-dump", subprocess.Popen(commands["fastq-dump"], stdout=sys.stderr), [paths["dumped_{mate}".format(mate=mate)] for mate in mates]))
+        else:
+            dump = subprocess.Popen(commands["fastq-dump"], stdout=subprocess.PIPE)
+            processes.append(("fastq-dump", dump, []))
+            processes.append(("cutadapt", subprocess.Popen(commands["cutadapt"], stdin=dump.stdout, stdout=report), [paths["trimmed_{mate}".format(mate=mate)] for mate in mates]))
+            dump.stdout.close()
+        report.close()
+
+        # Wait for tools; terminate all tools if one fails
+        exit_status = wait_for_processes(processes, fifos)
+
+        # Wait for tee threads
+        for tee in tees:
+            tee.join(1 if exit_status else None)
+            if tee.error is not None and not exit_status:
+                sys.stderr.write("[ERROR] Copying trimmed reads failed: {error}\n".format(error=tee.error))
+                exit_status = 1
+
+        # Align reads from temporary files (two-pass mode)
+        if not exit_status and args.star_reads != "fifo":
+            processes.append(("STAR", subprocess.Popen(commands["STAR"]), []))
+            exit_status = wait_for_processes(processes[-1:], fifos)
+
+    # Terminate all tools if interrupted (e.g. by SIGTERM)
+    except BaseException:
+        report.close()
+        for name, process, process_fifos in processes:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+        raise
+
+    # Return exit status
+    return exit_status
+
+
+def wait_for_processes(processes, fifos, interval=0.5):
+    """Waits for all processes (tuples of name, process and the FIFOs the process reads from or
+    writes to) to finish. When a process finishes, its FIFOs are unblocked, so that tools waiting
+    for the other end proceed (and see the end of the stream). If a process fails, all other
+    processes are terminated and all FIFOs are unblocked. Returns the exit status of the first
+    failing process or 0."""
+
+    exit_status = 0
+    running = list(processes)
+    while running:
+        for name, process, process_fifos in list(running):
+            status = process.poll()
+            if status is None:
+                continue
+            running.remove((name, process, process_fifos))
+            sys.stderr.write("[{name}] Exit status: {status}\n".format(name=name, status=status))
+            for fifo in process_fifos:
+                unblock_fifo(fifo)
+
+            # Terminate other processes after the first failure
+            if status and not exit_status:
+                exit_status = status if status > 0 else 128 - status
+                sys.stderr.write("[ERROR] '{name}' failed; terminating pipeline.\n".format(name=name))
+                for other_name, other, other_fifos in running:
+                    try:
+                        other.terminate()
+                    except OSError:
+                        pass
+
+        # Let tools and tee threads waiting for terminated tools proceed
+        if exit_status:
+            for fifo in fifos:
+                unblock_fifo(fifo)
+        if running:
+            time.sleep(interval)
+
+    # Return exit status
+    return exit_status
+
+
+##############
+###  MAIN  ###
+##############
+
+def main(argv=None):
+
+    # Parse arguments
+    args = parse_arguments(argv)
+
+    # Terminate on SIGTERM (e.g. from the scheduler), so that the temporary directory is removed
+    def terminate(signum, frame):
+        raise SystemExit(128 + signum)
+    signal.signal(signal.SIGTERM, terminate)
+
+    # Run pipeline in temporary directory
+    work_dir = tempfile.mkdtemp(prefix="stream_map_quant.", dir=args.temp_dir)
+    try:
+        exit_status = run_pipeline(args, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Return exit status
+    if exit_status:
+        sys.stderr.write("[ERROR] Execution aborted.\n")
+    sys.exit(exit_status)
+
+
+if __name__ == "__main__":
+    main()